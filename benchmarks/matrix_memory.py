@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Measures the memory of a parsed OSRM matrix with the nested lists and of only its numpy arrays, e.g.
+``python benchmarks/matrix_memory.py 1000`` for 1000 x 1000 locations.
+"""
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from routingpy import OSRM
+from routingpy.client_base import _filter_raw
+
+
+def _body(size):
+    rows = [[round(random.uniform(0, 10000), 1) for _ in range(size)] for _ in range(size)]
+    return json.dumps({"code": "Ok", "durations": rows, "distances": rows}).encode()
+
+
+def _measure(body, arrays):
+    gc.collect()
+    tracemalloc.start()
+    matrix = OSRM.parse_matrix_json(json.loads(body))
+    # Same as keep_raw=False
+    _filter_raw(matrix, False)
+    if arrays:
+        # keep the arrays rather than the matrix
+        matrix = matrix.durations_array, matrix.distances_array
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def main(size=1000):
+    body = _body(size)
+
+    print("Python {}, {} x {} matrix".format(sys.version.split()[0], size, size))
+    for name, arrays in (("lists", False), ("arrays", True)):
+        current, peak = _measure(body, arrays)
+        print("  {:<7} {:6.1f} MiB held, {:6.1f} MiB peak".format(name, current / 2**20, peak / 2**20))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Measures the memory of parsed results on a synthetic Valhalla trace_attributes response with 100k edges and
+matched points, e.g. ``python benchmarks/results_memory.py 100000``.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from routingpy import utils
+from routingpy.direction import Direction
+from routingpy.valhalla_attributes import MatchedResults
+
+EDGE = {
+    "traversability": "forward",
+    "toll": False,
+    "use": "road",
+    "tunnel": False,
+    "names": ["Main Street"],
+    "drive_on_right": True,
+    "roundabout": False,
+    "bridge": False,
+    "surface": "paved_smooth",
+    "way_id": 2,
+    "speed_limit": 50,
+    "cycle_lane": "none",
+    "sidewalk": "both",
+    "lane_count": 2,
+    "mean_elevation": 100,
+    "weighted_grade": 0.5,
+    "road_class": "residential",
+    "speed": 40,
+    "length": 0.1,
+}
+
+
+def _response(size):
+    return {
+        "shape": utils.encode_polyline6([[8.5, 47.5], [8.6, 47.6]]),
+        "edges": [dict(EDGE, id=idx) for idx in range(size)],
+        "matched_points": [
+            {
+                "lon": 8.5,
+                "lat": 47.5,
+                "type": "matched",
+                "distance_along_edge": 0.5,
+                "distance_from_trace_point": 3,
+                "edge_index": idx,
+            }
+            for idx in range(size)
+        ],
+    }
+
+
+def _object_size(obj):
+    """The size of an object incl. its ``__dict__``, without the attribute values."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main(size=100000):
+    response = _response(size)
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = MatchedResults(response)
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("Python {}".format(sys.version.split()[0]))
+    print(
+        "MatchedResults of {} edges and points: {:.1f} MiB in {:.2f}s".format(
+            size, allocated / 2**20, elapsed
+        )
+    )
+    print("  per edge and point: {:.0f} bytes".format(allocated / size))
+    print("  MatchedEdge:  {} bytes".format(_object_size(results.matched_edges[0])))
+    print("  MatchedPoint: {} bytes".format(_object_size(results.matched_points[0])))
+    print("  Direction:    {} bytes".format(_object_size(Direction([], 1, 1))))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+:class:`LoadBalancer` spreads the requests of a client over multiple replicas of the same server.
+"""
+
+import random
+import threading
+import time
+
+_STRATEGIES = ("round_robin", "least_outstanding", "power_of_two")
+
+
+class LoadBalancer(object):
+    """
+    Chooses the base URL of every request among replicas of the same server, e.g. several OSRM instances with the
+    same data. Clients create one when they are given a list of base URLs, so it's transparent to the routers.
+
+    Replicas which failed ``max_failures`` times in a row, i.e. with a connection error, a timeout or an HTTP
+    status of 500 or more, are ejected for ``eject_time`` seconds. Afterwards they get requests again, but a
+    single failure ejects them for another ``eject_time``. If all replicas are ejected, the one which was ejected
+    first is tried anyway.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.balancing import LoadBalancer
+    >>> router = OSRM(["http://osrm-1:5000", "http://osrm-2:5000"])  # round robin
+    >>> router = OSRM(LoadBalancer(["http://osrm-1:5000", "http://osrm-2:5000"], strategy="power_of_two"))
+    >>> router.client.load_balancer.ejected
+    []
+    """
+
+    def __init__(self, base_urls, strategy="round_robin", max_failures=3, eject_time=30):
+        """
+        :param base_urls: The base URLs of the replicas. Should not have a trailing slash.
+        :type base_urls: list of str
+
+        :param strategy: How to choose a replica. One of ["round_robin", "least_outstanding" (the replica with
+            the fewest requests in flight), "power_of_two" (the one with fewer requests in flight of two random
+            replicas)]. Default "round_robin".
+        :type strategy: str
+
+        :param max_failures: Number of consecutive failures after which a replica is ejected. Default 3.
+        :type max_failures: int
+
+        :param eject_time: Seconds an ejected replica doesn't get any requests. Default 30.
+        :type eject_time: float
+        """
+        if not base_urls:
+            raise ValueError("LoadBalancer needs at least one base URL.")
+        if strategy not in _STRATEGIES:
+            raise ValueError("strategy must be one of {}, not {}.".format(_STRATEGIES, strategy))
+
+        self.base_urls = list(base_urls)
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_time = eject_time
+
+        self._outstanding = dict.fromkeys(self.base_urls, 0)
+        self._failures = dict.fromkeys(self.base_urls, 0)
+        self._ejected_until = dict.fromkeys(self.base_urls, 0.0)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self):
+        """The number of requests in flight per base URL."""
+        with self._lock:
+            return dict(self._outstanding)
+
+    @property
+    def ejected(self):
+        """The base URLs which are currently ejected."""
+        now = time.monotonic()
+        with self._lock:
+            return [url for url in self.base_urls if self._ejected_until[url] > now]
+
+    def acquire(self):
+        """
+        Chooses the base URL for a request, which has to be handed back with :meth:`release` once it finished.
+
+        :rtype: str
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [url for url in self.base_urls if self._ejected_until[url] <= now]
+            if not candidates:
+                candidates = [min(self.base_urls, key=self._ejected_until.get)]
+
+            if self.strategy == "power_of_two" and len(candidates) > 1:
+                url = min(random.sample(candidates, 2), key=self._outstanding.get)
+            else:
+                # Rotating the candidates also spreads ties of least_outstanding evenly
+                start = self._next % len(candidates)
+                self._next += 1
+                rotated = candidates[start:] + candidates[:start]
+                url = (
+                    rotated[0]
+                    if self.strategy == "round_robin"
+                    else min(rotated, key=self._outstanding.get)
+                )
+
+            self._outstanding[url] += 1
+
+        return url
+
+    def release(self, base_url, failed=False):
+        """
+        Hands back a base URL returned by :meth:`acquire`.
+
+        :param base_url: The base URL of the finished request.
+        :type base_url: str
+
+        :param failed: Whether the replica failed, i.e. the request raised a connection error or timeout or got
+            an HTTP status of 500 or more.
+        :type failed: bool
+        """
+        with self._lock:
+            self._outstanding[base_url] -= 1
+            if not failed:
+                self._failures[base_url] = 0
+                return
+
+            self._failures[base_url] += 1
+            if self._failures[base_url] >= self.max_failures:
+                self._ejected_until[base_url] = time.monotonic() + self.eject_time
+                # The first request after the ejection probes the replica, if it fails it's ejected again
+                self._failures[base_url] = self.max_failures - 1
+
+    def __repr__(self):  # pragma: no cover
+        return "LoadBalancer({}, strategy={})".format(self.base_urls, self.strategy)
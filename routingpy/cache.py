@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Response caches which can be passed to every client, e.g. ``OSRM(cache=LRUCache(maxsize=10000))``.
+
+Caches store the raw response bodies of successful requests. On a cache hit the client skips the HTTP request,
+but the body is still parsed by the router, so the results are independent objects.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+
+def cache_key(method, url, get_params=None, post_params=None):
+    """
+    Builds a cache key from the request. GET parameters are sorted and the POST body is canonicalized, so equal
+    requests map to the same key, no matter the order the parameters were built in.
+
+    :param method: The HTTP method, e.g. "GET".
+    :type method: str
+
+    :param url: The full URL without query string.
+    :type url: str
+
+    :param get_params: HTTP GET parameters.
+    :type get_params: dict or list of tuples
+
+    :param post_params: HTTP POST parameters.
+    :type post_params: dict
+
+    :rtype: str
+    """
+    if isinstance(get_params, dict):
+        get_params = get_params.items()
+    canonical = json.dumps(
+        [
+            method.upper(),
+            url,
+            sorted([str(k), str(v)] for k, v in (get_params or [])),
+            post_params,
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BaseCache(metaclass=ABCMeta):
+    """
+    Abstract base class for response caches. Implementations have to be safe to use from multiple threads.
+
+    Values are the raw response bodies as bytes.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Returns the cached body for ``key`` or None if it's missing or expired.
+
+        :param key: The cache key, see :func:`cache_key`.
+        :type key: str
+
+        :rtype: bytes or None
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key, value):
+        """
+        Stores a body under ``key``.
+
+        :param key: The cache key, see :func:`cache_key`.
+        :type key: str
+
+        :param value: The raw response body.
+        :type value: bytes
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Removes all entries."""
+        pass
+
+
+class LRUCache(BaseCache):
+    """
+    In-memory cache which evicts the least recently used entries beyond ``maxsize`` and expired entries after
+    ``ttl`` seconds.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.cache import LRUCache
+    >>> router = OSRM(cache=LRUCache(maxsize=10000, ttl=3600))
+    >>> route = router.directions(locations)  # network
+    >>> route = router.directions(locations)  # cache
+    >>> router.client.cache_hits
+    1
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        :param maxsize: Maximum number of entries. Default 1024.
+        :type maxsize: int
+
+        :param ttl: Seconds after which an entry expires. Default None, i.e. entries never expire.
+        :type ttl: int or float
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1, not {}.".format(maxsize))
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return None
+
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Persistent cache in a SQLite database, which survives restarts and can be shared by multiple processes on one
+    host. Bodies are stored zlib compressed and the least recently used entries are evicted once the compressed
+    bodies exceed ``max_bytes``.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.cache import SQLiteCache
+    >>> router = Valhalla(url, cache=SQLiteCache("~/.cache/routingpy.sqlite", max_bytes=2**30))
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires REAL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+    """
+
+    def __init__(self, path, max_bytes=None, ttl=None, compress_level=6, timeout=30):
+        """
+        :param path: Path of the database file, which is created if it doesn't exist.
+        :type path: str
+
+        :param max_bytes: Maximum size of all compressed bodies. Default None, i.e. unbounded.
+        :type max_bytes: int
+
+        :param ttl: Seconds after which an entry expires. Default None, i.e. entries never expire.
+        :type ttl: int or float
+
+        :param compress_level: zlib compression level from 0 (none) to 9 (smallest). Default 6.
+        :type compress_level: int
+
+        :param timeout: Seconds to wait for a lock held by another process. Default 30.
+        :type timeout: int or float
+        """
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # Connections can't be shared with forked worker processes, so each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            # WAL lets readers in other processes continue while one process writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, expires = row
+            if expires is not None and expires <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        return zlib.decompress(value)
+
+    def set(self, key, value):
+        now = time.time()
+        compressed = zlib.compress(value, self.compress_level)
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, compressed, len(compressed), expires, now),
+            )
+            if self.max_bytes is not None:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Deletes the least recently used entries beyond ``max_bytes``."""
+        conn.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total FROM responses
+                ) WHERE total > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def close(self):
+        """Closes the database connection. It's reopened on the next access."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+import asyncio
+import time
+from datetime import datetime
+
+from . import exceptions
+from .client_base import DEFAULT, BaseClient, _Retry, options
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncClient(BaseClient):
+    """Asynchronous client class for requests handling, which can be passed to each router. Uses the httpx package.
+
+    Routers initialized with this client return awaitables from all their endpoint methods, e.g. ``directions``,
+    ``isochrones`` and ``matrix``. Parameter building and response parsing is the same as with the default client.
+
+    >>> import asyncio
+    >>> from routingpy import OSRM
+    >>> from routingpy.client_async import AsyncClient
+    >>> async def main():
+    ...     router = OSRM(client=AsyncClient)
+    ...     routes = await asyncio.gather(*[router.directions(locs) for locs in many_locations])
+    ...     await router.client.aclose()
+    ...     return routes
+    >>> routes = asyncio.run(main())
+    """
+
+    _body_kwarg = "content"
+
+    def __init__(
+        self,
+        base_url,
+        user_agent=None,
+        timeout=DEFAULT,
+        retry_timeout=None,
+        retry_over_query_limit=None,
+        skip_api_error=None,
+        cache=None,
+        retry_policy=None,
+        rate_limiter=None,
+        concurrency_limiter=None,
+        hedge_policy=None,
+        coalesce=False,
+        hooks=None,
+        codec=None,
+        lazy=False,
+        keep_raw=None,
+        **kwargs
+    ):
+        """
+        :param base_url: The base URL for the request. All routers must provide a default.
+            Should not have a trailing slash. A list of base URLs of replicas spreads the requests over them round
+            robin, a :class:`routingpy.balancing.LoadBalancer` allows other strategies.
+        :type base_url: string or list of str or :class:`routingpy.balancing.LoadBalancer`
+
+        :param user_agent: User-Agent to send with the requests to routing API.
+            Overrides ``options.default_user_agent``.
+        :type user_agent: string
+
+        :param timeout: Combined connect and read timeout for HTTP requests, in
+            seconds. Specify "None" for no timeout.
+        :type timeout: int
+
+        :param retry_timeout: Timeout across multiple retriable requests, in
+            seconds.
+        :type retry_timeout: int
+
+        :param retry_over_query_limit: If True, client will not raise an exception
+            on HTTP 429, but instead jitter a sleeping timer to pause between
+            requests until HTTP 200 or retry_timeout is reached.
+        :type retry_over_query_limit: bool
+
+        :param skip_api_error: Continue with batch processing if a :class:`routingpy.exceptions.RouterApiError` is
+            encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
+        :type skip_api_error: bool
+
+        :param cache: Cache for the response bodies of successful requests, e.g.
+            :class:`routingpy.cache.LRUCache`. Cache hits skip the HTTP request, but are still parsed by the
+            router. Default None, i.e. no caching.
+        :type cache: :class:`routingpy.cache.BaseCache`
+
+        :param retry_policy: Back-off, retriable statuses and exceptions and maximum attempts of retries.
+            The number of attempts of the last request is available in :attr:`last_attempts`.
+            Default :class:`routingpy.retry.RetryPolicy` with its defaults.
+        :type retry_policy: :class:`routingpy.retry.RetryPolicy`
+
+        :param rate_limiter: Limits the request rate of this and all other clients sharing the limiter, e.g.
+            :class:`routingpy.limiters.TokenBucket`. Requests wait until they are within the rate instead of
+            running into HTTP 429. Default None, i.e. unlimited.
+        :type rate_limiter: :class:`routingpy.limiters.TokenBucket`
+
+        :param concurrency_limiter: Limits the number of concurrent requests of this and all other clients sharing
+            the limiter, e.g. the adaptive :class:`routingpy.limiters.AIMDLimiter`. Default None, i.e. unlimited.
+        :type concurrency_limiter: :class:`routingpy.limiters.AIMDLimiter`
+
+        :param hedge_policy: Sends duplicate requests if a response is late and returns the first response, see
+            :class:`routingpy.hedging.HedgePolicy`. Default None, i.e. no hedging.
+        :type hedge_policy: :class:`routingpy.hedging.HedgePolicy`
+
+        :param coalesce: Let concurrent identical requests share a single HTTP request. Each caller still gets a
+            result of its own. The number of requests which joined another one is counted in
+            ``coalesced_requests``. Default False.
+        :type coalesce: bool
+
+        :param hooks: Callables which are called with a :class:`routingpy.hooks.RequestEvent` at every step of a
+            request, e.g. :class:`routingpy.hooks.LatencyCollector`. Default ``options.default_hooks``.
+        :type hooks: list of callable
+
+        :param codec: Encodes JSON request bodies and decodes responses, anything with ``loads`` and ``dumps``
+            like the ``json`` module. Default ``options.default_codec``, i.e. ``orjson`` if it's installed.
+        :type codec: :class:`routingpy.codec.JSONCodec`
+
+        :param lazy: Let routers decode geometries and build matrices only when they are accessed first, e.g.
+            :attr:`routingpy.direction.Direction.geometry`, which saves most of the parsing if only durations and
+            distances are needed. Default False.
+        :type lazy: bool
+
+        :param keep_raw: Keep the raw responses in ``raw`` of the results if True, drop them if False to save
+            memory, or keep only the listed top-level keys. Router methods can override it per request with their
+            ``keep_raw`` argument. Default ``options.default_keep_raw``, i.e. True.
+        :type keep_raw: bool or list of str
+
+        :param kwargs: Additional arguments, such as headers or proxies. Everything else is passed to
+            :class:`httpx.AsyncClient`, e.g. ``verify`` or ``limits``.
+        :type kwargs: dict
+        """
+        if httpx is None:  # pragma: no cover
+            raise ImportError(
+                "AsyncClient needs the httpx package, install it with 'pip install httpx'."
+            )
+
+        super(AsyncClient, self).__init__(
+            base_url,
+            user_agent=user_agent,
+            timeout=timeout,
+            retry_timeout=retry_timeout,
+            retry_over_query_limit=retry_over_query_limit,
+            skip_api_error=skip_api_error,
+            cache=cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            concurrency_limiter=concurrency_limiter,
+            hedge_policy=hedge_policy,
+            coalesce=coalesce,
+            hooks=hooks,
+            codec=codec,
+            lazy=lazy,
+            keep_raw=keep_raw,
+            **kwargs
+        )
+
+        session_kwargs = dict(kwargs)
+        try:
+            self.headers.update(session_kwargs.pop("headers"))
+        except KeyError:
+            pass
+
+        self.proxies = session_kwargs.pop("proxies", None) or options.default_proxies
+        if self.proxies:
+            # requests style proxies {"https": "http://..."} are mounted per scheme in httpx
+            session_kwargs["mounts"] = {
+                "{}://".format(scheme): httpx.AsyncHTTPTransport(proxy=proxy)
+                for scheme, proxy in self.proxies.items()
+            }
+
+        self.kwargs = {"headers": self.headers, "timeout": self.timeout}
+
+        self._session = httpx.AsyncClient(**session_kwargs)
+
+    async def _request(
+        self,
+        url,
+        get_params={},
+        post_params=None,
+        first_request_time=None,
+        retry_counter=0,
+        dry_run=None,
+        stream=False,
+    ):
+        """Performs HTTP GET/POST with credentials, returning the body as
+        JSON. Has to be awaited.
+
+        :param url: URL path for the request. Should begin with a slash.
+        :type url: string
+
+        :param get_params: HTTP GET parameters.
+        :type get_params: dict or list of tuples
+
+        :param post_params: HTTP POST parameters. Only specified by calling method.
+        :type post_params: dict
+
+        :param first_request_time: The time of the first request (None if no
+            retries have occurred).
+        :type first_request_time: :class:`datetime.datetime`
+
+        :param retry_counter: The number of this retry, or zero for first attempt.
+        :type retry_counter: int
+
+        :param dry_run: If true, only prints URL and parameters. true or false.
+        :type dry_run: bool
+
+        :param stream: Not supported by the async client.
+        :type stream: bool
+
+        :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
+        :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
+        :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
+        :raises routingpy.exceptions.JSONParseError: when the JSON response can't be parsed.
+        :raises routingpy.exceptions.Timeout: when the request timed out.
+
+        :returns: raw JSON response.
+        :rtype: dict
+        """
+
+        start = time.monotonic()
+        authed_url = self._generate_auth_url(url, get_params)
+
+        requests_method, final_requests_kwargs = self._request_kwargs(post_params)
+        prepare = time.monotonic() - start
+
+        # Only print URL and parameters for dry_run
+        if dry_run:
+            self._print_dry_run(authed_url, final_requests_kwargs)
+            return
+
+        if stream:
+            raise ValueError("Streaming responses isn't supported by the async client.")
+
+        if self.hooks:
+            self._endpoint.set(self._endpoint_name(url))
+        key = self._cache_key(requests_method, url, get_params, post_params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._attempts.set(0)
+            return cached
+
+        def _fetch():
+            return self._fetch(
+                requests_method,
+                authed_url,
+                final_requests_kwargs,
+                key,
+                first_request_time,
+                retry_counter,
+                prepare,
+            )
+
+        if not self.coalesce:
+            return (await _fetch())[0]
+        return await self._coalesced(self._request_key(requests_method, url, get_params, post_params), _fetch)
+
+    async def _fetch(self, method, path, kwargs, key, first_request_time, retry_counter, prepare=None):
+        """Requests until a response is final, retrying according to the retry policy.
+
+        :param prepare: The seconds it took to build the request parameters and encode the body, which are
+            reported with the first attempt's "request" event.
+
+        :returns: The body and the raw content of the final response.
+        :rtype: tuple
+        """
+        endpoint = self._endpoint.get()
+        first_request_time = first_request_time or datetime.now()
+        tried = retry_counter
+        timings = None if prepare is None else {"prepare": prepare}
+        try:
+            while True:
+                if datetime.now() - first_request_time > self.retry_timeout:
+                    raise exceptions.Timeout()
+
+                tried += 1
+                self._attempts.set(tried)
+                self._emit("request", endpoint, tried, timings=timings)
+                timings = None
+                start = time.monotonic()
+                try:
+                    response = await self._dispatch(method, path, kwargs)
+                    return self._received(response, key, endpoint, tried, start), response.content
+
+                except _Retry as retry:
+                    delay = self._retry_delay(retry, tried, first_request_time)
+                    self._emit("retry", endpoint, tried, error=retry.error, timings={"delay": delay})
+                    # Same back-off as the default client, but without blocking the event loop.
+                    await asyncio.sleep(delay)
+
+        except Exception as e:
+            self._emit("error", endpoint, tried, error=e)
+            raise
+
+    async def _coalesced(self, flight_key, fetch):
+        """Lets concurrent identical requests share the response of the first one. The others parse its raw
+        content themselves, so every caller gets a body of its own.
+
+        The request runs in a task of its own, so cancelling one of the callers doesn't cancel the others.
+        """
+        flight = self._flights.get(flight_key)
+        leader = flight is None
+        if leader:
+
+            async def _fly():
+                body, content = await fetch()
+                return body, content, self._attempts.get()
+
+            flight = self._flights[flight_key] = asyncio.ensure_future(_fly())
+            flight.add_done_callback(lambda _: self._flights.pop(flight_key, None))
+        else:
+            self.coalesced_requests += 1
+
+        body, content, attempts = await asyncio.shield(flight)
+        if not leader:
+            self._attempts.set(0)
+            return self._decode_shared(None if body is None else content)
+
+        # The task ran in a copy of the context
+        self._attempts.set(attempts)
+        return body
+
+    async def _dispatch(self, method, path, kwargs):
+        """Sends a request, hedged according to the hedge policy if the client has one.
+
+        :param path: The authenticated URL path, which is appended to the base URL.
+
+        :raises _Retry: if all requests failed with a retriable exception.
+        """
+        if self.hedge_policy is None:
+            return await self._send(method, path, kwargs)
+
+        policy = self.hedge_policy
+        delay = policy.delay()
+
+        async def _timed_send(base_url):
+            start = time.monotonic()
+            response = await self._send(method, path, kwargs, base_url)
+            policy.observe(time.monotonic() - start)
+            return response
+
+        pending = {}
+        done = set()
+        sent = 0
+        error = None
+        try:
+            while True:
+                if sent <= policy.max_hedges and not done:
+                    base_url = policy.base_url(None, sent)
+                    pending[asyncio.ensure_future(_timed_send(base_url))] = sent
+                    sent += 1
+
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay if sent <= policy.max_hedges else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    hedge = pending.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+
+                    policy.record(sent - 1, hedge)
+                    self._req = task.result().request
+                    return task.result()
+
+                if not pending:
+                    raise error
+        finally:
+            # Cancels the slower requests, also if the request itself was cancelled
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, method, path, kwargs, base_url=None):
+        """Sends a single HTTP request once the rate and concurrency limits allow it.
+
+        :param base_url: The base URL to send the request to. Default None, i.e. the client's base URL or the one
+            its load balancer chooses.
+
+        :raises _Retry: if the request failed with a retriable exception.
+        """
+        delay = self._rate_limit_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        token = await self.concurrency_limiter.acquire_async() if self.concurrency_limiter else None
+        chosen = base_url is None
+        if chosen:
+            base_url = self._acquire_base_url()
+        response = error = None
+        try:
+            response = await self._session.request(method, base_url + path, **kwargs)
+        except httpx.HTTPError as e:
+            error = e
+            raise self._transport_error(e, httpx.TimeoutException)
+        finally:
+            self._release_concurrency(token, response, error, httpx.TimeoutException)
+            if chosen:
+                self._release_base_url(base_url, response, error)
+        self._req = response.request
+
+        return response
+
+    def _parse(self, parser, response, *args, keep_raw=None, **kwargs):
+        """Returns an awaitable which parses the response of :meth:`_request` once it arrived."""
+
+        async def _parse_when_done():
+            return self._run_parser(parser, await response, args, kwargs, keep_raw)
+
+        return _parse_when_done()
+
+    def _batch(self, func, items, max_workers=None):
+        """Returns an awaitable which runs ``func`` for every item concurrently on the event loop.
+
+        :returns: The results in input order. If a call raised an exception, it's returned in its place.
+        :rtype: list
+        """
+
+        async def _gather():
+            semaphore = asyncio.Semaphore(max_workers or options.default_max_workers)
+
+            async def _call(item):
+                async with semaphore:
+                    try:
+                        return await func(item)
+                    except Exception as e:
+                        return e
+
+            return list(await asyncio.gather(*[_call(item) for item in items]))
+
+        return _gather()
+
+    @staticmethod
+    def _request_size(request):
+        return len(request.content)
+
+    async def aclose(self):
+        """Closes the underlying connection pool. The client can't be used afterwards."""
+        await self._session.aclose()
+
+    @property
+    def req(self):
+        """Holds the :class:`httpx.Request` property for the last request."""
+        return self._req
@@ -24,14 +24,30 @@ try:
 except (ModuleNotFoundError, ImportError):
     __version__ = "None"
 
+import contextvars
+import json
+import threading
+import time
+import warnings
 from abc import ABCMeta, abstractmethod
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from urllib.parse import urlencode
 
 import requests
 
+from . import exceptions
+from .balancing import LoadBalancer
+from .cache import cache_key
+from .codec import as_codec
+from .direction import Directions
+from .hooks import RequestEvent
+from .retry import RetryPolicy, parse_retry_after
+from .utils import get_ordinal
+
 _DEFAULT_USER_AGENT = "routingpy/v{}".format(__version__)
-_RETRIABLE_STATUSES = set([503])
+# Status codes which signal an overloaded server to concurrency limiters
+_OVERLOAD_STATUSES = frozenset([429, 502, 503, 504])
 
 
 class options(object):
@@ -74,6 +90,21 @@ class options(object):
 
         self.default_proxies:
             Proxies passed to the requests library. Dictionary.
+
+        self.default_max_workers:
+            Maximum number of concurrent requests for batch methods, e.g. ``directions_batch``. Should not
+            exceed the connection pool size of the client. Integer.
+
+        self.default_hooks:
+            Hooks of all clients which don't get their own, e.g. ``[routingpy.stats.default_registry]``. List.
+
+        self.default_codec:
+            JSON codec of all clients which don't get their own, see :class:`routingpy.codec.JSONCodec`. None
+            selects ``orjson`` if it's installed.
+
+        self.default_keep_raw:
+            Whether results keep the raw responses in ``raw``: True, False or a list of the top-level keys to keep.
+            Dropping them saves memory if many results are held. Boolean or list.
     """
 
     default_timeout = 60
@@ -82,15 +113,55 @@ class options(object):
     default_skip_api_error = False
     default_user_agent = _DEFAULT_USER_AGENT
     default_proxies = None
+    default_max_workers = 10
+    default_hooks = None
+    default_codec = None
+    default_keep_raw = True
+
+
+def _filter_raw(result, keep_raw):
+    """Drops the raw responses of a parsed result and, for :class:`routingpy.direction.Directions`, of its
+    items, or all but the top-level keys in ``keep_raw``. The keys only apply to the top-level response, the raw
+    routes of :class:`routingpy.direction.Directions` are kept as they are then. A list of raw responses, e.g. of
+    a tiled matrix, keeps the keys of each response."""
+    if keep_raw is True:
+        return
+
+    raw = getattr(result, "_raw", None)
+    if isinstance(raw, dict) and keep_raw:
+        result._raw = {key: raw[key] for key in keep_raw if key in raw}
+    elif isinstance(raw, list) and keep_raw:
+        result._raw = [
+            {key: item[key] for key in keep_raw if key in item} if isinstance(item, dict) else item
+            for item in raw
+        ]
+    elif raw is not None:
+        result._raw = None
+
+    if not keep_raw and isinstance(result, Directions):
+        for direction in result._directions or []:
+            _filter_raw(direction, keep_raw)
 
 
 # To avoid trouble when respecting timeout for individual routers (i.e. can't be None, since that's no timeout)
 DEFAULT = type("object", (object,), {"__repr__": lambda self: "DEFAULT"})()
 
 
+class _Retry(Exception):
+    """Signals the request loop of a client to retry after a failed attempt."""
+
+    def __init__(self, error, message, retry_after=None):
+        self.error = error
+        self.message = message
+        self.retry_after = retry_after
+
+
 class BaseClient(metaclass=ABCMeta):
     """Abstract base class every client inherits from. Authentication is handled in each subclass."""
 
+    # The keyword argument of the HTTP library for an encoded request body
+    _body_kwarg = "data"
+
     def __init__(
         self,
         base_url,
@@ -99,12 +170,23 @@ class BaseClient(metaclass=ABCMeta):
         retry_timeout=None,
         retry_over_query_limit=None,
         skip_api_error=None,
+        cache=None,
+        retry_policy=None,
+        rate_limiter=None,
+        concurrency_limiter=None,
+        hedge_policy=None,
+        coalesce=False,
+        hooks=None,
+        codec=None,
+        lazy=False,
+        keep_raw=None,
         **kwargs
     ):
         """
         :param base_url: The base URL for the request. All routers must provide a default.
-            Should not have a trailing slash.
-        :type base_url: string
+            Should not have a trailing slash. A list of base URLs of replicas spreads the requests over them round
+            robin, a :class:`routingpy.balancing.LoadBalancer` allows other strategies.
+        :type base_url: string or list of str or :class:`routingpy.balancing.LoadBalancer`
 
         :param user_agent: User-Agent to send with the requests to routing API.
             Overrides ``options.default_user_agent``.
@@ -127,10 +209,57 @@ class BaseClient(metaclass=ABCMeta):
             encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
         :type skip_api_error: bool
 
+        :param cache: Cache for the response bodies of successful requests, e.g.
+            :class:`routingpy.cache.LRUCache`. Default None, i.e. no caching.
+        :type cache: :class:`routingpy.cache.BaseCache`
+
+        :param retry_policy: Back-off, retriable statuses and exceptions and maximum attempts of retries.
+            Default :class:`routingpy.retry.RetryPolicy` with its defaults.
+        :type retry_policy: :class:`routingpy.retry.RetryPolicy`
+
+        :param rate_limiter: Limits the request rate of this and all other clients sharing the limiter, e.g.
+            :class:`routingpy.limiters.TokenBucket`. Default None, i.e. unlimited.
+        :type rate_limiter: :class:`routingpy.limiters.TokenBucket`
+
+        :param concurrency_limiter: Limits the number of concurrent requests of this and all other clients sharing
+            the limiter, e.g. :class:`routingpy.limiters.AIMDLimiter`. Default None, i.e. unlimited.
+        :type concurrency_limiter: :class:`routingpy.limiters.AIMDLimiter`
+
+        :param hedge_policy: Sends duplicate requests if a response is late and returns the first response, see
+            :class:`routingpy.hedging.HedgePolicy`. Default None, i.e. no hedging.
+        :type hedge_policy: :class:`routingpy.hedging.HedgePolicy`
+
+        :param coalesce: Let concurrent identical requests share a single HTTP request. Each caller still gets a
+            result of its own. The number of requests which joined another one is counted in
+            ``coalesced_requests``. Default False.
+        :type coalesce: bool
+
+        :param hooks: Callables which are called with a :class:`routingpy.hooks.RequestEvent` at every step of a
+            request, e.g. :class:`routingpy.hooks.LatencyCollector`. Default ``options.default_hooks``.
+        :type hooks: list of callable
+
+        :param codec: Encodes JSON request bodies and decodes responses, anything with ``loads`` and ``dumps``
+            like the ``json`` module. Default ``options.default_codec``, i.e. ``orjson`` if it's installed.
+        :type codec: :class:`routingpy.codec.JSONCodec`
+
+        :param lazy: Let routers decode geometries and build matrices only when they are accessed first, e.g.
+            :attr:`routingpy.direction.Direction.geometry`, which saves most of the parsing if only durations and
+            distances are needed. Default False.
+        :type lazy: bool
+
+        :param keep_raw: Keep the raw responses in ``raw`` of the results if True, drop them if False to save
+            memory, or keep only the listed top-level keys. Router methods can override it per request with their
+            ``keep_raw`` argument. Default ``options.default_keep_raw``, i.e. True.
+        :type keep_raw: bool or list of str
+
         :param **kwargs: Additional keyword arguments.
         :type **kwargs: dict
         """
-        self.base_url = base_url
+        if isinstance(base_url, (list, tuple)):
+            base_url = LoadBalancer(base_url)
+        self.load_balancer = base_url if isinstance(base_url, LoadBalancer) else None
+        # Requests are identified, e.g. in the cache, by the first replica, no matter which one answers
+        self.base_url = self.load_balancer.base_urls[0] if self.load_balancer else base_url
 
         self.retry_over_query_limit = (
             retry_over_query_limit
@@ -150,8 +279,42 @@ class BaseClient(metaclass=ABCMeta):
 
         self.kwargs = kwargs
 
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_lock = threading.Lock()
+
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.hedge_policy = hedge_policy
+        self.coalesce = coalesce
+        self.coalesced_requests = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+        self.hooks = list(hooks if hooks is not None else options.default_hooks or [])
+        self.codec = as_codec(codec if codec is not None else options.default_codec)
+        self.lazy = lazy
+        self.keep_raw = keep_raw if keep_raw is not None else options.default_keep_raw
+        # Set by the router owning the client
+        self.router_name = None
+        self._endpoint = contextvars.ContextVar("routingpy_endpoint_{}".format(id(self)), default=None)
+        # Per thread and per asyncio task
+        self._attempts = contextvars.ContextVar("routingpy_attempts_{}".format(id(self)), default=0)
+
         self._req = None
 
+    @property
+    def last_attempts(self):
+        """
+        The number of HTTP requests the last request of the current thread or asyncio task took, i.e. 1 without
+        retries and 0 if it was answered from the cache.
+
+        :rtype: int
+        """
+        return self._attempts.get()
+
     @abstractmethod
     def _request(
         self,
@@ -161,6 +324,7 @@ class BaseClient(metaclass=ABCMeta):
         first_request_time=None,
         retry_counter=0,
         dry_run=None,
+        stream=False,
     ):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
@@ -184,6 +348,10 @@ class BaseClient(metaclass=ABCMeta):
         :param dry_run: If true, only prints URL and parameters. true or false.
         :type dry_run: bool
 
+        :param stream: If true, returns the body of a successful response as file-like object, which is read
+            incrementally, instead of decoding it. The response isn't cached or shared with coalesced requests.
+        :type stream: bool
+
         :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
         :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
         :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
@@ -197,6 +365,319 @@ class BaseClient(metaclass=ABCMeta):
         """
         pass
 
+    def _parse(self, parser, response, *args, keep_raw=None, **kwargs):
+        """Hands the response of :meth:`_request` to a router's ``parse_*`` method.
+
+        Synchronous clients simply call the parser. Asynchronous clients override this
+        to return an awaitable, which resolves to the parsed result once the request finished.
+
+        :param parser: The router's static ``parse_*`` method.
+        :type parser: callable
+
+        :param response: The return value of :meth:`_request`.
+        :type response: dict or None
+
+        :param keep_raw: Overrides the client's ``keep_raw`` for this result.
+        :type keep_raw: bool or list of str
+
+        :returns: The parsed routing result.
+        """
+        return self._run_parser(parser, response, args, kwargs, keep_raw)
+
+    def _run_parser(self, parser, response, args, kwargs, keep_raw=None):
+        """Calls the parser, drops the raw response as configured and emits a "parse" event with its duration if
+        the client has hooks."""
+        start = time.monotonic()
+        result = parser(response, *args, **kwargs)
+        _filter_raw(result, self.keep_raw if keep_raw is None else keep_raw)
+        if self.hooks and response is not None:
+            self._emit("parse", self._endpoint.get(), timings={"parse": time.monotonic() - start})
+
+        return result
+
+    def _emit(self, type, endpoint, attempt=None, **fields):
+        """Calls the hooks with a :class:`routingpy.hooks.RequestEvent`."""
+        for hook in self.hooks:
+            hook(RequestEvent(type, self.router_name, endpoint, attempt, **fields))
+
+    def _emit_response(self, endpoint, attempt, response, network, decode, size=None):
+        """Emits a "response" event.
+
+        :param size: The size of the body if it's not read yet. Default None, i.e. the size of its content.
+        """
+        self._emit(
+            "response",
+            endpoint,
+            attempt,
+            status_code=response.status_code,
+            bytes_sent=self._request_size(response.request),
+            bytes_received=len(response.content) if size is None else size,
+            timings={"network": network, "decode": decode},
+        )
+
+    @staticmethod
+    def _request_size(request):
+        """Returns the size of the body of the HTTP library's request."""
+        body = getattr(request, "body", None)
+        return len(body) if body else 0
+
+    @staticmethod
+    def _endpoint_name(url):
+        """Returns the URL path with the segments holding locations, e.g. OSRM's coordinates, replaced by
+        ``{locations}``, so it can be used to group requests."""
+        return "/".join(
+            "{locations}" if any(char in segment for char in ",;(") else segment
+            for segment in url.split("?", 1)[0].split("/")
+        )
+
+    def _batch(self, func, items, max_workers=None):
+        """Calls ``func`` once for every item concurrently, using a pool of threads.
+
+        :param func: Callable taking a single item, usually a bound router method.
+        :type func: callable
+
+        :param items: The items to pass to ``func``.
+        :type items: list
+
+        :param max_workers: Maximum number of concurrent calls. Default ``options.default_max_workers``.
+        :type max_workers: int
+
+        :returns: The return values in input order. If a call raised an exception, it's returned in its place.
+        :rtype: list
+        """
+
+        def _call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers or options.default_max_workers) as executor:
+            return list(executor.map(_call, items))
+
+    def _request_kwargs(self, post_params=None):
+        """Returns the HTTP method and a fresh copy of the request kwargs, so concurrent requests don't leak their
+        body into each other.
+
+        :param post_params: HTTP POST parameters, sent as JSON encoded by the client's codec or form data depending
+            on the Content-Type header.
+        :type post_params: dict
+
+        :rtype: tuple of (str, dict)
+        """
+        final_requests_kwargs = dict(self.kwargs)
+        if post_params is None:
+            return "GET", final_requests_kwargs
+
+        if final_requests_kwargs["headers"]["Content-Type"] == "application/json":
+            # Encoded only once, also for retries and hedged requests
+            final_requests_kwargs[self._body_kwarg] = self.codec.encode(post_params)
+        else:
+            # Send as x-www-form-urlencoded key-value pair string (e.g. Mapbox API)
+            final_requests_kwargs["data"] = post_params
+
+        return "POST", final_requests_kwargs
+
+    def _print_dry_run(self, authed_url, requests_kwargs):
+        """Prints the URL, parameters and JSON body of a request instead of sending it.
+
+        :param authed_url: The path and query string of the request.
+        :type authed_url: str
+
+        :param requests_kwargs: The keyword arguments for the HTTP library from :meth:`_request_kwargs`.
+        :type requests_kwargs: dict
+        """
+        body = requests_kwargs.get(self._body_kwarg)
+        if isinstance(body, bytes):
+            requests_kwargs = dict(requests_kwargs)
+            del requests_kwargs[self._body_kwarg]
+
+        dry_run = "url:\n{}\nParameters:\n{}".format(
+            self.base_url + authed_url, json.dumps(requests_kwargs, indent=2)
+        )
+        if isinstance(body, bytes):
+            # The body exactly as it would be sent
+            dry_run += "\nBody:\n{}".format(body.decode("utf-8"))
+        print(dry_run)
+
+    def _rate_limit_delay(self):
+        """Returns the seconds to wait before the next request to stay within the rate limit."""
+        if self.rate_limiter is None:
+            return 0.0
+
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            self._emit("rate_limit", self._endpoint.get(), self._attempts.get(), timings={"delay": delay})
+        return delay
+
+    def _release_concurrency(self, token, response=None, error=None, timeout_type=()):
+        """Hands the outcome of a request to the concurrency limiter.
+
+        :param token: The token of the limiter, None if the client has none.
+        :param response: The response, None if the request failed.
+        :param error: The exception of the HTTP library if the request failed.
+        :param timeout_type: The HTTP library's timeout exception.
+        """
+        if token is None:
+            return
+
+        overloaded = (response is not None and response.status_code in _OVERLOAD_STATUSES) or isinstance(
+            error, timeout_type
+        )
+        measured = response is not None or error is not None
+        self.concurrency_limiter.release(token, overloaded=overloaded, measured=measured)
+
+    def _acquire_base_url(self):
+        """Returns the base URL for the next request, chosen by the load balancer if the client has one."""
+        if self.load_balancer is None:
+            return self.base_url
+        return self.load_balancer.acquire()
+
+    def _release_base_url(self, base_url, response=None, error=None):
+        """Hands the outcome of a request to the load balancer.
+
+        :param response: The response, None if the request failed.
+        :param error: The exception of the HTTP library if the request failed.
+        """
+        if self.load_balancer is None:
+            return
+
+        failed = error is not None or (response is not None and response.status_code >= 500)
+        self.load_balancer.release(base_url, failed=failed)
+
+    def _request_key(self, method, url, get_params, post_params):
+        """Returns a key which is equal for identical requests, see :func:`routingpy.cache.cache_key`."""
+        return cache_key(method, self.base_url + url, get_params, post_params)
+
+    def _cache_key(self, method, url, get_params, post_params):
+        """Returns the cache key of the request or None if the client has no cache."""
+        if self.cache is None:
+            return None
+        return self._request_key(method, url, get_params, post_params)
+
+    def _cache_get(self, key):
+        """Returns the decoded cached body for ``key`` or None and counts the hits and misses."""
+        if key is None:
+            return None
+
+        value = self.cache.get(key)
+        with self._cache_lock:
+            if value is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+
+        return None if value is None else self.codec.decode(value)
+
+    def _decode_shared(self, content):
+        """Decodes the raw content of a response shared by coalesced requests, None for a skipped API error."""
+        return None if content is None else self.codec.decode(content)
+
+    def _cache_set(self, key, content):
+        """Stores the raw body of a successful response."""
+        if key is not None:
+            self.cache.set(key, content)
+
+    def _received(self, response, key, endpoint, attempt, start):
+        """Processes a response and emits a "response" event with the network and JSON decoding times.
+
+        :param start: The :func:`time.monotonic` the attempt was started at.
+        """
+        received = time.monotonic()
+        try:
+            return self._process_response(response, key)
+        finally:
+            self._emit_response(endpoint, attempt, response, received - start, time.monotonic() - received)
+
+    def _process_response(self, response, key=None):
+        """Returns the body of a response and caches it, or None for a skipped API error.
+
+        :raises _Retry: if the request should be retried.
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code in self.retry_policy.retriable_statuses:
+            error = exceptions.RouterServerError(response.status_code, response.text)
+            raise _Retry(error, "Server down.", retry_after)
+
+        try:
+            body = self._get_body(response)
+
+        except exceptions.RouterApiError:
+            if self.skip_api_error:
+                warnings.warn(
+                    "Router {} returned an API error with "
+                    "the following message:\n{}".format(self.__class__.__name__, response.text)
+                )
+                return
+
+            raise
+
+        except exceptions.RetriableRequest as e:
+            if isinstance(e, exceptions.OverQueryLimit) and not self.retry_over_query_limit:
+                raise
+
+            raise _Retry(e, "Rate limit exceeded.", retry_after)
+
+        self._cache_set(key, response.content)
+        return body
+
+    def _transport_error(self, error, timeout_type):
+        """Converts an exception of the HTTP library, retriable ones to :class:`_Retry`.
+
+        :param timeout_type: The HTTP library's timeout exception, which is converted to
+            :class:`routingpy.exceptions.Timeout`.
+        """
+        converted = exceptions.Timeout() if isinstance(error, timeout_type) else error
+        retriable = self.retry_policy.retriable_exceptions
+        if isinstance(error, retriable) or isinstance(converted, retriable):
+            return _Retry(converted, "Request failed with {}.".format(type(error).__name__))
+
+        return converted
+
+    def _retry_delay(self, retry, tried, first_request_time):
+        """Returns the seconds to wait before the next attempt.
+
+        :raises: the error of the last attempt if no attempts are left, or :class:`routingpy.exceptions.Timeout`
+            if the server asks to wait longer than the remaining ``retry_timeout``.
+        """
+        policy = self.retry_policy
+        if policy.max_attempts is not None and tried >= policy.max_attempts:
+            raise retry.error
+
+        delay = policy.delay(tried, retry.retry_after)
+        if retry.retry_after is not None and policy.respect_retry_after:
+            # No use waiting if we have to give up afterwards anyways
+            if datetime.now() - first_request_time + timedelta(seconds=delay) > self.retry_timeout:
+                raise exceptions.Timeout()
+
+        warnings.warn(
+            "{}\nRetrying for the {}{} time.".format(retry.message, tried, get_ordinal(tried)),
+            UserWarning,
+        )
+        return delay
+
+    def _get_body(self, response):
+        status_code = response.status_code
+
+        try:
+            body = self.codec.decode(response.content)
+        except ValueError:
+            raise exceptions.JSONParseError("Can't decode JSON response:{}".format(response.text))
+
+        if status_code == 429:
+            raise exceptions.OverQueryLimit(status_code, body)
+
+        if 400 <= status_code < 500:
+            raise exceptions.RouterApiError(status_code, body)
+
+        if 500 <= status_code:
+            raise exceptions.RouterServerError(status_code, body)
+
+        if status_code != 200:
+            raise exceptions.RouterError(status_code, body)
+
+        return body
+
     @staticmethod
     def _generate_auth_url(path, params):
         """Returns the path and query string portion of the request URL, first
@@ -15,21 +15,34 @@
 # the License.
 #
 
-import json
-import random
+import contextvars
+import functools
+import threading
 import time
-import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 
 import requests
 
 from . import exceptions
-from .client_base import _RETRIABLE_STATUSES, DEFAULT, BaseClient, options
-from .utils import get_ordinal
+from .client_base import DEFAULT, BaseClient, _Retry, options
 
 
 class Client(BaseClient):
-    """Default client class for requests handling, which is passed to each router. Uses the requests package."""
+    """Default client class for requests handling, which is passed to each router. Uses the requests package.
+
+    A client, and with it a router, can be shared by many threads: every request builds its own request arguments
+    and :attr:`req` is tracked per thread. Routers don't change their client per request, e.g. HERE's endpoints on
+    different hosts are requested with absolute URLs. To run more than 10 requests at once, raise
+    ``pool_maxsize``, otherwise the surplus threads wait for a free connection of the pool.
+
+    :meth:`close` releases the connection pool and the threads of hedged requests, the client can also be used as
+    context manager:
+
+    >>> router = Valhalla(url, hedge_policy=HedgePolicy())
+    >>> with router.client:
+    ...     matrix = router.matrix(locations)
+    """
 
     def __init__(
         self,
@@ -39,12 +52,25 @@ class Client(BaseClient):
         retry_timeout=None,
         retry_over_query_limit=None,
         skip_api_error=None,
+        cache=None,
+        retry_policy=None,
+        rate_limiter=None,
+        concurrency_limiter=None,
+        hedge_policy=None,
+        coalesce=False,
+        hooks=None,
+        codec=None,
+        lazy=False,
+        keep_raw=None,
+        pool_connections=None,
+        pool_maxsize=None,
         **kwargs
     ):
         """
         :param base_url: The base URL for the request. All routers must provide a default.
-            Should not have a trailing slash.
-        :type base_url: string
+            Should not have a trailing slash. A list of base URLs of replicas spreads the requests over them round
+            robin, a :class:`routingpy.balancing.LoadBalancer` allows other strategies.
+        :type base_url: string or list of str or :class:`routingpy.balancing.LoadBalancer`
 
         :param user_agent: User-Agent to send with the requests to routing API.
             Overrides ``options.default_user_agent``.
@@ -67,11 +93,80 @@ class Client(BaseClient):
             encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
         :type skip_api_error: bool
 
+        :param cache: Cache for the response bodies of successful requests, e.g.
+            :class:`routingpy.cache.LRUCache`. Cache hits skip the HTTP request, but are still parsed by the
+            router. Default None, i.e. no caching.
+        :type cache: :class:`routingpy.cache.BaseCache`
+
+        :param retry_policy: Back-off, retriable statuses and exceptions and maximum attempts of retries.
+            The number of attempts of the last request is available in :attr:`last_attempts`.
+            Default :class:`routingpy.retry.RetryPolicy` with its defaults.
+        :type retry_policy: :class:`routingpy.retry.RetryPolicy`
+
+        :param rate_limiter: Limits the request rate of this and all other clients sharing the limiter, e.g.
+            :class:`routingpy.limiters.TokenBucket`. Requests wait until they are within the rate instead of
+            running into HTTP 429. Default None, i.e. unlimited.
+        :type rate_limiter: :class:`routingpy.limiters.TokenBucket`
+
+        :param concurrency_limiter: Limits the number of concurrent requests of this and all other clients sharing
+            the limiter, e.g. the adaptive :class:`routingpy.limiters.AIMDLimiter`. Default None, i.e. unlimited.
+        :type concurrency_limiter: :class:`routingpy.limiters.AIMDLimiter`
+
+        :param hedge_policy: Sends duplicate requests if a response is late and returns the first response, see
+            :class:`routingpy.hedging.HedgePolicy`. Default None, i.e. no hedging.
+        :type hedge_policy: :class:`routingpy.hedging.HedgePolicy`
+
+        :param coalesce: Let concurrent identical requests share a single HTTP request. Each caller still gets a
+            result of its own. The number of requests which joined another one is counted in
+            ``coalesced_requests``. Default False.
+        :type coalesce: bool
+
+        :param hooks: Callables which are called with a :class:`routingpy.hooks.RequestEvent` at every step of a
+            request, e.g. :class:`routingpy.hooks.LatencyCollector`. Default ``options.default_hooks``.
+        :type hooks: list of callable
+
+        :param codec: Encodes JSON request bodies and decodes responses, anything with ``loads`` and ``dumps``
+            like the ``json`` module. Default ``options.default_codec``, i.e. ``orjson`` if it's installed.
+        :type codec: :class:`routingpy.codec.JSONCodec`
+
+        :param lazy: Let routers decode geometries and build matrices only when they are accessed first, e.g.
+            :attr:`routingpy.direction.Direction.geometry`, which saves most of the parsing if only durations and
+            distances are needed. Default False.
+        :type lazy: bool
+
+        :param keep_raw: Keep the raw responses in ``raw`` of the results if True, drop them if False to save
+            memory, or keep only the listed top-level keys. Router methods can override it per request with their
+            ``keep_raw`` argument. Default ``options.default_keep_raw``, i.e. True.
+        :type keep_raw: bool or list of str
+
+        :param pool_connections: Number of connection pools, i.e. hosts, the session keeps. Default 10.
+        :type pool_connections: int
+
+        :param pool_maxsize: Maximum number of connections kept per host, which should be at least the number of
+            threads requesting concurrently. Default 10.
+        :type pool_maxsize: int
+
         :param kwargs: Additional arguments, such as headers or proxies.
         :type kwargs: dict
         """
 
         self._session = requests.Session()
+        if pool_connections or pool_maxsize:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_connections or requests.adapters.DEFAULT_POOLSIZE,
+                pool_maxsize=pool_maxsize or requests.adapters.DEFAULT_POOLSIZE,
+            )
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        self._local = threading.local()
+        self._hedge_executor = None
+        if hedge_policy is not None:
+            # Every request and its hedges need a thread of their own to be waited for concurrently
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=(hedge_policy.max_hedges + 1)
+                * (pool_maxsize or requests.adapters.DEFAULT_POOLSIZE),
+                thread_name_prefix="routingpy-hedge",
+            )
         super(Client, self).__init__(
             base_url,
             user_agent=user_agent,
@@ -79,10 +174,20 @@ class Client(BaseClient):
             retry_timeout=retry_timeout,
             retry_over_query_limit=retry_over_query_limit,
             skip_api_error=skip_api_error,
+            cache=cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            concurrency_limiter=concurrency_limiter,
+            hedge_policy=hedge_policy,
+            coalesce=coalesce,
+            hooks=hooks,
+            codec=codec,
+            lazy=lazy,
+            keep_raw=keep_raw,
             **kwargs
         )
 
-        self.kwargs = kwargs or {}
+        self.kwargs = dict(kwargs)
         try:
             self.headers.update(self.kwargs["headers"])
         except KeyError:
@@ -103,6 +208,7 @@ class Client(BaseClient):
         first_request_time=None,
         retry_counter=0,
         dry_run=None,
+        stream=False,
     ):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
@@ -126,6 +232,10 @@ class Client(BaseClient):
         :param dry_run: If true, only prints URL and parameters. true or false.
         :type dry_run: bool
 
+        :param stream: If true, returns the body of a successful response as file-like object, which is read
+            incrementally, instead of decoding it. The response isn't cached or shared with coalesced requests.
+        :type stream: bool
+
         :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
         :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
         :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
@@ -138,113 +248,225 @@ class Client(BaseClient):
         :rtype: dict
         """
 
-        if not first_request_time:
-            first_request_time = datetime.now()
-
-        elapsed = datetime.now() - first_request_time
-        if elapsed > self.retry_timeout:
-            raise exceptions.Timeout()
-
-        if retry_counter > 0:
-            # 0.5 * (1.5 ^ i) is an increased sleep time of 1.5x per iteration,
-            # starting at 0.5s when retry_counter=1. The first retry will occur
-            # at 1, so subtract that first.
-            delay_seconds = 1.5 ** (retry_counter - 1)
-
-            # Jitter this value by 50% and pause.
-            time.sleep(delay_seconds * (random.random() + 0.5))
-
+        start = time.monotonic()
         authed_url = self._generate_auth_url(url, get_params)
 
-        final_requests_kwargs = self.kwargs
-
-        # Determine GET/POST.
-        requests_method = self._session.get
-        if post_params is not None:
-            requests_method = self._session.post
-            if final_requests_kwargs["headers"]["Content-Type"] == "application/json":
-                final_requests_kwargs["json"] = post_params
-            else:
-                # Send as x-www-form-urlencoded key-value pair string (e.g. Mapbox API)
-                final_requests_kwargs["data"] = post_params
+        requests_method, final_requests_kwargs = self._request_kwargs(post_params)
+        prepare = time.monotonic() - start
 
         # Only print URL and parameters for dry_run
         if dry_run:
-            print(
-                "url:\n{}\nParameters:\n{}".format(
-                    self.base_url + authed_url, json.dumps(final_requests_kwargs, indent=2)
-                )
-            )
+            self._print_dry_run(authed_url, final_requests_kwargs)
             return
 
-        try:
-            response = requests_method(self.base_url + authed_url, **final_requests_kwargs)
-            self._req = response.request
-
-        except requests.exceptions.Timeout:
-            raise exceptions.Timeout()
-
-        tried = retry_counter + 1
-
-        if response.status_code in _RETRIABLE_STATUSES:
-            # Retry request.
-            warnings.warn(
-                "Server down.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
-                UserWarning,
+        if self.hooks:
+            self._endpoint.set(self._endpoint_name(url))
+        if stream:
+            final_requests_kwargs = dict(final_requests_kwargs, stream=True)
+            return self._fetch(
+                requests_method,
+                authed_url,
+                final_requests_kwargs,
+                None,
+                first_request_time,
+                retry_counter,
+                prepare,
+            )[0]
+
+        key = self._cache_key(requests_method, url, get_params, post_params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._attempts.set(0)
+            return cached
+
+        def _fetch():
+            return self._fetch(
+                requests_method,
+                authed_url,
+                final_requests_kwargs,
+                key,
+                first_request_time,
+                retry_counter,
+                prepare,
             )
 
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+        if not self.coalesce:
+            return _fetch()[0]
+        return self._coalesced(self._request_key(requests_method, url, get_params, post_params), _fetch)
 
-        try:
-            result = self._get_body(response)
-
-            return result
+    def _fetch(self, method, path, kwargs, key, first_request_time, retry_counter, prepare=None):
+        """Requests until a response is final, retrying according to the retry policy.
 
-        except exceptions.RouterApiError:
-            if self.skip_api_error:
-                warnings.warn(
-                    "Router {} returned an API error with "
-                    "the following message:\n{}".format(self.__class__.__name__, response.text)
-                )
-                return
+        :param prepare: The seconds it took to build the request parameters and encode the body, which are
+            reported with the first attempt's "request" event.
 
+        :returns: The body and the raw content of the final response.
+        :rtype: tuple
+        """
+        endpoint = self._endpoint.get()
+        first_request_time = first_request_time or datetime.now()
+        tried = retry_counter
+        timings = None if prepare is None else {"prepare": prepare}
+        try:
+            while True:
+                if datetime.now() - first_request_time > self.retry_timeout:
+                    raise exceptions.Timeout()
+
+                tried += 1
+                self._attempts.set(tried)
+                self._emit("request", endpoint, tried, timings=timings)
+                timings = None
+                start = time.monotonic()
+                try:
+                    response = self._dispatch(method, path, kwargs)
+                    if kwargs.get("stream") and response.status_code == 200:
+                        return self._streamed(response, endpoint, tried, start), None
+                    return self._received(response, key, endpoint, tried, start), response.content
+
+                except _Retry as retry:
+                    delay = self._retry_delay(retry, tried, first_request_time)
+                    self._emit("retry", endpoint, tried, error=retry.error, timings={"delay": delay})
+                    time.sleep(delay)
+
+        except Exception as e:
+            self._emit("error", endpoint, tried, error=e)
             raise
 
-        except exceptions.RetriableRequest as e:
-            if isinstance(e, exceptions.OverQueryLimit) and not self.retry_over_query_limit:
-                raise
-
-            warnings.warn(
-                "Rate limit exceeded.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
-                UserWarning,
-            )
-            # Retry request.
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+    def _streamed(self, response, endpoint, attempt, start):
+        """Returns the body of a successful streamed response as file-like object and emits a "response" event.
 
-    @property
-    def req(self):
-        """Holds the :class:`requests.PreparedRequest` property for the last request."""
-        return self._req
+        :param start: The :func:`time.monotonic` the attempt was started at.
+        """
+        size = int(response.headers.get("Content-Length", 0))
+        self._emit_response(endpoint, attempt, response, time.monotonic() - start, 0, size)
+        response.raw.decode_content = True
+        return response.raw
+
+    def _coalesced(self, flight_key, fetch):
+        """Lets concurrent identical requests share the response of the first one. The others parse its raw
+        content themselves, so every caller gets a body of its own.
+        """
+        with self._flights_lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = Future()
+            else:
+                self.coalesced_requests += 1
 
-    @staticmethod
-    def _get_body(response):
-        status_code = response.status_code
+        if not leader:
+            self._attempts.set(0)
+            return self._decode_shared(flight.result())
 
         try:
-            body = response.json()
-        except json.decoder.JSONDecodeError:
-            raise exceptions.JSONParseError("Can't decode JSON response:{}".format(response.text))
+            body, content = fetch()
+            flight.set_result(None if body is None else content)
+            return body
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[flight_key]
 
-        if status_code == 429:
-            raise exceptions.OverQueryLimit(status_code, body)
+    def _dispatch(self, method, path, kwargs):
+        """Sends a request, hedged according to the hedge policy if the client has one.
 
-        if 400 <= status_code < 500:
-            raise exceptions.RouterApiError(status_code, body)
+        :param path: The authenticated URL path, which is appended to the base URL.
+
+        :raises _Retry: if all requests failed with a retriable exception.
+        """
+        if self.hedge_policy is None:
+            return self._send(method, path, kwargs)
+
+        policy = self.hedge_policy
+        delay = policy.delay()
+
+        def _timed_send(base_url):
+            start = time.monotonic()
+            response = self._send(method, path, kwargs, base_url)
+            policy.observe(time.monotonic() - start)
+            return response
+
+        pending = {}
+        done = set()
+        sent = 0
+        error = None
+        while True:
+            if sent <= policy.max_hedges and not done:
+                base_url = policy.base_url(None, sent)
+                # Copies the context, so hooks see the endpoint and attempt of the request
+                send = functools.partial(contextvars.copy_context().run, _timed_send, base_url)
+                pending[self._hedge_executor.submit(send)] = sent
+                sent += 1
+
+            done, _ = wait(
+                pending, timeout=delay if sent <= policy.max_hedges else None, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                hedge = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+
+                # Running requests can't be interrupted, their responses are discarded
+                for loser in pending:
+                    loser.cancel()
+                policy.record(sent - 1, hedge)
+                self._local.req = response.request
+                return response
+
+            if not pending:
+                raise error
+
+    def _send(self, method, path, kwargs, base_url=None):
+        """Sends a single HTTP request once the rate and concurrency limits allow it.
+
+        :param base_url: The base URL to send the request to. Default None, i.e. the client's base URL or the one
+            its load balancer chooses.
+
+        :raises _Retry: if the request failed with a retriable exception.
+        """
+        delay = self._rate_limit_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        token = self.concurrency_limiter.acquire() if self.concurrency_limiter else None
+        chosen = base_url is None
+        if chosen:
+            base_url = self._acquire_base_url()
+        response = error = None
+        try:
+            response = self._session.request(method, base_url + path, **kwargs)
+        except requests.exceptions.RequestException as e:
+            error = e
+            raise self._transport_error(e, requests.exceptions.Timeout)
+        finally:
+            self._release_concurrency(token, response, error, requests.exceptions.Timeout)
+            if chosen:
+                self._release_base_url(base_url, response, error)
+        self._local.req = response.request
+
+        return response
+
+    def close(self):
+        """
+        Closes the connection pool and shuts down the thread pool of hedged requests. Hedges which are still
+        running finish in the background without blocking. The client can't be used afterwards.
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self._session.close()
 
-        if 500 <= status_code:
-            raise exceptions.RouterServerError(status_code, body)
+    def __enter__(self):
+        return self
 
-        if status_code != 200:
-            raise exceptions.RouterError(status_code, body)
+    def __exit__(self, *exc_info):
+        self.close()
 
-        return body
+    @property
+    def req(self):
+        """Holds the :class:`requests.PreparedRequest` property for the last request of the current thread."""
+        return getattr(self._local, "req", None)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+:class:`JSONCodec` encodes request bodies and decodes response bodies of clients.
+"""
+
+import functools
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec(object):
+    """
+    A pair of JSON ``loads`` and ``dumps`` functions, e.g. of ``ujson``. Clients use :func:`default_codec` unless
+    they get another one.
+
+    >>> import ujson
+    >>> from routingpy import Valhalla
+    >>> from routingpy.codec import JSONCodec
+    >>> router = Valhalla(url, codec=JSONCodec(ujson.loads, ujson.dumps))
+    >>> router = Valhalla(url, codec=ujson)  # same, anything with loads and dumps works
+    """
+
+    def __init__(self, loads=json.loads, dumps=json.dumps):
+        """
+        :param loads: Decodes a JSON document from bytes.
+        :type loads: callable
+
+        :param dumps: Encodes an object to a JSON document as str or bytes.
+        :type dumps: callable
+        """
+        self.loads = loads
+        self.dumps = dumps
+
+    def encode(self, obj):
+        """
+        Encodes an object to a JSON document.
+
+        :rtype: bytes
+        """
+        encoded = self.dumps(obj)
+        return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+    def decode(self, content):
+        """
+        Decodes a JSON document.
+
+        :param content: The JSON document.
+        :type content: bytes or str
+
+        :raises ValueError: if the document isn't valid JSON.
+        """
+        return self.loads(content)
+
+    def __repr__(self):  # pragma: no cover
+        return "JSONCodec({}, {})".format(
+            getattr(self.loads, "__module__", self.loads), getattr(self.dumps, "__module__", self.dumps)
+        )
+
+
+def as_codec(codec):
+    """
+    Returns a :class:`JSONCodec` for anything with ``loads`` and ``dumps``, e.g. the ``json`` module.
+
+    :param codec: The codec, None for :func:`default_codec`.
+    :type codec: :class:`JSONCodec` or object
+
+    :rtype: :class:`JSONCodec`
+    """
+    if codec is None:
+        return default_codec()
+    if isinstance(codec, JSONCodec):
+        return codec
+    return JSONCodec(codec.loads, codec.dumps)
+
+
+def default_codec():
+    """
+    Returns a codec based on ``orjson`` if it's installed (``pip install routingpy[orjson]``), which decodes
+    large responses several times faster, else on the standard library's ``json``.
+
+    :rtype: :class:`JSONCodec`
+    """
+    if orjson is not None:
+        # Locations often come as numpy arrays or scalars
+        return JSONCodec(
+            orjson.loads,
+            functools.partial(orjson.dumps, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        )
+
+    # Same as requests' encoding of json= bodies
+    return JSONCodec(json.loads, functools.partial(json.dumps, allow_nan=False))
@@ -25,6 +25,8 @@ class Directions(object):
     response, which can be accessed via the property ``raw``.
     """
 
+    __slots__ = ("_directions", "_raw")
+
     def __init__(self, directions=None, raw=None):
         """
         Initialize a :class:`Directions` instance to hold multiple :class:`Direction` instances in a list-like fashion.
@@ -62,14 +64,19 @@ class Directions(object):
 class Direction(object):
     """
     Contains a parsed directions response. Access via properties ``geometry``, ``duration`` and ``distance``.
+
+    Clients with ``lazy=True`` decode the ``geometry`` only on its first access.
     """
 
+    __slots__ = ("_geometry", "_duration", "_distance", "_raw")
+
     def __init__(self, geometry=None, duration=None, distance=None, raw=None):
         """
         Initialize a :class:`Direction` object to hold the properties of a directions request.
 
-        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order.
-        :type geometry: list of list
+        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order, or a callable returning it on
+            first access.
+        :type geometry: list of list or callable
 
         :param duration: The duration of the direction in seconds.
         :type duration: int or float
@@ -93,6 +100,8 @@ class Direction(object):
 
         :rtype: list or None
         """
+        if callable(self._geometry):
+            self._geometry = self._geometry()
         return self._geometry
 
     @property
@@ -71,3 +71,14 @@ class OverQueryLimit(RouterError, RetriableRequest):
     """
 
     pass
+
+
+class RouterUnavailable(Exception):
+    """Signifies that no router of a :class:`routingpy.routers.failover.Failover` could answer the request.
+
+    The exceptions of the routers which were tried are available as ``errors``.
+    """
+
+    def __init__(self, message, errors=None):
+        super(RouterUnavailable, self).__init__(message)
+        self.errors = errors or []
@@ -17,7 +17,32 @@
 """
 :class:`Expansion` returns expansion results.
 """
-from typing import List, Optional, Tuple, Union
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .matrix import _to_array
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+#: The expansion properties of a response and the corresponding :class:`Edge` attributes.
+_PROPERTIES = {
+    "distances": "distance",
+    "durations": "duration",
+    "costs": "cost",
+    "edge_ids": "edge_id",
+    "statuses": "status",
+}
+
+_DTYPES = {"edge_ids": "int64", "statuses": str}
+
+_GEOMETRIES = "features.item.geometry.coordinates"
+_LINE = _GEOMETRIES + ".item"
+_POINT = _LINE + ".item"
+_COORDINATE = _POINT + ".item"
+_FEATURE_PROPERTIES = "features.item.properties."
 
 
 class Edge:
@@ -26,6 +51,8 @@ class Edge:
     Access via properties ``geometry``, ``distances`` ``durations``, ``costs``, ``edge_ids``, ``statuses``.
     """
 
+    __slots__ = ("_geometry", "_distance", "_duration", "_cost", "_edge_id", "_status")
+
     def __init__(
         self, geometry=None, distances=None, durations=None, costs=None, edge_ids=None, statuses=None
     ):
@@ -43,6 +70,8 @@ class Edge:
 
         :rtype: list or None
         """
+        if callable(self._geometry):
+            self._geometry = self._geometry()
         return self._geometry
 
     @property
@@ -92,23 +121,51 @@ class Edge:
         return self._status
 
     def __repr__(self):  # pragma: no cover
-        return "Edge({})".format(", ".join([f"{k[1:]}: {v}" for k, v in vars(self).items() if v]))
+        return "Edge({})".format(
+            ", ".join([f"{k[1:]}: {getattr(self, k)}" for k in self.__slots__ if getattr(self, k)])
+        )
 
 
 class Expansions:
     """
-    Contains a list of :class:`Edge`, which can be iterated over or accessed by index. The property ¸`raw`` contains
-    the complete raw response of the expansion request.
+    Contains the edges of an expansion in columns: the ``geometries`` and, if requested, the parallel ``distances``,
+    ``durations``, ``costs``, ``edge_ids`` and ``statuses`` lists. Iterating or indexing returns an :class:`Edge`
+    view for each edge, which is only created on access. The property ``raw`` contains the complete raw response
+    of the expansion request.
+
+    If numpy is installed, :meth:`array` returns a column as :class:`numpy.ndarray`.
     """
 
+    __slots__ = ("_geometries", "_properties", "_center", "_interval_type", "_raw")
+
     def __init__(
         self,
         edges: Optional[List[Edge]] = None,
         center: Optional[Union[List[float], Tuple[float]]] = None,
         interval_type: Optional[str] = None,
         raw: Optional[dict] = None,
+        geometries: Optional[List[List[List[float]]]] = None,
+        properties: Optional[Dict[str, list]] = None,
     ):
-        self._edges = edges
+        """
+        :param edges: The edges as list of :class:`Edge`, which are stored in columns. Use ``geometries`` and
+            ``properties`` instead to pass the columns directly.
+
+        :param geometries: The line of each edge as [[lon1, lat1], [lon2, lat2]] list.
+
+        :param properties: The requested expansion properties as dict of property name, e.g. "distances", and
+            a list parallel to ``geometries``.
+        """
+        if edges is not None:
+            geometries = [edge.geometry for edge in edges]
+            properties = {}
+            for name, attr in _PROPERTIES.items():
+                values = [getattr(edge, attr) for edge in edges]
+                if any(value is not None for value in values):
+                    properties[name] = values
+
+        self._geometries = geometries if geometries is not None else []
+        self._properties = properties or {}
         self._center = center
         self._interval_type = interval_type
         self._raw = raw
@@ -141,20 +198,280 @@ class Expansions:
         """
         return self._interval_type
 
+    @property
+    def geometries(self) -> List[List[List[float]]]:
+        """
+        The line of each edge as [[lon1, lat1], [lon2, lat2]] list.
+
+        :rtype: list
+        """
+        return self._geometries
+
+    @property
+    def distances(self) -> Optional[list]:
+        """
+        The accumulated distance in meters of each edge, if requested.
+
+        :rtype: list of int or None
+        """
+        return self._properties.get("distances")
+
+    @property
+    def durations(self) -> Optional[list]:
+        """
+        The accumulated duration in seconds of each edge, if requested.
+
+        :rtype: list of int or None
+        """
+        return self._properties.get("durations")
+
+    @property
+    def costs(self) -> Optional[list]:
+        """
+        The accumulated cost of each edge, if requested.
+
+        :rtype: list of int or None
+        """
+        return self._properties.get("costs")
+
+    @property
+    def edge_ids(self) -> Optional[list]:
+        """
+        The internal ID of each edge, if requested.
+
+        :rtype: list of int or None
+        """
+        return self._properties.get("edge_ids")
+
+    @property
+    def statuses(self) -> Optional[list]:
+        """
+        The state of each edge, if requested. Can be one of "r" (reached), "s" (settled), "c" (connected).
+
+        :rtype: list of str or None
+        """
+        return self._properties.get("statuses")
+
+    def array(self, name: str, dtype: Optional[str] = None):
+        """
+        Returns a column as contiguous :class:`numpy.ndarray`, e.g. ``expansions.array("durations")``.
+        ``"geometries"`` returns an array of shape (edges, 2, 2) if all lines have two points.
+
+        :param name: One of "geometries", "distances", "durations", "costs", "edge_ids" or "statuses".
+
+        :param dtype: The numpy dtype of the array. Default "int64" for "edge_ids", str for "statuses" and
+            "float64" otherwise.
+
+        :rtype: numpy.ndarray or None
+        """
+        if name == "geometries":
+            values = self._geometries
+        elif name in _PROPERTIES:
+            values = self._properties.get(name)
+        else:
+            raise ValueError("Unknown expansion property '{}'.".format(name))
+
+        return _to_array(values, dtype or _DTYPES.get(name, "float64"))
+
+    def _edge(self, idx):
+        return Edge(
+            self._geometries[idx], **{name: values[idx] for name, values in self._properties.items()}
+        )
+
     def __repr__(self):  # pragma: no cover
-        if len(self._edges) < 10:
-            return "Expansions({}, {})".format(self._edges, self.raw)
+        if len(self) < 10:
+            return "Expansions({}, {})".format(list(self), self.raw)
         else:
             return "Expansions({}, ..., {})".format(
-                ", ".join([str(e) for e in self._edges[:3]]),
-                ", ".join(str(e) for e in self._edges[-3:]),
+                ", ".join([str(e) for e in self[:3]]),
+                ", ".join(str(e) for e in self[-3:]),
             )
 
     def __getitem__(self, item):
-        return self._edges[item]
+        if isinstance(item, slice):
+            return [self._edge(idx) for idx in range(*item.indices(len(self)))]
+        return self._edge(item)
 
     def __iter__(self):
-        return iter(self._edges)
+        return (self._edge(idx) for idx in range(len(self)))
+
+    def __len__(self):
+        return len(self._geometries)
+
+
+class _Column:
+    """Buffers a column of a streamed expansion until the edges can be assembled, numbers in compact arrays."""
+
+    __slots__ = ("_values", "_offsets")
+
+    def __init__(self, name):
+        self._offsets = None
+        if name == "geometries":
+            # The flat coordinates and the end offset of each line
+            self._values = array("d")
+            self._offsets = array("L")
+        elif name == "edge_ids":
+            self._values = array("q")
+        elif name == "statuses":
+            self._values = []
+        else:
+            self._values = array("d")
+
+    def append(self, value):
+        if self._offsets is not None:
+            for point in value:
+                self._values.extend(point)
+            self._offsets.append(len(self._values))
+        else:
+            self._values.append(value)
+
+    def __getitem__(self, idx):
+        if self._offsets is not None:
+            start = self._offsets[idx - 1] if idx else 0
+            coords = self._values[start : self._offsets[idx]].tolist()
+            return [coords[i : i + 2] for i in range(0, len(coords), 2)]
+
+        value = self._values[idx]
+        return int(value) if isinstance(value, float) and value.is_integer() else value
 
     def __len__(self):
-        return len(self._edges)
+        return len(self._offsets if self._offsets is not None else self._values)
+
+
+class StreamedExpansions:
+    """
+    Yields the :class:`Edge` objects of an expansion while the response is read, see ``stream`` of
+    :meth:`routingpy.routers.Valhalla.expansion`. Can be iterated only once, the response is closed afterwards or
+    with :meth:`close`.
+
+    The response holds the geometries and every property in separate arrays. All but the last of them are
+    buffered in compact arrays, which take a fraction of the memory of the decoded response, and the edges are
+    yielded while the last one is read. Without ``expansion_properties`` no edges are buffered at all.
+
+    Needs the ijson package, install it with ``pip install routingpy[ijson]``.
+    """
+
+    __slots__ = ("_source", "_properties", "_center", "_interval_type", "_raw")
+
+    def __init__(
+        self,
+        source=None,
+        center: Optional[Union[List[float], Tuple[float]]] = None,
+        interval_type: Optional[str] = None,
+        expansion_properties: Optional[List[str]] = None,
+    ):
+        """
+        :param source: The response body as file-like object or bytes.
+
+        :param expansion_properties: The requested expansion properties, e.g. "distances".
+        """
+        self._source = source
+        self._properties = tuple(prop for prop in expansion_properties or () if prop in _PROPERTIES)
+        self._center = center
+        self._interval_type = interval_type
+        self._raw = None
+
+    @property
+    def raw(self) -> None:
+        """Always None, the raw response isn't kept while streaming."""
+        return self._raw
+
+    @property
+    def center(self) -> Optional[Union[List[float], Tuple[float]]]:
+        """
+        The center coordinate in [lon, lat] of the expansion, which is the location from the user input.
+
+        :rtype: list of float
+        """
+        return self._center
+
+    @property
+    def interval_type(self) -> Optional[str]:
+        """
+        Was it based on 'distance' or 'time'?
+
+        :return: str
+        """
+        return self._interval_type
+
+    def close(self):
+        """Closes the response without reading the rest of it."""
+        source, self._source = self._source, None
+        if hasattr(source, "close"):
+            source.close()
+
+    def __iter__(self) -> Iterator[Edge]:
+        if self._source is None:
+            return iter(())
+        if ijson is None:  # pragma: no cover
+            raise ImportError("Streaming needs the ijson package, install it with 'pip install ijson'.")
+
+        return self._edges()
+
+    def _edges(self):
+        columns = {}
+        pending = {"geometries", *self._properties}
+        streaming = None
+        count = 0
+        try:
+            for name, event, value in self._events():
+                if event == "start_array":
+                    # The last column yields the edges, the others are buffered until then
+                    if pending == {name}:
+                        streaming = name
+                    else:
+                        columns[name] = _Column(name)
+                elif event == "end_array":
+                    pending.discard(name)
+                elif name == streaming:
+                    yield self._edge(columns, count, name, value)
+                    count += 1
+                else:
+                    columns[name].append(value)
+        finally:
+            self.close()
+
+        # Requested properties which weren't in the response
+        if streaming is None and "geometries" in columns:
+            for idx in range(len(columns["geometries"])):
+                yield self._edge(columns, idx)
+
+    def _events(self):
+        """Yields the column name and the JSON event of columns, complete lines as "line" events."""
+        line = point = None
+        for prefix, event, value in ijson.parse(self._source, use_float=True):
+            if prefix == _COORDINATE:
+                point.append(value)
+            elif prefix == _POINT:
+                if event == "start_array":
+                    point = []
+                else:
+                    line.append(point)
+            elif prefix == _LINE:
+                if event == "start_array":
+                    line = []
+                else:
+                    yield "geometries", "line", line
+            elif prefix == _GEOMETRIES:
+                yield "geometries", event, value
+            elif prefix.startswith(_FEATURE_PROPERTIES):
+                name = prefix[len(_FEATURE_PROPERTIES) :]
+                if name.endswith(".item"):
+                    name = name[:-5]
+                    if name in self._properties:
+                        yield name, "value", value
+                elif name in self._properties and event in ("start_array", "end_array"):
+                    yield name, event, value
+
+    def _edge(self, columns, idx, name=None, value=None):
+        values = {}
+        for column in ("geometries", *self._properties):
+            if column == name:
+                values[column] = value
+            elif column in columns and idx < len(columns[column]):
+                values[column] = columns[column][idx]
+
+        return Edge(values.pop("geometries", None), **values)
+
+    def __repr__(self):  # pragma: no cover
+        return "StreamedExpansions({}, {})".format(self._center, self._interval_type)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+:class:`HedgePolicy` lets clients send duplicate requests when a response is late, to cut tail latencies.
+"""
+
+import math
+import threading
+from collections import deque
+
+
+class HedgePolicy(object):
+    """
+    Configures hedged requests of a client. If a response didn't arrive after :meth:`delay` seconds, the client
+    sends the same request again, to the same server or the next of ``base_urls``, and returns whichever response
+    arrives first. The slower request is cancelled if the client supports it, i.e. :class:`AsyncClient`, and
+    otherwise discarded once it finished.
+
+    By default the delay is the ``percentile`` of the latencies the policy observed, so only about 5% of the
+    requests are hedged. Routing requests don't change any state on the server, so sending them twice is safe.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.hedging import HedgePolicy
+    >>> policy = HedgePolicy(percentile=95, base_urls=["http://osrm-2:5000"])
+    >>> router = OSRM("http://osrm-1:5000", hedge_policy=policy)
+    >>> routes = [router.directions(locations, profile="car") for locations in many_locations]
+    >>> policy.hedges, policy.hedge_wins
+    (52, 31)
+    """
+
+    def __init__(
+        self,
+        delay=None,
+        percentile=95,
+        initial_delay=1.0,
+        min_samples=20,
+        window=500,
+        max_hedges=1,
+        base_urls=None,
+    ):
+        """
+        :param delay: Fixed seconds to wait before hedging. Default None, i.e. the observed ``percentile``.
+        :type delay: float
+
+        :param percentile: Percentile of the observed latencies to wait before hedging. Default 95.
+        :type percentile: float
+
+        :param initial_delay: Seconds to wait before hedging until ``min_samples`` latencies were observed.
+            Default 1.
+        :type initial_delay: float
+
+        :param min_samples: Number of observed latencies needed to use the percentile. Default 20.
+        :type min_samples: int
+
+        :param window: Number of most recent latencies the percentile is calculated from. Default 500.
+        :type window: int
+
+        :param max_hedges: Maximum number of duplicate requests per request, each sent after another delay.
+            Default 1.
+        :type max_hedges: int
+
+        :param base_urls: Alternate base URLs the duplicates are sent to in turn, e.g. other replicas of the same
+            server. Default None, i.e. the client's base URL or the replica its load balancer chooses.
+        :type base_urls: list of str
+        """
+        if max_hedges < 1:
+            raise ValueError("max_hedges must be at least 1, not {}.".format(max_hedges))
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100, not {}.".format(percentile))
+
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.base_urls = list(base_urls or [])
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def win_rate(self):
+        """The share of hedges which answered before the original request, None before the first hedge."""
+        with self._lock:
+            return self.hedge_wins / self.hedges if self.hedges else None
+
+    def delay(self):
+        """
+        Returns the seconds to wait for a response before hedging.
+
+        :rtype: float
+        """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            latencies = sorted(self._latencies)
+
+        return latencies[min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100) - 1)]
+
+    def base_url(self, base_url, hedge):
+        """
+        Returns the base URL of a request.
+
+        :param base_url: The base URL of the original request, None to let the client choose.
+        :type base_url: str
+
+        :param hedge: The number of the hedge, 0 for the original request.
+        :type hedge: int
+
+        :rtype: str
+        """
+        if hedge == 0 or not self.base_urls:
+            return base_url
+        return self.base_urls[(hedge - 1) % len(self.base_urls)]
+
+    def observe(self, latency):
+        """
+        Records the latency of a response.
+
+        :param latency: Seconds from sending the request to receiving the response.
+        :type latency: float
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def record(self, hedges, winner):
+        """
+        Records the outcome of a request.
+
+        :param hedges: The number of duplicates sent.
+        :type hedges: int
+
+        :param winner: The number of the request which answered first, 0 for the original request.
+        :type winner: int
+        """
+        with self._lock:
+            self.requests += 1
+            self.hedges += hedges
+            self.hedge_wins += winner > 0
+
+    def __repr__(self):  # pragma: no cover
+        return "HedgePolicy(requests={}, hedges={}, hedge_wins={})".format(
+            self.requests, self.hedges, self.hedge_wins
+        )
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Instrumentation of clients. Hooks are callables which are passed to a client, e.g. ``OSRM(hooks=[print])``,
+and called with a :class:`RequestEvent` at every step of a request.
+"""
+
+import bisect
+import threading
+
+#: Upper bounds of the default latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class RequestEvent(object):
+    """
+    Describes one step of a request. Which attributes are set depends on the ``type``:
+
+    - ``"request"``: an attempt is about to be sent. For the first attempt, ``timings["prepare"]`` holds the
+      seconds spent on building the request parameters and encoding the body, which retries reuse.
+    - ``"response"``: a response was received, also with an error status. ``timings`` holds the seconds
+      spent on the ``"network"`` and on ``"decode"``-ing the JSON body.
+    - ``"retry"``: the attempt failed and is retried after ``timings["delay"]`` seconds.
+    - ``"rate_limit"``: the client waits ``timings["delay"]`` seconds for its rate limiter.
+    - ``"error"``: the request failed for good with ``error``.
+    - ``"parse"``: the router parsed the body into its result in ``timings["parse"]`` seconds.
+    """
+
+    __slots__ = (
+        "type",
+        "router",
+        "endpoint",
+        "attempt",
+        "status_code",
+        "bytes_sent",
+        "bytes_received",
+        "timings",
+        "error",
+    )
+
+    def __init__(
+        self,
+        type,
+        router=None,
+        endpoint=None,
+        attempt=None,
+        status_code=None,
+        bytes_sent=None,
+        bytes_received=None,
+        timings=None,
+        error=None,
+    ):
+        """
+        :param type: One of "request", "response", "retry", "rate_limit", "error" or "parse".
+        :type type: str
+
+        :param router: The class name of the router, e.g. "Valhalla".
+        :type router: str
+
+        :param endpoint: The URL path with locations replaced by ``{locations}``, e.g. "/sources_to_targets"
+            or "/table/v1/driving/{locations}".
+        :type endpoint: str
+
+        :param attempt: The number of the attempt, starting with 1.
+        :type attempt: int
+
+        :param status_code: The HTTP status of the response.
+        :type status_code: int
+
+        :param bytes_sent: Size of the request body.
+        :type bytes_sent: int
+
+        :param bytes_received: Size of the response body.
+        :type bytes_received: int
+
+        :param timings: Durations of the step's phases in seconds.
+        :type timings: dict
+
+        :param error: The exception which failed the request or the attempt.
+        :type error: Exception
+        """
+        self.type = type
+        self.router = router
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code = status_code
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.timings = timings or {}
+        self.error = error
+
+    def __repr__(self):  # pragma: no cover
+        return "RequestEvent({})".format(
+            ", ".join(
+                "{}={!r}".format(name, getattr(self, name))
+                for name in self.__slots__
+                if getattr(self, name) not in (None, {})
+            )
+        )
+
+
+class Histogram(object):
+    """
+    Counts observations in buckets, like Prometheus histograms. Not thread-safe on its own.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets, the last one should be infinity.
+        :type buckets: list of float
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Adds a value."""
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """
+        Returns the number of observations less than or equal to each upper bound.
+
+        :rtype: list of (float, int)
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket containing the ``q`` quantile, None without observations.
+
+        :param q: The quantile between 0 and 1, e.g. 0.99.
+        :type q: float
+
+        :rtype: float
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class LatencyCollector(object):
+    """
+    Hook which keeps a latency histogram per router, endpoint and phase, i.e. "prepare", "network", "decode" and
+    "parse".
+    It can be shared by many clients.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.hooks import LatencyCollector
+    >>> collector = LatencyCollector()
+    >>> router = Valhalla(url, hooks=[collector])
+    >>> matrix = router.matrix(locations)
+    >>> collector.histogram("Valhalla", "/sources_to_targets", "parse").quantile(0.99)
+    0.05
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the histogram buckets in seconds. Default :data:`DEFAULT_BUCKETS`.
+        :type buckets: list of float
+        """
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.type not in ("request", "response", "parse"):
+            return
+        with self._lock:
+            for phase, duration in event.timings.items():
+                key = (event.router, event.endpoint, phase)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(self.buckets)
+                self._histograms[key].observe(duration)
+
+    def histogram(self, router, endpoint, phase="network"):
+        """
+        Returns a copy of the histogram of a router's endpoint, None if nothing was observed.
+
+        :param router: The class name of the router, e.g. "Valhalla".
+        :type router: str
+
+        :param endpoint: The endpoint as in :attr:`RequestEvent.endpoint`.
+        :type endpoint: str
+
+        :param phase: One of "prepare", "network", "decode" or "parse". Default "network".
+        :type phase: str
+
+        :rtype: :class:`Histogram`
+        """
+        with self._lock:
+            histogram = self._histograms.get((router, endpoint, phase))
+            if histogram is None:
+                return None
+            copy = Histogram(histogram.buckets)
+            copy.counts, copy.count, copy.sum = list(histogram.counts), histogram.count, histogram.sum
+
+        return copy
+
+    def snapshot(self):
+        """
+        Returns copies of all histograms.
+
+        :returns: Histograms by (router, endpoint, phase).
+        :rtype: dict
+        """
+        with self._lock:
+            keys = list(self._histograms)
+        return {key: self.histogram(*key) for key in keys}
+
+    def clear(self):
+        """Removes all histograms."""
+        with self._lock:
+            self._histograms.clear()
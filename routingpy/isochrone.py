@@ -21,10 +21,12 @@
 
 class Isochrones(object):
     """
-    Contains a list of :class:`Isochrone`, which can be iterated over or accessed by index. The property ¸`raw`` contains
+    Contains a list of :class:`Isochrone`, which can be iterated over or accessed by index. The property ``raw`` contains
     the complete raw response of the isochrones request.
     """
 
+    __slots__ = ("_isochrones", "_raw")
+
     def __init__(self, isochrones=None, raw=None):
         self._isochrones = isochrones
         self._raw = raw
@@ -54,8 +56,12 @@ class Isochrones(object):
 class Isochrone(object):
     """
     Contains a parsed single isochrone response. Access via properties ``geometry``, ``interval``, ``center``, ``interval_type``.
+
+    Clients with ``lazy=True`` decode the ``geometry`` only on its first access.
     """
 
+    __slots__ = ("_geometry", "_interval", "_center", "_interval_type")
+
     def __init__(self, geometry=None, interval=None, center=None, interval_type=None):
         self._geometry = geometry
         self._interval = int(interval)
@@ -69,6 +75,8 @@ class Isochrone(object):
 
         :rtype: list or None
         """
+        if callable(self._geometry):
+            self._geometry = self._geometry()
         return self._geometry
 
     @property
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Client side limiters, which can be passed to every client and be shared by many clients.
+
+All limiters work with the default client and :class:`routingpy.client_async.AsyncClient`: rate limiters never
+sleep themselves, they tell the client how long to wait, and concurrency limiters can be waited for by threads
+and asyncio tasks alike.
+"""
+
+import asyncio
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+def _refill(tokens, last, now, rate, burst):
+    """Returns the tokens after refilling the bucket for the time passed since ``last``."""
+    return min(burst, tokens + max(0.0, now - last) * rate)
+
+
+class TokenBucket(object):
+    """
+    Rate limiter allowing ``rate`` requests per second on average and bursts of up to ``burst`` requests.
+    It's thread-safe and can be shared by all clients of a process using the same API key.
+
+    >>> from routingpy import HereMaps, Google
+    >>> from routingpy.limiters import TokenBucket
+    >>> limiter = TokenBucket(rate=10, burst=20)
+    >>> here_1 = HereMaps(api_key=key, rate_limiter=limiter)
+    >>> here_2 = HereMaps(api_key=key, rate_limiter=limiter)
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        :param rate: Number of requests per second.
+        :type rate: float
+
+        :param burst: Number of requests which can be sent at once after being idle. Default 1.
+        :type burst: int
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(
+                "rate must be positive and burst at least 1, not {} and {}.".format(rate, burst)
+            )
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token, possibly from the future, and returns how long to wait before sending the request.
+
+        :returns: Seconds to wait, 0 if the request can be sent right away.
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = _refill(self._tokens, self._last, now, self.rate, self.burst) - 1
+            self._last = now
+            tokens = self._tokens
+
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    :class:`TokenBucket` whose state lives in a small file, so all processes on a host using the same ``path``
+    share the rate, e.g. many workers with the same Google key. Needs ``fcntl``, i.e. a POSIX system.
+
+    >>> from routingpy import Google
+    >>> from routingpy.limiters import FileTokenBucket
+    >>> router = Google(api_key=key, rate_limiter=FileTokenBucket("/tmp/google.bucket", rate=50, burst=50))
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, path, rate, burst=1):
+        """
+        :param path: Path of the state file, which is created if it doesn't exist.
+        :type path: str
+
+        :param rate: Number of requests per second across all processes.
+        :type rate: float
+
+        :param burst: Number of requests which can be sent at once after being idle. Default 1.
+        :type burst: int
+        """
+        if fcntl is None:  # pragma: no cover
+            raise ImportError(
+                "FileTokenBucket needs the fcntl module, which is only available on POSIX systems."
+            )
+        super(FileTokenBucket, self).__init__(rate, burst)
+        self.path = path
+
+    def reserve(self):
+        # Wall clock time, since monotonic clocks can't be compared between processes
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            state = os.pread(fd, self._STATE.size, 0)
+            tokens, last = (
+                self._STATE.unpack(state) if len(state) == self._STATE.size else (self.burst, now)
+            )
+
+            tokens = _refill(tokens, last, now, self.rate, self.burst) - 1
+            os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+        finally:
+            os.close(fd)
+
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+
+class AIMDLimiter(object):
+    """
+    Adaptive concurrency limiter for batch workloads, shared by all threads or tasks using a client.
+
+    The number of requests in flight may grow additively by ``increase`` per round of ``limit`` healthy
+    responses. It's cut multiplicatively by ``decrease`` when the server signals overload, i.e. HTTP 429, 502, 503,
+    504, a timeout, or a latency of more than ``latency_tolerance`` times the usual latency. The current state is
+    observable via :attr:`limit` and :attr:`in_flight`.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.limiters import AIMDLimiter
+    >>> limiter = AIMDLimiter(initial_limit=8, max_limit=128)
+    >>> router = OSRM(url, concurrency_limiter=limiter, pool_maxsize=128)
+    >>> routes = router.directions_batch(many_locations, max_workers=128)
+    >>> limiter.limit
+    43
+    """
+
+    def __init__(
+        self,
+        initial_limit=4,
+        min_limit=1,
+        max_limit=64,
+        increase=1,
+        decrease=0.5,
+        latency_tolerance=2.0,
+    ):
+        """
+        :param initial_limit: Number of concurrent requests to start with. Default 4.
+        :type initial_limit: int
+
+        :param min_limit: Lower bound of the limit. Default 1.
+        :type min_limit: int
+
+        :param max_limit: Upper bound of the limit. Default 64.
+        :type max_limit: int
+
+        :param increase: Added to the limit for every round of ``limit`` healthy responses. Default 1.
+        :type increase: float
+
+        :param decrease: Factor the limit is multiplied with on overload. Default 0.5.
+        :type decrease: float
+
+        :param latency_tolerance: Responses slower than this multiple of the smoothed latency of healthy
+            responses count as overload. None disables the latency check. Default 2.
+        :type latency_tolerance: float
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1, not {}.".format(decrease))
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = time.monotonic()
+        self._condition = threading.Condition()
+        self._async_waiters = []
+
+    @property
+    def limit(self):
+        """The current number of allowed concurrent requests."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """The number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def latency(self):
+        """The smoothed latency of healthy responses in seconds, None before the first response."""
+        return self._latency
+
+    def _try_acquire(self):
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return time.monotonic()
+        return None
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+
+        :returns: A token which has to be passed to :meth:`release`.
+        :rtype: float
+        """
+        with self._condition:
+            while True:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                self._condition.wait()
+
+    async def acquire_async(self):
+        """
+        Waits without blocking the event loop until a request may be sent.
+
+        :returns: A token which has to be passed to :meth:`release`.
+        :rtype: float
+        """
+        while True:
+            with self._condition:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+            await waiter
+
+    def release(self, token, overloaded=False, measured=True):
+        """
+        Frees the slot of a finished request and adapts the limit.
+
+        :param token: The token returned by :meth:`acquire` or :meth:`acquire_async`.
+        :type token: float
+
+        :param overloaded: Whether the server signaled overload, e.g. with HTTP 503 or a timeout.
+        :type overloaded: bool
+
+        :param measured: Whether the request finished at all, False e.g. for interrupted requests, which only
+            free their slot.
+        :type measured: bool
+        """
+        latency = time.monotonic() - token
+        with self._condition:
+            if measured:
+                self._adapt(token, latency, overloaded)
+            self._in_flight -= 1
+
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def _adapt(self, token, latency, overloaded):
+        if not overloaded and self.latency_tolerance and self._latency is not None:
+            overloaded = latency > self.latency_tolerance * self._latency
+
+        if overloaded:
+            # Requests which started before the last cut saw the old limit, they must not cut it again
+            if token > self._last_decrease:
+                self._limit = max(self.min_limit, self._limit * self.decrease)
+                self._last_decrease = time.monotonic()
+            return
+
+        self._latency = latency if self._latency is None else 0.9 * self._latency + 0.1 * latency
+        # Only grow if the limit is actually used, otherwise it would grow unbounded while idle
+        if self._in_flight >= self._limit / 2:
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+
+    def __repr__(self):  # pragma: no cover
+        return "AIMDLimiter(limit={}, in_flight={})".format(self.limit, self.in_flight)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -18,16 +18,49 @@
 :class:`Matrix` returns directions results.
 """
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _to_array(values, dtype):
+    """Converts a (nested) list to a contiguous array. ``None`` values become ``NaN`` in float arrays."""
+    if values is None:
+        return None
+    if np is None:  # pragma: no cover
+        raise ImportError("Array access needs the numpy package, install it with 'pip install numpy'.")
+
+    return np.ascontiguousarray(values, dtype=dtype)
+
 
 class Matrix(object):
     """
-    Contains a parsed matrix response. Access via properties ``geometry`` and ``raw``.
+    Contains a parsed matrix response. Access via properties ``durations``, ``distances`` and ``raw``.
+
+    If numpy is installed, ``durations_array`` and ``distances_array`` return the matrices as 2D float arrays.
+    They're cached next to the lists, which stay as parsed. To only hold the arrays of a large matrix, keep the
+    arrays rather than the matrix and drop the raw response with ``keep_raw=False``, which often shares the lists.
+
+    ``durations`` and ``distances`` can also be passed as callables, which are called on first access, e.g. by
+    routers of clients with ``lazy=True``.
     """
 
-    def __init__(self, durations=None, distances=None, raw=None):
+    #: The numpy dtype of ``durations_array`` and ``distances_array``, e.g. ``"float32"`` to halve the memory.
+    dtype = "float64"
+
+    def __init__(self, durations=None, distances=None, raw=None, dtype=None):
         self._durations = durations
         self._distances = distances
         self._raw = raw
+        if dtype is not None:
+            self.dtype = dtype
+        self._arrays = {}
+
+    def _array(self, name, values):
+        if name not in self._arrays:
+            self._arrays[name] = _to_array(values, self.dtype)
+        return self._arrays[name]
 
     @property
     def durations(self):
@@ -52,6 +85,8 @@ class Matrix(object):
 
         :rtype: list or None
         """
+        if callable(self._durations):
+            self._durations = self._durations()
         return self._durations
 
     @property
@@ -77,8 +112,30 @@ class Matrix(object):
 
         :rtype: list or None
         """
+        if callable(self._distances):
+            self._distances = self._distances()
         return self._distances
 
+    @property
+    def durations_array(self):
+        """
+        The durations matrix as 2D :class:`numpy.ndarray` of shape (sources, destinations). Unreachable pairs are
+        ``NaN``. Converted once on first access.
+
+        :rtype: numpy.ndarray or None
+        """
+        return self._array("durations", self.durations)
+
+    @property
+    def distances_array(self):
+        """
+        The distances matrix as 2D :class:`numpy.ndarray` of shape (sources, destinations). Unreachable pairs are
+        ``NaN``. Converted once on first access.
+
+        :rtype: numpy.ndarray or None
+        """
+        return self._array("distances", self.distances)
+
     @property
     def raw(self):
         """
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+:class:`RetryPolicy` controls when and how often clients retry failed requests.
+"""
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+_JITTER_MODES = ("none", "full", "equal", "proportional")
+
+
+def parse_retry_after(value):
+    """
+    Parses the value of a ``Retry-After`` header, which is either a number of seconds or an HTTP date.
+
+    :param value: The header value.
+    :type value: str
+
+    :returns: The seconds to wait, None if the value can't be parsed.
+    :rtype: float or None
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy(object):
+    """
+    Configures the retries of a client. The back-off before the n-th retry is
+    ``min(max_delay, base_delay * multiplier ** (n - 1))``, jittered according to ``jitter``.
+
+    Retries stop after ``max_attempts`` requests or when the client's ``retry_timeout`` elapsed, whichever comes
+    first. HTTP 429 responses are retried according to the client's ``retry_over_query_limit``.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.retry import RetryPolicy
+    >>> policy = RetryPolicy(max_attempts=5, base_delay=0.2, max_delay=10, jitter="full",
+    ...                      retriable_statuses=(502, 503, 504))
+    >>> router = Valhalla(url, retry_policy=policy)
+    >>> matrix = router.matrix(locations)
+    >>> router.client.last_attempts
+    1
+    """
+
+    def __init__(
+        self,
+        max_attempts=None,
+        base_delay=1.0,
+        multiplier=1.5,
+        max_delay=None,
+        jitter="proportional",
+        retriable_statuses=(503,),
+        retriable_exceptions=(),
+        respect_retry_after=True,
+    ):
+        """
+        :param max_attempts: Maximum number of requests including the first one. Default None, i.e. only
+            limited by the client's ``retry_timeout``.
+        :type max_attempts: int
+
+        :param base_delay: Back-off before the first retry in seconds. Default 1.
+        :type base_delay: float
+
+        :param multiplier: Factor the back-off grows by with every retry. Default 1.5.
+        :type multiplier: float
+
+        :param max_delay: Upper bound for the back-off in seconds. Default None, i.e. unbounded.
+        :type max_delay: float
+
+        :param jitter: How the back-off is randomized. One of ["none", "full" (between 0 and the back-off),
+            "equal" (between half and the full back-off), "proportional" (between half and 1.5 times the back-off)].
+            Default "proportional".
+        :type jitter: str
+
+        :param retriable_statuses: HTTP status codes which are retried. Default (503,).
+        :type retriable_statuses: list of int
+
+        :param retriable_exceptions: Exceptions raised while requesting which are retried, e.g.
+            ``requests.exceptions.ConnectionError`` or :class:`routingpy.exceptions.Timeout`. Default none.
+        :type retriable_exceptions: tuple of type
+
+        :param respect_retry_after: Wait as long as a ``Retry-After`` response header asks for instead of the
+            back-off. If that's longer than the remaining ``retry_timeout``, the client gives up immediately.
+            Default True.
+        :type respect_retry_after: bool
+        """
+        if jitter not in _JITTER_MODES:
+            raise ValueError("jitter must be one of {}, not {}.".format(_JITTER_MODES, jitter))
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1, not {}.".format(max_attempts))
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retriable_statuses = frozenset(retriable_statuses)
+        self.retriable_exceptions = tuple(retriable_exceptions)
+        self.respect_retry_after = respect_retry_after
+
+    def backoff(self, attempt):
+        """
+        Returns the jittered back-off after the ``attempt``-th request failed.
+
+        :param attempt: The number of the failed attempt, starting with 1.
+        :type attempt: int
+
+        :rtype: float
+        """
+        delay = self.base_delay * self.multiplier ** (attempt - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+
+        if self.jitter == "full":
+            return random.uniform(0, delay)
+        if self.jitter == "equal":
+            return delay / 2 + random.uniform(0, delay / 2)
+        if self.jitter == "proportional":
+            return delay * (random.random() + 0.5)
+        return delay
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Returns the seconds to wait after the ``attempt``-th request failed, honoring ``Retry-After``.
+
+        :param attempt: The number of the failed attempt, starting with 1.
+        :type attempt: int
+
+        :param retry_after: Seconds the server asked to wait, see :func:`parse_retry_after`.
+        :type retry_after: float
+
+        :rtype: float
+        """
+        if retry_after is not None and self.respect_retry_after:
+            return retry_after
+        return self.backoff(attempt)
+
+    def __repr__(self):  # pragma: no cover
+        return (
+            "RetryPolicy(max_attempts={}, base_delay={}, multiplier={}, max_delay={}, jitter={})".format(
+                self.max_attempts, self.base_delay, self.multiplier, self.max_delay, self.jitter
+            )
+        )
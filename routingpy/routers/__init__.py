@@ -16,6 +16,7 @@ locations and profile (car, bike, pedestrian etc.), among others (full list here
 """
 from ..client_base import options  # noqa: F401
 from ..exceptions import RouterNotFound
+from .failover import Failover  # noqa: F401
 from .google import Google
 from .graphhopper import Graphhopper
 from .heremaps import HereMaps
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+import threading
+import time
+from collections import deque
+
+from .. import exceptions
+from ..client_async import AsyncClient
+
+
+class CircuitBreaker(object):
+    """
+    Tracks the health of a single router. It's closed while the router is healthy, opens when too many of the
+    recent calls failed or were too slow, and lets a single trial call through (half-open) after ``reset_timeout``.
+    A successful trial closes it again, a failed one opens it for another ``reset_timeout``. A trial which didn't
+    report back within ``reset_timeout`` is given up and the next call becomes the trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, error_threshold=0.5, min_calls=5, window=20, latency_threshold=None, reset_timeout=30
+    ):
+        """
+        :param error_threshold: Share of failed calls within the window which opens the breaker. Default 0.5.
+        :type error_threshold: float
+
+        :param min_calls: Minimum number of calls in the window before the breaker can open. Default 5.
+        :type min_calls: int
+
+        :param window: Number of most recent calls the error rate is calculated from. Default 20.
+        :type window: int
+
+        :param latency_threshold: Calls taking longer than this many seconds count as failed. Default None.
+        :type latency_threshold: float
+
+        :param reset_timeout: Seconds the breaker stays open before it lets a trial call through. Default 30.
+        :type reset_timeout: float
+        """
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._trial_running = False
+        self._trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """One of "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def allow(self):
+        """
+        Whether the router may be called now. In half-open state only one trial call is let through at a time.
+
+        :rtype: bool
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and (
+                not self._trial_running or time.monotonic() - self._trial_started >= self.reset_timeout
+            ):
+                self._trial_running = True
+                self._trial_started = time.monotonic()
+                return True
+            return False
+
+    def release(self):
+        """
+        Ends a trial call without an outcome, e.g. if the router turned out not to support the request.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, success, latency=None):
+        """
+        Records the outcome of a call.
+
+        :param success: Whether the router answered, API errors like "no route found" count as success.
+        :type success: bool
+
+        :param latency: Duration of the call in seconds.
+        :type latency: float
+        """
+        if success and self.latency_threshold is not None and latency is not None:
+            success = latency <= self.latency_threshold
+
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN:
+                self._trial_running = False
+                if success:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.error_threshold
+            ):
+                self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def __repr__(self):  # pragma: no cover
+        return "CircuitBreaker({})".format(self.state)
+
+
+class Failover:
+    """
+    Composite router which sends each request to the first healthy router of an ordered list, e.g. a self-hosted
+    Valhalla with ORS as backup. Every router has its own :class:`CircuitBreaker`, so a degraded router is skipped
+    right away instead of waiting out its timeouts for every call.
+
+    >>> from routingpy import Failover, ORS, Valhalla
+    >>> from routingpy.retry import RetryPolicy
+    >>> router = Failover([
+    ...     Valhalla("http://valhalla:8002", retry_policy=RetryPolicy(max_attempts=2), timeout=5),
+    ...     (ORS(api_key=key), {"profile": "driving-car"}),
+    ... ], latency_threshold=2)
+    >>> route = router.directions(locations, profile="auto")
+    >>> router.breakers[0].state
+    'closed'
+
+    Arguments are passed to every router as is. Routers can be given as a (router, overrides) tuple, whose
+    overrides replace arguments for that router only, e.g. its profile name.
+
+    Routers fail over on any exception but :class:`routingpy.exceptions.RouterApiError`, e.g. "no route found",
+    which is specific to the request and raised right away. Routers which don't support the method or its
+    arguments, i.e. raise :class:`NotImplementedError` or :class:`TypeError`, are skipped without counting as
+    failed. A call which is interrupted, e.g. cancelled by ``asyncio.wait_for``, counts as failed.
+    """
+
+    def __init__(self, routers, **breaker_kwargs):
+        """
+        :param routers: The router instances in order of preference, optionally as (router, overrides) tuples.
+            All routers have to use the same kind of client, either synchronous or :class:`AsyncClient`.
+        :type routers: list
+
+        :param breaker_kwargs: Arguments for the :class:`CircuitBreaker` of each router, e.g. ``error_threshold``,
+            ``latency_threshold`` or ``reset_timeout``.
+        :type breaker_kwargs: dict
+        """
+        if not routers:
+            raise ValueError("Failover needs at least one router.")
+
+        self.routers = []
+        self.overrides = []
+        for router in routers:
+            router, overrides = router if isinstance(router, tuple) else (router, {})
+            self.routers.append(router)
+            self.overrides.append(overrides)
+        self.breakers = [CircuitBreaker(**breaker_kwargs) for _ in self.routers]
+
+        is_async = [isinstance(router.client, AsyncClient) for router in self.routers]
+        if any(is_async) and not all(is_async):
+            raise ValueError("Can't mix routers with synchronous and asynchronous clients.")
+        self._is_async = all(is_async)
+
+    def directions(self, *args, **kwargs):
+        """
+        Get directions from the first healthy router. See the routers' ``directions`` for the arguments.
+
+        :raises routingpy.exceptions.RouterUnavailable: if all routers failed or are open.
+        :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
+        """
+        return self.call("directions", *args, **kwargs)
+
+    def isochrones(self, *args, **kwargs):
+        """
+        Get isochrones from the first healthy router. See the routers' ``isochrones`` for the arguments.
+
+        :raises routingpy.exceptions.RouterUnavailable: if all routers failed or are open.
+        :rtype: :class:`routingpy.isochrone.Isochrones`
+        """
+        return self.call("isochrones", *args, **kwargs)
+
+    def matrix(self, *args, **kwargs):
+        """
+        Get a matrix from the first healthy router. See the routers' ``matrix`` for the arguments.
+
+        :raises routingpy.exceptions.RouterUnavailable: if all routers failed or are open.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return self.call("matrix", *args, **kwargs)
+
+    def call(self, method, *args, **kwargs):
+        """
+        Calls any method, e.g. "expansion", on the first healthy router which has it.
+
+        :param method: Name of the router method.
+        :type method: str
+
+        :raises routingpy.exceptions.RouterUnavailable: if all routers failed or are open.
+        """
+        if self._is_async:
+            return self._call_async(method, args, kwargs)
+
+        errors = []
+        for idx in self._candidates(method):
+            start = time.monotonic()
+            finished = False
+            try:
+                result = getattr(self.routers[idx], method)(*args, **dict(kwargs, **self.overrides[idx]))
+                finished = True
+            except Exception as e:
+                finished = True
+                self._failed(idx, e, start, errors)
+                continue
+            finally:
+                # cancelled or interrupted, the trial of a half-open breaker has to be released
+                if not finished:
+                    self.breakers[idx].record(False, time.monotonic() - start)
+            self.breakers[idx].record(True, time.monotonic() - start)
+            return result
+
+        raise self._unavailable(method, errors)
+
+    async def _call_async(self, method, args, kwargs):
+        errors = []
+        for idx in self._candidates(method):
+            start = time.monotonic()
+            finished = False
+            try:
+                result = await getattr(self.routers[idx], method)(
+                    *args, **dict(kwargs, **self.overrides[idx])
+                )
+                finished = True
+            except Exception as e:
+                finished = True
+                self._failed(idx, e, start, errors)
+                continue
+            finally:
+                if not finished:
+                    self.breakers[idx].record(False, time.monotonic() - start)
+            self.breakers[idx].record(True, time.monotonic() - start)
+            return result
+
+        raise self._unavailable(method, errors)
+
+    def _candidates(self, method):
+        """Yields the indices of the routers which have the method and are allowed to be called right now."""
+        for idx, router in enumerate(self.routers):
+            if hasattr(router, method) and self.breakers[idx].allow():
+                yield idx
+
+    def _failed(self, idx, error, start, errors):
+        """
+        Records a failed call, re-raises errors which are specific to the request. Routers which don't support the
+        method or its arguments are skipped without counting as failed.
+        """
+        latency = time.monotonic() - start
+        if isinstance(error, (NotImplementedError, TypeError)):
+            self.breakers[idx].release()
+            errors.append(error)
+            return
+        if isinstance(error, exceptions.RouterApiError):
+            self.breakers[idx].record(True, latency)
+            raise error
+        self.breakers[idx].record(False, latency)
+        errors.append(error)
+
+    def _unavailable(self, method, errors):
+        return exceptions.RouterUnavailable(
+            "No healthy router for '{}', states: {}".format(method, [b.state for b in self.breakers]),
+            errors,
+        )
+
+    def __repr__(self):  # pragma: no cover
+        return "Failover({})".format(", ".join(type(router).__name__ for router in self.routers))
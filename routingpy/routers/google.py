@@ -15,9 +15,10 @@
 # the License.
 #
 
+from functools import partial
 from operator import itemgetter
 
-from .. import convert, utils
+from .. import convert, tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
@@ -67,6 +68,8 @@ STATUS_CODES = {
 class Google:
     """Performs requests to the Google API services."""
 
+    _MATRIX_BLOCK_SIZE = (10, 10)
+
     _base_url = "https://maps.googleapis.com/maps/api"
 
     def __init__(
@@ -127,6 +130,7 @@ class Google:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
 
     class WayPoint(object):
         """
@@ -191,6 +195,7 @@ class Google:
         transit_mode=None,
         transit_routing_preference=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Get directions between an origin point and a destination point.
 
@@ -252,6 +257,10 @@ class Google:
         :param dry_run: Print URL and parameters without sending the request.
         :type dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
@@ -318,12 +327,16 @@ class Google:
         if transit_routing_preference:
             params["transit_routing_preference"] = transit_routing_preference
 
-        return self.parse_direction_json(
-            self.client._request("/directions/json", get_params=params, dry_run=dry_run), alternatives
+        return self.client._parse(
+            self.parse_direction_json,
+            self.client._request("/directions/json", get_params=params, dry_run=dry_run),
+            alternatives,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_direction_json(response, alternatives):
+    def parse_direction_json(response, alternatives, lazy=False):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
@@ -344,38 +357,70 @@ class Google:
 
             raise error(STATUS_CODES[status]["code"], STATUS_CODES[status]["message"])
 
+        def _parse_geometry(polylines, reverse):
+            geometry = []
+            for polyline in polylines:
+                coordinates = utils.decode_polyline5(polyline)
+                geometry.extend(
+                    [list(reversed(coords)) for coords in coordinates] if reverse else coordinates
+                )
+            return geometry
+
+        def _polylines(legs):
+            # Only the polylines are captured by lazy geometries, not the response
+            return [step["polyline"]["points"] for leg in legs for step in leg["steps"]]
+
         if alternatives:
             routes = []
             for route in response["routes"]:
-                geometry = []
                 duration, distance = 0, 0
                 for leg in route["legs"]:
                     duration += leg["duration"]["value"]
                     distance += leg["distance"]["value"]
-                    for step in leg["steps"]:
-                        geometry.extend(utils.decode_polyline5(step["polyline"]["points"]))
 
                 routes.append(
                     Direction(
-                        geometry=geometry, duration=int(duration), distance=int(distance), raw=route
+                        geometry=utils.deferred(
+                            _parse_geometry, _polylines(route["legs"]), False, lazy=lazy
+                        ),
+                        duration=int(duration),
+                        distance=int(distance),
+                        raw=route,
                     )
                 )
             return Directions(routes, response)
         else:
-            geometry = []
             duration, distance = 0, 0
             for leg in response["routes"][0]["legs"]:
                 duration = int(leg["duration"]["value"])
                 distance = int(leg["distance"]["value"])
-                for step in leg["steps"]:
-                    geometry.extend(
-                        [
-                            list(reversed(coords))
-                            for coords in utils.decode_polyline5(step["polyline"]["points"])
-                        ]
-                    )
+            geometry = utils.deferred(
+                _parse_geometry, _polylines(response["routes"][0]["legs"]), True, lazy=lazy
+            )
             return Direction(geometry=geometry, duration=duration, distance=distance, raw=response)
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(self):  # pragma: no cover
         raise NotImplementedError
 
@@ -395,6 +440,7 @@ class Google:
         transit_mode=None,
         transit_routing_preference=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
 
@@ -453,6 +499,10 @@ class Google:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -509,22 +559,82 @@ class Google:
         if transit_routing_preference:
             params["transit_routing_preference"] = transit_routing_preference
 
-        return self.parse_matrix_json(
-            self.client._request("/distancematrix/json", get_params=params, dry_run=dry_run)
+        return self.client._parse(
+            self.parse_matrix_json,
+            self.client._request("/distancematrix/json", get_params=params, dry_run=dry_run),
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, lazy=False):
         if response is None:  # pragma: no cover
             return Matrix()
 
-        durations = [
-            [destination["duration"]["value"] for destination in origin["elements"]]
-            for origin in response["rows"]
-        ]
-        distances = [
-            [destination["distance"]["value"] for destination in origin["elements"]]
-            for origin in response["rows"]
-        ]
+        def _parse_values(rows, key):
+            return [[destination[key]["value"] for destination in origin["elements"]] for origin in rows]
+
+        # Only the rows are captured, not the response
+        durations = utils.deferred(_parse_values, response["rows"], "duration", lazy=lazy)
+        distances = utils.deferred(_parse_values, response["rows"], "distance", lazy=lazy)
 
         return Matrix(durations, distances, response)
+
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default (10, 10).
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
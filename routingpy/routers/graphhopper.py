@@ -15,9 +15,10 @@
 # the License.
 #
 
+from functools import partial
 from typing import List, Tuple  # noqa: F401
 
-from .. import convert, utils
+from .. import convert, tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
@@ -29,6 +30,7 @@ class Graphhopper:
     """Performs requests to the Graphhopper API services."""
 
     _DEFAULT_BASE_URL = "https://graphhopper.com/api/1"
+    _MATRIX_BLOCK_SIZE = 25
 
     def __init__(
         self,
@@ -96,6 +98,7 @@ class Graphhopper:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
 
     def directions(  # noqa: C901
         self,
@@ -125,6 +128,7 @@ class Graphhopper:
         dry_run=None,
         snap_preventions=None,
         curbsides=None,
+        keep_raw=None,
         **direction_kwargs
     ):
         """Get directions between an origin point and a destination point.
@@ -241,6 +245,10 @@ class Graphhopper:
         :param dry_run: Print URL and parameters without sending the request.
         :type dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :param snap_preventions: Optional parameter to avoid snapping to a certain road class or road environment.
             Currently supported values are motorway, trunk, ferry, tunnel, bridge and ford. Optional.
         :type snap_preventions: list of str
@@ -355,32 +363,33 @@ class Graphhopper:
 
         params.update(direction_kwargs)
 
-        return self.parse_directions_json(
+        return self.client._parse(
+            self.parse_directions_json,
             self.client._request("/route", get_params=get_params, post_params=params, dry_run=dry_run),
             algorithm,
             elevation,
             points_encoded,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_directions_json(response, algorithm, elevation, points_encoded):
+    def parse_directions_json(response, algorithm, elevation, points_encoded, lazy=False):
         if response is None:  # pragma: no cover
             if algorithm == "alternative_route":
                 return Directions()
             else:
                 return Direction()
 
+        def _parse_geometry(points):
+            return utils.decode_polyline5(points, elevation) if points_encoded else points["coordinates"]
+
         if algorithm == "alternative_route":
             routes = []
             for route in response["paths"]:
-                geometry = (
-                    utils.decode_polyline5(route["points"], elevation)
-                    if points_encoded
-                    else route["points"]["coordinates"]
-                )
                 routes.append(
                     Direction(
-                        geometry=geometry,
+                        geometry=utils.deferred(_parse_geometry, route["points"], lazy=lazy),
                         duration=int(route["time"] / 1000),
                         distance=int(route["distance"]),
                         raw=route,
@@ -388,18 +397,35 @@ class Graphhopper:
                 )
             return Directions(routes, response)
         else:
-            geometry = (
-                utils.decode_polyline5(response["paths"][0]["points"], elevation)
-                if points_encoded
-                else response["paths"][0]["points"]["coordinates"]
-            )
             return Direction(
-                geometry=geometry,
+                geometry=utils.deferred(_parse_geometry, response["paths"][0]["points"], lazy=lazy),
                 duration=int(response["paths"][0]["time"] / 1000),
                 distance=int(response["paths"][0]["distance"]),
                 raw=response,
             )
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(
         self,
         locations,
@@ -411,6 +437,7 @@ class Graphhopper:
         reverse_flow=None,
         debug=None,
         dry_run=None,
+        keep_raw=None,
         **isochrones_kwargs
     ):
         """Gets isochrones or equidistants for a range of time/distance values around a given set of coordinates.
@@ -451,6 +478,10 @@ class Graphhopper:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: An isochrone with the specified range.
         :rtype: :class:`routingpy.isochrone.Isochrones`
         """
@@ -483,13 +514,15 @@ class Graphhopper:
 
         params.extend(isochrones_kwargs.items())
 
-        return self.parse_isochrone_json(
+        return self.client._parse(
+            self.parse_isochrone_json,
             self.client._request("/isochrone", get_params=params, dry_run=dry_run),
             type,
             intervals[0],
             buckets,
             center,
             interval_type,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -522,6 +555,7 @@ class Graphhopper:
         out_array=["times", "distances"],
         debug=None,
         dry_run=None,
+        keep_raw=None,
         **matrix_kwargs
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
@@ -560,6 +594,10 @@ class Graphhopper:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -613,8 +651,10 @@ class Graphhopper:
 
         params.extend(matrix_kwargs.items())
 
-        return self.parse_matrix_json(
+        return self.client._parse(
+            self.parse_matrix_json,
             self.client._request("/matrix", get_params=params, dry_run=dry_run),
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -625,3 +665,62 @@ class Graphhopper:
         distances = response.get("distances")
 
         return Matrix(durations=durations, distances=distances, raw=response)
+
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default 25.
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
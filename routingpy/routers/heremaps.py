@@ -15,20 +15,23 @@
 # the License.
 #
 
+from functools import partial
 from operator import itemgetter
 
-from .. import convert
+from .. import convert, tiling
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
 from ..isochrone import Isochrone, Isochrones
 from ..matrix import Matrix
-from ..utils import logger
+from ..utils import deferred, logger
 
 
 class HereMaps:
     """Performs requests to the HERE Maps API services."""
 
+    _MATRIX_BLOCK_SIZE = (15, 100)
+
     def __init__(
         self,
         app_id=None,
@@ -106,6 +109,17 @@ class HereMaps:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
+
+    def _url(self, service, path):
+        """
+        Returns the absolute URL of an endpoint. The host depends on the service and the authentication, so it's
+        passed with every request instead of being set as the client's base URL, which is shared by concurrent
+        requests.
+        """
+        if self.api_key is None:
+            return "https://{}.api.here.com/routing/7.2{}".format(service, path)
+        return "https://{}.ls.hereapi.com/routing/7.2{}".format(service, path)
 
     class Waypoint(object):
         """
@@ -287,6 +301,7 @@ class HereMaps:
         custom_consumption_details=None,
         speed_profile=None,
         dry_run=None,
+        keep_raw=None,
         **directions_kwargs
     ):
         """Get directions between an origin point and a destination point.
@@ -584,16 +599,14 @@ class HereMaps:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
 
-        self.client.base_url = (
-            "https://route.api.here.com/routing/7.2"
-            if self.api_key is None
-            else "https://route.ls.hereapi.com/routing/7.2"
-        )
-
         params = self.auth.copy()
 
         locations = self._build_locations(locations)
@@ -771,32 +784,35 @@ class HereMaps:
 
         params.update(directions_kwargs)
 
-        return self.parse_direction_json(
+        return self.client._parse(
+            self.parse_direction_json,
             self.client._request(
-                convert.delimit_list(["/calculateroute", format], "."),
+                self._url("route", convert.delimit_list(["/calculateroute", format], ".")),
                 get_params=params,
                 dry_run=dry_run,
             ),
             alternatives=alternatives,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_direction_json(response, alternatives):
+    def parse_direction_json(response, alternatives, lazy=False):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
             else:
                 return Direction()
 
+        def _parse_geometry(shape):
+            return [list(reversed(list(map(float, coordinates.split(","))))) for coordinates in shape]
+
         if alternatives is not None and alternatives > 1:
             routes = []
             for route in response["response"]["route"]:
                 routes.append(
                     Direction(
-                        geometry=[
-                            list(reversed(list((map(float, coordinates.split(","))))))
-                            for coordinates in route["shape"]
-                        ],
+                        geometry=deferred(_parse_geometry, route["shape"], lazy=lazy),
                         duration=int(route["summary"]["baseTime"]),
                         distance=int(route["summary"]["distance"]),
                         raw=route,
@@ -806,15 +822,36 @@ class HereMaps:
             return Directions(directions=routes, raw=response)
 
         else:
-            geometry = [
-                list(reversed(list(map(float, coordinates.split(",")))))
-                for coordinates in response["response"]["route"][0].get("shape")
-            ]
+            geometry = deferred(
+                _parse_geometry, response["response"]["route"][0].get("shape"), lazy=lazy
+            )
             duration = int(response["response"]["route"][0]["summary"].get("baseTime"))
             distance = int(response["response"]["route"][0]["summary"].get("distance"))
 
             return Direction(geometry=geometry, duration=duration, distance=distance, raw=response)
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(  # noqa: C901
         self,
         locations,
@@ -846,6 +883,7 @@ class HereMaps:
         custom_consumption_details=None,
         speed_profile=None,
         dry_run=None,
+        keep_raw=None,
         **isochrones_kwargs
     ):
         """Gets isochrones or equidistants for a range of time/distance values around a given set of coordinates.
@@ -991,16 +1029,14 @@ class HereMaps:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: raw JSON response
         :rtype: dict
         """
 
-        self.client.base_url = (
-            "https://isoline.route.api.here.com/routing/7.2"
-            if self.api_key is None
-            else "https://isoline.route.ls.hereapi.com/routing/7.2"
-        )
-
         params = self.auth.copy()
 
         params[center_type] = self._build_locations(locations)[0]
@@ -1074,36 +1110,44 @@ class HereMaps:
 
         params.update(isochrones_kwargs)
 
-        return self.parse_isochrone_json(
+        return self.client._parse(
+            self.parse_isochrone_json,
             self.client._request(
-                convert.delimit_list(["/calculateisoline", format], "."),
+                self._url("isoline.route", convert.delimit_list(["/calculateisoline", format], ".")),
                 get_params=params,
                 dry_run=dry_run,
             ),
             intervals,
             interval_type,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_isochrone_json(response, intervals, interval_type):
+    def parse_isochrone_json(response, intervals, interval_type, lazy=False):
         if response is None:  # pragma: no cover
             return Isochrones()
 
-        geometries = []
-        for idx, isochrones in enumerate(response["response"]["isoline"]):
+        def _parse_geometry(shapes):
             range_polygons = []
-            if "component" in isochrones:
-                for component in isochrones["component"]:
-                    if "shape" in component:
-                        coordinates_list = []
-                        for coordinates in component["shape"]:
-                            coords = [float(f) for f in coordinates.split(",")]
-                            coordinates_list.append(list(reversed(coords)))
-                        range_polygons.append(coordinates_list)
+            for shape in shapes:
+                coordinates_list = []
+                for coordinates in shape:
+                    coords = [float(f) for f in coordinates.split(",")]
+                    coordinates_list.append(list(reversed(coords)))
+                range_polygons.append(coordinates_list)
+            return range_polygons
 
+        geometries = []
+        for idx, isochrones in enumerate(response["response"]["isoline"]):
+            shapes = [
+                component["shape"]
+                for component in isochrones.get("component", [])
+                if "shape" in component
+            ]
             geometries.append(
                 Isochrone(
-                    geometry=range_polygons,
+                    geometry=deferred(_parse_geometry, shapes, lazy=lazy),
                     interval=intervals[idx],
                     center=list(response["response"]["start"]["mappedPosition"].values()),
                     interval_type=interval_type,
@@ -1139,6 +1183,7 @@ class HereMaps:
         tunnel_category=None,
         speed_profile=None,
         dry_run=None,
+        keep_raw=None,
         **matrix_kwargs
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
@@ -1267,14 +1312,13 @@ class HereMaps:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: raw JSON response
         :rtype: dict
         """
-        self.client.base_url = (
-            "https://matrix.route.api.here.com/routing/7.2"
-            if self.api_key is None
-            else "https://matrix.route.ls.hereapi.com/routing/7.2"
-        )
 
         params = self.auth.copy()
 
@@ -1371,12 +1415,14 @@ class HereMaps:
 
         params.update(matrix_kwargs)
 
-        return self.parse_matrix_json(
+        return self.client._parse(
+            self.parse_matrix_json,
             self.client._request(
-                convert.delimit_list(["/calculatematrix", format], "."),
+                self._url("matrix.route", convert.delimit_list(["/calculatematrix", format], ".")),
                 get_params=params,
                 dry_run=dry_run,
-            )
+            ),
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -1422,6 +1468,65 @@ class HereMaps:
 
         return Matrix(durations=durations, distances=distances, raw=response)
 
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default (15, 100).
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
+
     def _build_locations(self, coordinates, matrix=False):
         """Build the locations object for all methods"""
 
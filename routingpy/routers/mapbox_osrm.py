@@ -18,7 +18,9 @@
 Core client functionality, common across all API requests.
 """
 
-from .. import convert, utils
+from functools import partial
+
+from .. import convert, tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
@@ -29,6 +31,8 @@ from ..matrix import Matrix
 class MapboxOSRM:
     """Performs requests to the OSRM API services."""
 
+    _MATRIX_BLOCK_SIZE = 12
+
     _base_url = "https://api.mapbox.com"
 
     def __init__(
@@ -91,6 +95,7 @@ class MapboxOSRM:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
 
     def directions(  # noqa: C901
         self,
@@ -114,6 +119,7 @@ class MapboxOSRM:
         waypoint_names=None,
         waypoint_targets=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Get directions between an origin point and a destination point.
 
@@ -217,6 +223,10 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
@@ -288,7 +298,8 @@ class MapboxOSRM:
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
 
-        return self.parse_direction_json(
+        return self.client._parse(
+            self.parse_direction_json,
             self.client._request(
                 "/directions/v5/mapbox/" + profile,
                 get_params=get_params,
@@ -297,35 +308,37 @@ class MapboxOSRM:
             ),
             alternatives,
             geometries,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_direction_json(response, alternatives, geometry_format):
+    def parse_direction_json(response, alternatives, geometry_format, lazy=False):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
             else:
                 return Direction()
 
+        # Checked up front, lazy geometries are only decoded on access
+        if geometry_format not in (None, "polyline", "polyline6", "geojson"):
+            raise ValueError(
+                "OSRM: parameter geometries needs one of ['polyline', 'polyline6', 'geojson']"
+            )
+
         def _parse_geometry(route_geometry):
-            if geometry_format in (None, "polyline"):
-                geometry = utils.decode_polyline5(route_geometry, is3d=False)
-            elif geometry_format == "polyline6":
-                geometry = utils.decode_polyline6(route_geometry, is3d=False)
+            if geometry_format == "polyline6":
+                return utils.decode_polyline6(route_geometry, is3d=False)
             elif geometry_format == "geojson":
-                geometry = route_geometry["coordinates"]
-            else:
-                raise ValueError(
-                    "OSRM: parameter geometries needs one of ['polyline', 'polyline6', 'geojson']"
-                )
-            return geometry
+                return route_geometry["coordinates"]
+            return utils.decode_polyline5(route_geometry, is3d=False)
 
         if alternatives:
             routes = []
             for route in response["routes"]:
                 routes.append(
                     Direction(
-                        geometry=_parse_geometry(route["geometry"]),
+                        geometry=utils.deferred(_parse_geometry, route["geometry"], lazy=lazy),
                         duration=int(route["duration"]),
                         distance=int(route["distance"]),
                         raw=route,
@@ -334,12 +347,34 @@ class MapboxOSRM:
             return Directions(routes, response)
         else:
             return Direction(
-                geometry=_parse_geometry(response["routes"][0]["geometry"]),
+                geometry=utils.deferred(_parse_geometry, response["routes"][0]["geometry"], lazy=lazy),
                 duration=int(response["routes"][0]["duration"]),
                 distance=int(response["routes"][0]["distance"]),
                 raw=response,
             )
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(
         self,
         locations,
@@ -350,6 +385,7 @@ class MapboxOSRM:
         denoise=None,
         generalize=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Gets isochrones or equidistants for a range of time values around a given set of coordinates.
 
@@ -384,6 +420,10 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: An isochrone with the specified range.
         :rtype: :class:`routingpy.isochrone.Isochrones`
         """
@@ -409,7 +449,8 @@ class MapboxOSRM:
 
         profile = profile.replace("mapbox/", "")
 
-        return self.parse_isochrone_json(
+        return self.client._parse(
+            self.parse_isochrone_json,
             self.client._request(
                 "/isochrone/v1/mapbox/" + profile + "/" + locations_string,
                 get_params=params,
@@ -417,6 +458,7 @@ class MapboxOSRM:
             ),
             intervals,
             locations,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -444,6 +486,7 @@ class MapboxOSRM:
         annotations=None,
         fallback_speed=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """
         Gets travel distance and time for a matrix of origins and destinations.
@@ -479,6 +522,10 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -501,12 +548,14 @@ class MapboxOSRM:
         if fallback_speed:
             params["fallback_speed"] = str(fallback_speed)
 
-        return self.parse_matrix_json(
+        return self.client._parse(
+            self.parse_matrix_json,
             self.client._request(
                 "/directions-matrix/v1/mapbox/" + profile + "/" + coords,
                 get_params=params,
                 dry_run=dry_run,
-            )
+            ),
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -517,3 +566,62 @@ class MapboxOSRM:
         return Matrix(
             durations=response.get("durations"), distances=response.get("distances"), raw=response
         )
+
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default 12.
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
@@ -15,7 +15,9 @@
 # the License.
 #
 
-from .. import utils
+from functools import partial
+
+from .. import tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
@@ -27,6 +29,7 @@ class ORS:
     """Performs requests to the ORS API services."""
 
     _DEFAULT_BASE_URL = "https://api.openrouteservice.org"
+    _MATRIX_BLOCK_SIZE = 50
 
     def __init__(
         self,
@@ -97,6 +100,7 @@ class ORS:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
 
     def directions(  # noqa: C901
         self,
@@ -122,6 +126,7 @@ class ORS:
         suppress_warnings=None,
         options=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Get directions between an origin point and a destination point.
 
@@ -229,6 +234,10 @@ class ORS:
         :param dry_run: Print URL and parameters without sending the request.
         :type dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A route from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction`
 
@@ -306,7 +315,8 @@ class ORS:
                     )
             params["options"] = options
 
-        return self.parse_direction_json(
+        return self.client._parse(
+            self.parse_direction_json,
             self.client._request(
                 "/v2/directions/" + profile + "/" + format,
                 get_params={},
@@ -316,10 +326,12 @@ class ORS:
             format,
             units,
             alternative_routes,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
-    def parse_direction_json(response, format, units, alternative_routes):
+    def parse_direction_json(response, format, units, alternative_routes, lazy=False):
         if response is None:  # pragma: no cover
             return Direction()
 
@@ -329,6 +341,9 @@ class ORS:
         elif units == "km":
             units_factor = 1000
 
+        def _parse_reversed(geometry):
+            return [list(reversed(coord)) for coord in utils.decode_polyline5(geometry)]
+
         if format == "geojson":
             if alternative_routes:
                 routes = []
@@ -353,12 +368,9 @@ class ORS:
             if alternative_routes:
                 routes = []
                 for route in response["routes"]:
-                    geometry = [
-                        list(reversed(coord)) for coord in utils.decode_polyline5(route["geometry"])
-                    ]
                     routes.append(
                         Direction(
-                            geometry=geometry,
+                            geometry=utils.deferred(_parse_reversed, route["geometry"], lazy=lazy),
                             distance=int(route["summary"]["distance"] * units_factor),
                             duration=int(route["summary"]["duration"]),
                             raw=route,
@@ -366,12 +378,36 @@ class ORS:
                     )
                 return Directions(routes, response)
             else:
-                geometry = utils.decode_polyline5(response["routes"][0]["geometry"])
+                geometry = utils.deferred(
+                    utils.decode_polyline5, response["routes"][0]["geometry"], lazy=lazy
+                )
                 duration = int(response["routes"][0]["summary"]["duration"])
                 distance = int(response["routes"][0]["summary"]["distance"] * units_factor)
 
                 return Direction(geometry=geometry, duration=duration, distance=distance, raw=response)
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(
         self,
         locations,
@@ -384,6 +420,7 @@ class ORS:
         attributes=None,
         intersections=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Gets isochrones or equidistants for a range of time/distance values around a given set of coordinates.
 
@@ -428,6 +465,10 @@ class ORS:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: An isochrone with the specified range.
         :rtype: :class:`routingpy.isochrone.Isochrones`
         """
@@ -455,7 +496,8 @@ class ORS:
         if intersections:
             params["intersections"] = intersections
 
-        return self.parse_isochrone_json(
+        return self.client._parse(
+            self.parse_isochrone_json,
             self.client._request(
                 "/v2/isochrones/" + profile + "/geojson",
                 get_params={},
@@ -463,6 +505,7 @@ class ORS:
                 dry_run=dry_run,
             ),
             interval_type,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -493,6 +536,7 @@ class ORS:
         resolve_locations=None,
         units=None,
         dry_run=None,
+        keep_raw=None,
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
 
@@ -530,6 +574,10 @@ class ORS:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -551,10 +599,12 @@ class ORS:
         if units:
             params["units"] = units
 
-        return self.parse_matrix_json(
+        return self.client._parse(
+            self.parse_matrix_json,
             self.client._request(
                 "/v2/matrix/" + profile + "/json", get_params={}, post_params=params, dry_run=dry_run
-            )
+            ),
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -564,3 +614,62 @@ class ORS:
         durations = response.get("durations")
         distances = response.get("distances")
         return Matrix(durations=durations, distances=distances, raw=response)
+
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default 50.
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
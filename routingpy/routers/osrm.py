@@ -15,9 +15,11 @@
 # the License.
 #
 
+from functools import partial
 from typing import List  # noqa: F401
+from urllib.parse import quote
 
-from .. import convert, utils
+from .. import convert, tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction, Directions
@@ -28,6 +30,7 @@ class OSRM:
     """Performs requests to the OSRM API services."""
 
     _DEFAULT_BASE_URL = "https://routing.openstreetmap.de/routed-bike"
+    _MATRIX_BLOCK_SIZE = 50
 
     def __init__(
         self,
@@ -86,6 +89,7 @@ class OSRM:
             skip_api_error,
             **client_kwargs,
         )
+        self.client.router_name = type(self).__name__
 
     def directions(
         self,
@@ -100,6 +104,8 @@ class OSRM:
         geometries=None,
         overview=None,
         dry_run=None,
+        encode_locations=None,
+        keep_raw=None,
         **direction_kwargs,
     ):
         """
@@ -164,12 +170,18 @@ class OSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param encode_locations: Send the locations as ``polyline6(...)`` in the URL path instead of a list
+            of coordinates, which is roughly 5 times shorter for many locations. Default False.
+        :type encode_locations: bool
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = self._build_coordinates(locations, encode_locations)
 
         params = self.get_direction_params(
             locations,
@@ -185,10 +197,23 @@ class OSRM:
             **direction_kwargs,
         )
 
-        return self.parse_direction_json(
+        return self.client._parse(
+            self.parse_direction_json,
             self.client._request(f"/route/v1/{profile}/{coords}", get_params=params, dry_run=dry_run),
             alternatives,
             geometries,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
+        )
+
+    @staticmethod
+    def _build_coordinates(locations, encode_locations=None):
+        """Builds the coordinates part of the URL path, either delimited or as URL quoted polyline"""
+        if encode_locations:
+            return "polyline6({})".format(quote(utils.encode_polyline6(locations), safe=""))
+
+        return convert.delimit_list(
+            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
         )
 
     @staticmethod
@@ -245,32 +270,32 @@ class OSRM:
         return params
 
     @staticmethod
-    def parse_direction_json(response, alternatives, geometry_format):
+    def parse_direction_json(response, alternatives, geometry_format, lazy=False):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
             else:
                 return Direction()
 
+        # Checked up front, lazy geometries are only decoded on access
+        if geometry_format not in (None, "polyline", "polyline6", "geojson"):
+            raise ValueError(
+                "OSRM: parameter geometries needs one of ['polyline', 'polyline6', 'geojson"
+            )
+
         def _parse_geometry(route_geometry):
-            if geometry_format in (None, "polyline"):
-                geometry = utils.decode_polyline5(route_geometry, is3d=False)
-            elif geometry_format == "polyline6":
-                geometry = utils.decode_polyline6(route_geometry, is3d=False)
+            if geometry_format == "polyline6":
+                return utils.decode_polyline6(route_geometry, is3d=False)
             elif geometry_format == "geojson":
-                geometry = route_geometry["coordinates"]
-            else:
-                raise ValueError(
-                    "OSRM: parameter geometries needs one of ['polyline', 'polyline6', 'geojson"
-                )
-            return geometry
+                return route_geometry["coordinates"]
+            return utils.decode_polyline5(route_geometry, is3d=False)
 
         if alternatives:
             routes = []
             for route in response["routes"]:
                 routes.append(
                     Direction(
-                        geometry=_parse_geometry(route["geometry"]),
+                        geometry=utils.deferred(_parse_geometry, route["geometry"], lazy=lazy),
                         duration=int(route["duration"]),
                         distance=int(route["distance"]),
                         raw=route,
@@ -279,12 +304,34 @@ class OSRM:
             return Directions(routes, response)
         else:
             return Direction(
-                geometry=_parse_geometry(response["routes"][0]["geometry"]),
+                geometry=utils.deferred(_parse_geometry, response["routes"][0]["geometry"], lazy=lazy),
                 duration=int(response["routes"][0]["duration"]),
                 distance=int(response["routes"][0]["distance"]),
                 raw=response,
             )
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(self):  # pragma: no cover
         raise NotImplementedError
 
@@ -298,6 +345,8 @@ class OSRM:
         destinations=None,
         dry_run=None,
         annotations=("duration", "distance"),
+        encode_locations=None,
+        keep_raw=None,
         **matrix_kwargs,
     ):
         """
@@ -346,10 +395,18 @@ class OSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :type dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :param annotations: Return the requested table or tables in response.
             One or more of ["duration", "distance"].
         :type annotations: List[str]
 
+        :param encode_locations: Send the locations as ``polyline6(...)`` in the URL path instead of a list
+            of coordinates, which is roughly 5 times shorter for many locations. Default False.
+        :type encode_locations: bool
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
 
@@ -357,16 +414,16 @@ class OSRM:
            Add annotations parameter to get both distance and duration
         """
 
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = self._build_coordinates(locations, encode_locations)
 
         params = self.get_matrix_params(
             locations, profile, radiuses, bearings, sources, destinations, annotations, **matrix_kwargs
         )
 
-        return self.parse_matrix_json(
-            self.client._request(f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run)
+        return self.client._parse(
+            self.parse_matrix_json,
+            self.client._request(f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run),
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -418,3 +475,71 @@ class OSRM:
         return Matrix(
             durations=response.get("durations"), distances=response.get("distances"), raw=response
         )
+
+    def matrix_tiled(
+        self,
+        locations,
+        profile="driving",
+        radiuses=None,
+        bearings=None,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs,
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param radiuses: A list of maximum distances (measured in meters) per location, see :meth:`matrix`.
+        :type radiuses: list of int
+
+        :param bearings: A list of [bearing, deviation] pairs per location, see :meth:`matrix`.
+        :type bearings: list of list
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default 50.
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            location_kwargs={"radiuses": radiuses, "bearings": bearings},
+            **matrix_kwargs,
+        )
@@ -15,14 +15,15 @@
 # the License.
 #
 
+from functools import partial
 from operator import itemgetter
 from typing import List, Optional, Sequence, Union  # noqa: F401
 
-from .. import utils
+from .. import tiling, utils
 from ..client_base import DEFAULT
 from ..client_default import Client
 from ..direction import Direction
-from ..expansion import Edge, Expansions
+from ..expansion import Expansions, StreamedExpansions
 from ..isochrone import Isochrone, Isochrones
 from ..matrix import Matrix
 from ..valhalla_attributes import MatchedResults
@@ -31,6 +32,10 @@ from ..valhalla_attributes import MatchedResults
 class Valhalla:
     """Performs requests to a Valhalla instance."""
 
+    _MATRIX_BLOCK_SIZE = 50
+    _TRACE_CHUNK_SIZE = 1000
+    _TRACE_OVERLAP = 50
+
     def __init__(
         self,
         base_url,
@@ -94,6 +99,7 @@ class Valhalla:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = type(self).__name__
 
     class Waypoint(object):
         """
@@ -135,6 +141,7 @@ class Valhalla:
         date_time=None,
         id=None,
         dry_run=None,
+        keep_raw=None,
         **kwargs
     ):
         """Get directions between an origin point and a destination point.
@@ -189,6 +196,9 @@ class Valhalla:
 
         :param bool dry_run: Print URL and parameters without sending the request.
 
+        :param Union[bool|List[str]] keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if
+            False or keep only the listed top-level keys. Default the client's ``keep_raw``.
+
         :param kwargs: any additional keyword arguments which will override parameters.
 
         :returns: A route from provided coordinates and restrictions.
@@ -213,9 +223,12 @@ class Valhalla:
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
 
-        return self.parse_direction_json(
+        return self.client._parse(
+            self.parse_direction_json,
             self.client._request("/route", get_params=get_params, post_params=params, dry_run=dry_run),
             units,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -278,20 +291,51 @@ class Valhalla:
         return params
 
     @staticmethod
-    def parse_direction_json(response, units):
+    def parse_direction_json(response, units, lazy=False):
         if response is None:  # pragma: no cover
             return Direction()
 
-        geometry, duration, distance = [], 0, 0
+        def _parse_geometry(shapes):
+            geometry = []
+            for shape in shapes:
+                geometry.extend(utils.decode_polyline6(shape))
+            return geometry
+
+        duration, distance = 0, 0
         for leg in response["trip"]["legs"]:
-            geometry.extend(utils.decode_polyline6(leg["shape"]))
             duration += leg["summary"]["time"]
 
             factor = 0.621371 if units == "mi" else 1
             distance += int(leg["summary"]["length"] * 1000 * factor)
 
+        # Only the shapes are captured, not the response
+        geometry = utils.deferred(
+            _parse_geometry, [leg["shape"] for leg in response["trip"]["legs"]], lazy=lazy
+        )
         return Direction(geometry=geometry, duration=int(duration), distance=int(distance), raw=response)
 
+    def directions_batch(self, locations_list, max_workers=None, **directions_kwargs):
+        """
+        Requests directions for many independent sets of locations concurrently over the client's shared
+        connection pool.
+
+        :param locations_list: A list of ``locations`` arguments, each of which is requested with :meth:`directions`.
+        :type locations_list: list of list
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param directions_kwargs: Any other :meth:`directions` argument, which is shared by all requests.
+
+        :returns: One result per entry of ``locations_list`` in input order. If a single request fails, its entry
+            holds the raised exception, the other requests are not affected.
+        :rtype: list of :class:`routingpy.direction.Direction` or Exception
+        """
+        return self.client._batch(
+            partial(self.directions, **directions_kwargs), locations_list, max_workers=max_workers
+        )
+
     def isochrones(  # noqa: C901
         self,
         locations,
@@ -313,6 +357,7 @@ class Valhalla:
         show_locations=None,
         id=None,
         dry_run=None,
+        keep_raw=None,
         **kwargs
     ):
         """Gets isochrones or equidistants for a range of time values around a given set of coordinates.
@@ -391,6 +436,10 @@ class Valhalla:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: An isochrone with the specified range.
         :rtype: :class:`routingpy.isochrone.Isochrones`
         """
@@ -415,13 +464,15 @@ class Valhalla:
         )
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
-        return self.parse_isochrone_json(
+        return self.client._parse(
+            self.parse_isochrone_json,
             self.client._request(
                 "/isochrone", get_params=get_params, post_params=params, dry_run=dry_run
             ),
             intervals,
             locations,
             interval_type,
+            keep_raw=keep_raw,
         )
 
     @staticmethod  # noqa: C901
@@ -538,6 +589,7 @@ class Valhalla:
         units=None,
         id=None,
         dry_run=None,
+        keep_raw=None,
         **kwargs
     ):
         """
@@ -591,6 +643,10 @@ class Valhalla:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -611,11 +667,14 @@ class Valhalla:
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
 
-        return self.parse_matrix_json(
+        return self.client._parse(
+            self.parse_matrix_json,
             self.client._request(
                 "/sources_to_targets", get_params=get_params, post_params=params, dry_run=dry_run
             ),
             units,
+            lazy=self.client.lazy,
+            keep_raw=keep_raw,
         )
 
     @staticmethod
@@ -680,26 +739,91 @@ class Valhalla:
         return params
 
     @staticmethod
-    def parse_matrix_json(response, units):
+    def parse_matrix_json(response, units, lazy=False):
         if response is None:  # pragma: no cover
             return Matrix()
 
         factor = 0.621371 if units == "mi" else 1
-        durations = [
-            [destination["time"] for destination in origin] for origin in response["sources_to_targets"]
-        ]
-        distances = [
-            [
-                int(destination["distance"] * 1000 * factor)
-                if destination["distance"] is not None
-                else None
-                for destination in origin
+
+        def _parse_durations(sources_to_targets):
+            return [[destination["time"] for destination in origin] for origin in sources_to_targets]
+
+        def _parse_distances(sources_to_targets):
+            return [
+                [
+                    int(destination["distance"] * 1000 * factor)
+                    if destination["distance"] is not None
+                    else None
+                    for destination in origin
+                ]
+                for origin in sources_to_targets
             ]
-            for origin in response["sources_to_targets"]
-        ]
+
+        # Only the matrix is captured, not the response
+        durations = utils.deferred(_parse_durations, response["sources_to_targets"], lazy=lazy)
+        distances = utils.deferred(_parse_distances, response["sources_to_targets"], lazy=lazy)
 
         return Matrix(durations=durations, distances=distances, raw=response)
 
+    def matrix_tiled(
+        self,
+        locations,
+        profile,
+        sources=None,
+        destinations=None,
+        block_size=None,
+        max_workers=None,
+        keep_raw=None,
+        **matrix_kwargs
+    ):
+        """
+        Gets a large matrix by splitting it into tiles of at most ``block_size`` sources and destinations. The tiles
+        are requested concurrently and stitched back together in the original order.
+
+        :param locations: The coordinates, see :meth:`matrix`.
+        :type locations: list of list
+
+        :param profile: Specifies the mode of transport, see :meth:`matrix`.
+        :type profile: str
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param block_size: Maximum number of sources and destinations per request, either one number for both
+            or a (sources, destinations) tuple. Default 50.
+        :type block_size: int or tuple of int
+
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :type max_workers: int
+
+        :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :type keep_raw: bool or list of str
+
+        :param matrix_kwargs: Any other :meth:`matrix` argument, which is shared by all requests.
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of the tiles' raw responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiling.matrix_tiled(
+            self.client,
+            self.matrix,
+            locations,
+            profile,
+            sources=sources,
+            destinations=destinations,
+            block_size=block_size or self._MATRIX_BLOCK_SIZE,
+            max_workers=max_workers,
+            keep_raw=keep_raw,
+            **matrix_kwargs
+        )
+
     def expansion(
         self,
         locations: Sequence[float],
@@ -712,8 +836,10 @@ class Valhalla:
         date_time: Optional[dict] = None,
         id: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        keep_raw: Optional[Union[bool, List[str]]] = None,
+        stream: bool = False,
         **kwargs
-    ) -> Expansions:
+    ) -> Union[Expansions, StreamedExpansions]:
         """Gets the expansion tree for a range of time or distance values around a given coordinate.
 
         For more information, visit https://valhalla.readthedocs.io/en/latest/api/expansion/api-reference/.
@@ -747,8 +873,23 @@ class Valhalla:
 
         :param dry_run: Print URL and parameters without sending the request.
 
-        :returns: An expansions object consisting of single line strings and their attributes (if specified).
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
+
+        :param stream: Read the response while iterating over the edges instead of loading it at once, which keeps
+            the memory low for large expansions. Needs the ijson package and the default client. The response
+            isn't cached. Default False.
+
+        :raises ValueError: if ``stream`` is true and the router doesn't use the default client, e.g. an
+            :class:`routingpy.client_async.AsyncClient`.
+
+        :returns: An expansions object consisting of single line strings and their attributes (if specified),
+            or a :class:`routingpy.expansion.StreamedExpansions` if ``stream`` is true.
         """
+        if stream and not isinstance(self.client, Client):
+            raise ValueError(
+                "Streaming the expansion needs the default Client, not {}.".format(type(self.client).__name__)
+            )
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
         params = self.get_expansion_params(
@@ -763,13 +904,27 @@ class Valhalla:
             id,
             **kwargs
         )
-        return self.parse_expansion_json(
+        if stream:
+            return self.client._parse(
+                self.parse_expansion_stream,
+                self.client._request(
+                    "/expansion", get_params=get_params, post_params=params, dry_run=dry_run, stream=True
+                ),
+                locations,
+                expansion_properties,
+                interval_type,
+                keep_raw=keep_raw,
+            )
+
+        return self.client._parse(
+            self.parse_expansion_json,
             self.client._request(
                 "/expansion", get_params=get_params, post_params=params, dry_run=dry_run
             ),
             locations,
             expansion_properties,
             interval_type,
+            keep_raw=keep_raw,
         )
 
     @classmethod
@@ -810,17 +965,21 @@ class Valhalla:
         if response is None:  # pragma: no cover
             return Expansions()
 
-        expansions = []
-        for idx, line in enumerate(response["features"][0]["geometry"]["coordinates"]):
-            properties = {}
-            if expansion_properties:
-                for expansion_prop in expansion_properties:
-                    properties[expansion_prop] = response["features"][0]["properties"][expansion_prop][
-                        idx
-                    ]
-            expansions.append(Edge(geometry=line, **properties))
+        # The columns of the response are used as they are, edges are created on access
+        feature = response["features"][0]
+        properties = {prop: feature["properties"][prop] for prop in expansion_properties or ()}
+
+        return Expansions(
+            center=locations,
+            interval_type=interval_type,
+            raw=response,
+            geometries=feature["geometry"]["coordinates"],
+            properties=properties,
+        )
 
-        return Expansions(expansions, locations, interval_type, response)
+    @staticmethod
+    def parse_expansion_stream(response, locations, expansion_properties, interval_type):
+        return StreamedExpansions(response, locations, interval_type, expansion_properties)
 
     def trace_attributes(
         self,
@@ -832,6 +991,8 @@ class Valhalla:
         filters_action: Optional[str] = None,
         options: Optional[dict] = None,
         dry_run: Optional[bool] = None,
+        encode_locations: Optional[bool] = None,
+        keep_raw: Optional[Union[bool, List[str]]] = None,
         **kwargs
     ) -> MatchedResults:
         """
@@ -855,6 +1016,11 @@ class Valhalla:
             will be filled automatically. For more information, visit:
             https://github.com/valhalla/valhalla/blob/master/docs/api/turn-by-turn/api-reference.md#costing-options
         :param dry_run: Print URL and parameters without sending the request.
+        :param encode_locations: Send plain lng/lat ``locations`` as ``encoded_polyline`` with precision 6, which
+            is roughly 5 times smaller than the JSON shape for long traces. Locations containing :class:`Waypoint`
+            objects are always sent as shape. Default False.
+        :param keep_raw: Keep the raw response in ``raw`` of the result if True, drop it if False or keep only the
+            listed top-level keys. Default the client's ``keep_raw``.
 
         :raises: ValueError if 'locations' and 'encoded_polyline' was specified
         :returns: A :class:`MatchedResults` object with matched edges and points set.
@@ -865,15 +1031,64 @@ class Valhalla:
             raise ValueError
 
         params = self.get_trace_attributes_params(
-            locations, profile, shape_match, encoded_polyline, filters, filters_action, options, **kwargs
+            locations,
+            profile,
+            shape_match,
+            encoded_polyline,
+            filters,
+            filters_action,
+            options,
+            encode_locations,
+            **kwargs
         )
 
-        return self.parse_trace_attributes_json(
+        return self.client._parse(
+            self.parse_trace_attributes_json,
             self.client._request(
                 "/trace_attributes", get_params=get_params, post_params=params, dry_run=dry_run
-            )
+            ),
+            keep_raw=keep_raw,
+        )
+
+    def trace_attributes_chunked(
+        self,
+        locations: Sequence[Union[Sequence[float], Waypoint]],
+        chunk_size: Optional[int] = None,
+        overlap: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        keep_raw: Optional[Union[bool, List[str]]] = None,
+        **trace_kwargs
+    ) -> MatchedResults:
+        """
+        Map-matches a long trace by splitting it into overlapping windows of locations, which are requested
+        concurrently. The results are stitched back together: the edges of the overlaps are only kept once and
+        ``edge_index`` of the matched points refers to the stitched edges.
+
+        :param locations: The trace's lng/lat values or :class:`Waypoint`, see :meth:`trace_attributes`.
+        :param chunk_size: Maximum number of locations per request. Default 1000.
+        :param overlap: Number of locations shared by consecutive requests, which are matched with the context of
+            both. Each request contributes the matched points up to the middle of the overlap. At least 1, the edges
+            at the boundaries only keep their full geometry from 2 on. Default 50.
+        :param max_workers: Maximum number of concurrent requests.
+            Default :attr:`routingpy.routers.options.default_max_workers`.
+        :param keep_raw: Keep the raw responses of the chunks if True, drop them if False or keep only the listed
+            top-level keys of each. Default the client's ``keep_raw``.
+        :param trace_kwargs: Any other :meth:`trace_attributes` argument, which is shared by all requests.
+
+        :returns: The stitched :class:`MatchedResults`. Its ``raw`` property holds the list of the chunks' raw
+            responses.
+        """
+        chunks = tiling.trace_chunks(
+            len(locations),
+            chunk_size or self._TRACE_CHUNK_SIZE,
+            self._TRACE_OVERLAP if overlap is None else overlap,
         )
 
+        def _request_chunk(chunk):
+            return self.trace_attributes(chunk.select(locations), keep_raw=keep_raw, **trace_kwargs)
+
+        return tiling.request_chunked_trace(self.client, _request_chunk, chunks, max_workers, keep_raw)
+
     @classmethod
     def get_trace_attributes_params(
         cls,
@@ -884,10 +1099,13 @@ class Valhalla:
         filters: Optional[List[str]] = None,
         filters_action: Optional[str] = None,
         options: Optional[dict] = None,
+        encode_locations: Optional[bool] = None,
         **kwargs
     ):
         params = dict()
-        if locations:
+        if locations and encode_locations and cls._is_plain_coordinates(locations):
+            params["encoded_polyline"] = utils.encode_polyline6(locations)
+        elif locations:
             params["shape"] = cls._build_locations(locations)
         elif encoded_polyline:
             params["encoded_polyline"] = encoded_polyline
@@ -920,6 +1138,13 @@ class Valhalla:
 
         return MatchedResults(response)
 
+    @staticmethod
+    def _is_plain_coordinates(coordinates):
+        """Whether the coordinates are a list of lng/lat pairs without any :class:`Waypoint`, so they can be encoded"""
+        if isinstance(coordinates, Valhalla.Waypoint):
+            return False
+        return all(isinstance(coord, (list, tuple)) for coord in coordinates)
+
     @staticmethod
     def _build_locations(coordinates):
         """Build the locations object for all methods"""
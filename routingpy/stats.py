@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Client statistics in the OpenMetrics text format, which Prometheus and most other monitoring systems scrape.
+
+>>> from routingpy import OSRM
+>>> from routingpy.routers import options
+>>> from routingpy import stats
+>>> options.default_hooks = [stats.default_registry]  # or OSRM(url, hooks=[stats.default_registry])
+>>> route = OSRM(url).directions(locations)
+>>> print(stats.render_openmetrics())
+# TYPE routingpy_requests counter
+# HELP routingpy_requests HTTP requests by router, endpoint and status.
+routingpy_requests_total{router="OSRM",endpoint="/route/v1/driving/{locations}",status="200"} 1
+...
+"""
+
+import threading
+from collections import Counter
+
+from .hooks import DEFAULT_BUCKETS, LatencyCollector
+
+#: The Content-Type to serve :func:`render_openmetrics` with
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class StatsRegistry(LatencyCollector):
+    """
+    Hook which collects the statistics of all clients it's passed to:
+
+    - ``routingpy_requests_total``: HTTP requests by router, endpoint and status code.
+    - ``routingpy_retries_total``: Retried attempts by router and endpoint.
+    - ``routingpy_errors_total``: Failed requests by router, endpoint and exception.
+    - ``routingpy_rate_limit_sleeps_total`` and ``routingpy_rate_limit_sleep_seconds_total``: Waits for the
+      client's rate limiter by router and endpoint.
+    - ``routingpy_request_duration_seconds``: Histograms by router, endpoint and phase, see
+      :class:`routingpy.hooks.LatencyCollector`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the histogram buckets in seconds.
+            Default :data:`routingpy.hooks.DEFAULT_BUCKETS`.
+        :type buckets: list of float
+        """
+        super(StatsRegistry, self).__init__(buckets)
+        self._counters = {
+            "requests": Counter(),
+            "retries": Counter(),
+            "errors": Counter(),
+            "rate_limit_sleeps": Counter(),
+            "rate_limit_sleep_seconds": Counter(),
+        }
+        self._counter_lock = threading.Lock()
+
+    def __call__(self, event):
+        super(StatsRegistry, self).__call__(event)
+
+        labels = (("router", event.router), ("endpoint", event.endpoint))
+        with self._counter_lock:
+            if event.type == "response":
+                self._counters["requests"][labels + (("status", event.status_code),)] += 1
+            elif event.type == "retry":
+                self._counters["retries"][labels] += 1
+            elif event.type == "error":
+                self._counters["errors"][labels + (("error", type(event.error).__name__),)] += 1
+            elif event.type == "rate_limit":
+                self._counters["rate_limit_sleeps"][labels] += 1
+                self._counters["rate_limit_sleep_seconds"][labels] += event.timings["delay"]
+
+    def counter(self, name, **labels):
+        """
+        Returns the value of a counter, 0 if it wasn't incremented yet.
+
+        >>> registry.counter("requests", router="OSRM", endpoint="/table/v1/driving/{locations}", status=200)
+        3
+
+        :param name: The counter without ``routingpy_`` and ``_total``, e.g. "requests" or "retries".
+        :type name: str
+
+        :param labels: All labels of the counter, i.e. router, endpoint and, depending on the counter, status or
+            error.
+        :type labels: dict
+
+        :rtype: int or float
+        """
+        order = ("router", "endpoint", "status", "error")
+        key = tuple((label, labels[label]) for label in order if label in labels)
+        with self._counter_lock:
+            return self._counters[name][key]
+
+    def clear(self):
+        super(StatsRegistry, self).clear()
+        with self._counter_lock:
+            for counter in self._counters.values():
+                counter.clear()
+
+    def render(self):
+        """
+        Renders all statistics in the OpenMetrics text format.
+
+        :rtype: str
+        """
+        lines = []
+        with self._counter_lock:
+            counters = {name: dict(counter) for name, counter in self._counters.items()}
+
+        for name, description in (
+            ("requests", "HTTP requests by router, endpoint and status."),
+            ("retries", "Retried attempts by router and endpoint."),
+            ("errors", "Failed requests by router, endpoint and exception."),
+            ("rate_limit_sleeps", "Waits for the rate limiter by router and endpoint."),
+            ("rate_limit_sleep_seconds", "Seconds waited for the rate limiter by router and endpoint."),
+        ):
+            lines.append("# TYPE routingpy_{} counter".format(name))
+            lines.append("# HELP routingpy_{} {}".format(name, description))
+            for labels, value in sorted(counters[name].items(), key=_sort_key):
+                lines.append(
+                    "routingpy_{}_total{} {}".format(name, _format_labels(labels), _format_value(value))
+                )
+
+        lines.append("# TYPE routingpy_request_duration_seconds histogram")
+        lines.append(
+            "# HELP routingpy_request_duration_seconds Durations by router, endpoint and phase of the request."
+        )
+        for (router, endpoint, phase), histogram in sorted(self.snapshot().items(), key=_sort_key):
+            labels = (("router", router), ("endpoint", endpoint), ("phase", phase))
+            for bound, count in histogram.cumulative():
+                lines.append(
+                    "routingpy_request_duration_seconds_bucket{} {}".format(
+                        _format_labels(labels + (("le", bound),)), count
+                    )
+                )
+            lines.append(
+                "routingpy_request_duration_seconds_count{} {}".format(
+                    _format_labels(labels), histogram.count
+                )
+            )
+            lines.append(
+                "routingpy_request_duration_seconds_sum{} {}".format(
+                    _format_labels(labels), _format_value(histogram.sum)
+                )
+            )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _sort_key(item):
+    return [str(part) for part in item[0]]
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    return "{{{}}}".format(
+        ",".join(
+            '{}="{}"'.format(
+                name,
+                _format_value(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for name, value in labels
+        )
+    )
+
+
+#: The registry :func:`render_openmetrics` renders by default
+default_registry = StatsRegistry()
+
+
+def render_openmetrics(registry=None):
+    """
+    Renders the statistics of a registry in the OpenMetrics text format, to be served with :data:`CONTENT_TYPE`.
+
+    :param registry: The registry to render. Default :data:`default_registry`.
+    :type registry: :class:`StatsRegistry`
+
+    :rtype: str
+    """
+    return (registry if registry is not None else default_registry).render()
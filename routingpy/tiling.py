@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Splits large requests into provider sized sub-requests and stitches their results back together.
+"""
+
+from collections import namedtuple
+
+from .matrix import Matrix
+from .valhalla_attributes import MatchedResults
+
+
+class MatrixTile(namedtuple("MatrixTile", ("indices", "sources", "destinations", "rows", "columns"))):
+    """
+    A single block of a tiled matrix request.
+
+    ``indices`` are the positions of the tile's locations in the original locations list, ``sources`` and
+    ``destinations`` refer to the tile's own locations and ``rows`` and ``columns`` are the slices the tile's
+    result occupies in the stitched matrix.
+    """
+
+    __slots__ = ()
+
+    def select(self, values):
+        """Picks the tile's items from a list which runs parallel to the original locations."""
+        return [values[idx] for idx in self.indices]
+
+
+def matrix_tiles(n_locations, sources=None, destinations=None, block_size=50):
+    """
+    Splits a matrix request into tiles of at most ``block_size`` sources and destinations.
+
+    :param n_locations: Number of locations of the whole request.
+    :type n_locations: int
+
+    :param sources: Indices of the source locations. Default all locations.
+    :type sources: list of int
+
+    :param destinations: Indices of the destination locations. Default all locations.
+    :type destinations: list of int
+
+    :param block_size: Maximum number of sources and destinations per tile. Either one number for both or
+        a (sources, destinations) tuple.
+    :type block_size: int or tuple of int
+
+    :rtype: list of :class:`MatrixTile`
+    """
+    sources = list(range(n_locations)) if sources is None else list(sources)
+    destinations = list(range(n_locations)) if destinations is None else list(destinations)
+    rows, columns = block_size if isinstance(block_size, (list, tuple)) else (block_size, block_size)
+    if rows < 1 or columns < 1:
+        raise ValueError("block_size must be at least 1, not {}.".format(block_size))
+
+    tiles = []
+    for row in range(0, len(sources), rows):
+        source_block = sources[row : row + rows]
+        for column in range(0, len(destinations), columns):
+            destination_block = destinations[column : column + columns]
+
+            # Locations which are both source and destination are only sent once
+            indices = list(dict.fromkeys(source_block + destination_block))
+            position = {idx: pos for pos, idx in enumerate(indices)}
+            tiles.append(
+                MatrixTile(
+                    indices=indices,
+                    sources=[position[idx] for idx in source_block],
+                    destinations=[position[idx] for idx in destination_block],
+                    rows=slice(row, row + len(source_block)),
+                    columns=slice(column, column + len(destination_block)),
+                )
+            )
+
+    return tiles
+
+
+def stitch_matrix(matrices, tiles):
+    """
+    Combines the results of the single tiles into one matrix. ``raw`` holds the list of the tiles' raw responses.
+
+    :param matrices: One result per tile, in the same order as ``tiles``.
+    :type matrices: list of :class:`routingpy.matrix.Matrix`
+
+    :param tiles: The tiles as returned by :func:`matrix_tiles`.
+    :type tiles: list of :class:`MatrixTile`
+
+    :raises: The first exception any of the tile requests raised.
+
+    :rtype: :class:`routingpy.matrix.Matrix`
+    """
+    for matrix in matrices:
+        if isinstance(matrix, Exception):
+            raise matrix
+
+    n_rows = max((tile.rows.stop for tile in tiles), default=0)
+    n_columns = max((tile.columns.stop for tile in tiles), default=0)
+
+    def _stitch(attribute):
+        if all(getattr(matrix, attribute) is None for matrix in matrices):
+            return None
+
+        stitched = [[None] * n_columns for _ in range(n_rows)]
+        for matrix, tile in zip(matrices, tiles):
+            values = getattr(matrix, attribute)
+            if values is None:
+                continue
+            for row, row_values in zip(stitched[tile.rows], values):
+                row[tile.columns] = row_values
+
+        return stitched
+
+    return Matrix(
+        durations=_stitch("durations"),
+        distances=_stitch("distances"),
+        raw=[matrix.raw for matrix in matrices],
+    )
+
+
+def request_tiled_matrix(client, request_tile, tiles, max_workers=None, keep_raw=None):
+    """
+    Requests all tiles concurrently with the client and stitches the results.
+
+    :param client: The router's client.
+    :type client: :class:`routingpy.client_base.BaseClient`
+
+    :param request_tile: Callable requesting a single :class:`MatrixTile`, usually wrapping a router's ``matrix``.
+    :type request_tile: callable
+
+    :param tiles: The tiles as returned by :func:`matrix_tiles`.
+    :type tiles: list of :class:`MatrixTile`
+
+    :param max_workers: Maximum number of concurrent requests.
+    :type max_workers: int
+
+    :param keep_raw: Overrides the client's ``keep_raw`` for the stitched matrix. Listed keys are kept of every
+        tile's raw response.
+    :type keep_raw: bool or list of str
+
+    :rtype: :class:`routingpy.matrix.Matrix`
+    """
+    return client._parse(
+        stitch_matrix,
+        client._batch(request_tile, tiles, max_workers=max_workers),
+        tiles,
+        keep_raw=keep_raw,
+    )
+
+
+def matrix_tiled(
+    client,
+    matrix,
+    locations,
+    profile,
+    sources=None,
+    destinations=None,
+    block_size=50,
+    max_workers=None,
+    keep_raw=None,
+    location_kwargs=None,
+    **matrix_kwargs
+):
+    """
+    Requests a large matrix in tiles of at most ``block_size`` sources and destinations with a router's
+    ``matrix`` method and stitches them back together, see the routers' ``matrix_tiled``.
+
+    :param client: The router's client.
+    :type client: :class:`routingpy.client_base.BaseClient`
+
+    :param matrix: The router's ``matrix`` method, which is called with the locations, profile, sources and
+        destinations of each tile.
+    :type matrix: callable
+
+    :param locations: The coordinates of all locations.
+    :type locations: list of list
+
+    :param profile: Specifies the mode of transport, passed to every ``matrix`` call.
+    :type profile: str
+
+    :param sources: Indices of the source locations. Default all locations.
+    :type sources: list of int
+
+    :param destinations: Indices of the destination locations. Default all locations.
+    :type destinations: list of int
+
+    :param block_size: Maximum number of sources and destinations per tile. Either one number for both or
+        a (sources, destinations) tuple.
+    :type block_size: int or tuple of int
+
+    :param max_workers: Maximum number of concurrent requests.
+    :type max_workers: int
+
+    :param keep_raw: Keep the raw responses of the tiles if True, drop them if False or keep only the listed
+        top-level keys of each. Default the client's ``keep_raw``.
+    :type keep_raw: bool or list of str
+
+    :param location_kwargs: ``matrix`` arguments with one value per location, e.g. OSRM's ``radiuses``, of which
+        each tile gets the values of its locations.
+    :type location_kwargs: dict
+
+    :param matrix_kwargs: Any other ``matrix`` argument, which is shared by all requests.
+
+    :rtype: :class:`routingpy.matrix.Matrix`
+    """
+    tiles = matrix_tiles(len(locations), sources, destinations, block_size)
+    location_kwargs = {name: values for name, values in (location_kwargs or {}).items() if values}
+
+    def _request_tile(tile):
+        tile_kwargs = {name: tile.select(values) for name, values in location_kwargs.items()}
+        return matrix(
+            tile.select(locations),
+            profile,
+            sources=tile.sources,
+            destinations=tile.destinations,
+            keep_raw=keep_raw,
+            **tile_kwargs,
+            **matrix_kwargs
+        )
+
+    return request_tiled_matrix(client, _request_tile, tiles, max_workers, keep_raw)
+
+
+class TraceChunk(namedtuple("TraceChunk", ("start", "stop", "owned"))):
+    """
+    A window of a chunked map matching request.
+
+    ``start`` and ``stop`` delimit the chunk's locations in the whole trace. ``owned`` is the slice of locations
+    whose matched points the chunk contributes to the stitched result, which ends in the middle of the overlap
+    with the next chunk, so both chunks match the locations around the boundary with some context.
+    """
+
+    __slots__ = ()
+
+    def select(self, values):
+        """Picks the chunk's items from a list which runs parallel to the trace's locations."""
+        return values[self.start : self.stop]
+
+
+def trace_chunks(n_locations, chunk_size=1000, overlap=50):
+    """
+    Splits a trace into windows of at most ``chunk_size`` locations, consecutive windows share ``overlap``
+    locations.
+
+    :param n_locations: Number of locations of the whole trace.
+    :type n_locations: int
+
+    :param chunk_size: Maximum number of locations per chunk.
+    :type chunk_size: int
+
+    :param overlap: Number of locations shared by consecutive chunks, at least 1.
+    :type overlap: int
+
+    :rtype: list of :class:`TraceChunk`
+    """
+    if overlap < 1 or chunk_size <= overlap:
+        raise ValueError(
+            "overlap must be at least 1 and less than chunk_size, not {} and {}.".format(
+                overlap, chunk_size
+            )
+        )
+
+    chunks = []
+    start = owned_start = 0
+    while True:
+        stop = min(start + chunk_size, n_locations)
+        if stop == n_locations:
+            chunks.append(TraceChunk(start, stop, slice(owned_start, stop)))
+            return chunks
+
+        next_start = stop - overlap
+        owned_stop = next_start + overlap // 2
+        chunks.append(TraceChunk(start, stop, slice(owned_start, owned_stop)))
+        start, owned_start = next_start, owned_stop
+
+
+def _edge_position(result, start):
+    """Returns the index of the edge the first matched point from ``start`` on is on, or the number of edges if
+    there's no such point."""
+    n_edges = len(result.matched_edges)
+    for point in result.matched_points[start:]:
+        if point.edge_index is not None and 0 <= point.edge_index < n_edges:
+            return point.edge_index
+
+    return n_edges
+
+
+def stitch_trace(results, chunks):
+    """
+    Combines the results of the single chunks into one :class:`routingpy.valhalla_attributes.MatchedResults`.
+    Every chunk contributes the matched points of its ``owned`` locations and the edges from the first of them up
+    to the first of the next chunk's, so edges in the overlap aren't duplicated. ``edge_index`` of the points is
+    updated to the stitched edges and ``raw`` holds the list of the chunks' raw responses.
+
+    :param results: One result per chunk, in the same order as ``chunks``.
+    :type results: list of :class:`routingpy.valhalla_attributes.MatchedResults`
+
+    :param chunks: The chunks as returned by :func:`trace_chunks`.
+    :type chunks: list of :class:`TraceChunk`
+
+    :raises: The first exception any of the chunk requests raised.
+
+    :rtype: :class:`routingpy.valhalla_attributes.MatchedResults`
+    """
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+    edges = []
+    points = []
+    for idx, (result, chunk) in enumerate(zip(results, chunks)):
+        first = chunk.owned.start - chunk.start
+        last = chunk.owned.stop - chunk.start
+        begin = _edge_position(result, first) if idx else 0
+        end = _edge_position(result, last) if idx < len(chunks) - 1 else len(result.matched_edges)
+
+        # Points on an edge left to the next chunk refer to the first edge the next chunk adds
+        offset = len(edges) - begin
+        n_edges = len(result.matched_edges)
+        edges.extend(result.matched_edges[begin:end])
+        for point in result.matched_points[first:last]:
+            if point.edge_index is not None and 0 <= point.edge_index < n_edges:
+                point._edge_index = point.edge_index + offset
+            points.append(point)
+
+    return MatchedResults([result.raw for result in results], edges, points)
+
+
+def request_chunked_trace(client, request_chunk, chunks, max_workers=None, keep_raw=None):
+    """
+    Requests all chunks of a trace concurrently with the client and stitches the results.
+
+    :param client: The router's client.
+    :type client: :class:`routingpy.client_base.BaseClient`
+
+    :param request_chunk: Callable requesting a single :class:`TraceChunk`, usually wrapping a router's
+        ``trace_attributes``.
+    :type request_chunk: callable
+
+    :param chunks: The chunks as returned by :func:`trace_chunks`.
+    :type chunks: list of :class:`TraceChunk`
+
+    :param max_workers: Maximum number of concurrent requests.
+    :type max_workers: int
+
+    :param keep_raw: Overrides the client's ``keep_raw`` for the stitched result. Listed keys are kept of every
+        chunk's raw response.
+    :type keep_raw: bool or list of str
+
+    :rtype: :class:`routingpy.valhalla_attributes.MatchedResults`
+    """
+    return client._parse(
+        stitch_trace,
+        client._batch(request_chunk, chunks, max_workers=max_workers),
+        chunks,
+        keep_raw=keep_raw,
+    )
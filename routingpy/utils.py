@@ -16,9 +16,18 @@
 #
 
 import logging
+from functools import partial
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 logger = logging.getLogger("routingpy")
 
+# Below this length the numpy decoder's setup costs more than it saves
+_NUMPY_DECODE_MIN_LENGTH = 200
+
 
 def _trans(value, index):
     """
@@ -71,11 +80,64 @@ def _decode(expression, precision=5, is3d=False, order="lnglat"):
     return coordinates
 
 
-def decode_polyline5(polyline, is3d=False, order="lnglat"):
+def _decode_array(expression, precision=5, is3d=False, order="lnglat"):
+    """
+    Decodes all varints of the polyline at once with numpy and returns a (n, 2) or (n, 3) float array.
+    """
+    if order not in ("lnglat", "latlng"):
+        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
+    dimensions = 3 if is3d else 2
+    if isinstance(expression, str):
+        expression = expression.encode("ascii")
+
+    chunks = np.frombuffer(expression, dtype=np.uint8).astype(np.int64) - 63
+    if not len(chunks):
+        return np.empty((0, dimensions))
+
+    # a chunk below 0x20 terminates a value, the next chunk starts the following one
+    is_last = chunks < 0x20
+    if not is_last[-1]:
+        raise ValueError("Polyline is truncated.")
+    starts = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    shifts = 5 * (np.arange(len(chunks)) - np.repeat(starts, np.diff(np.append(starts, len(chunks)))))
+    values = np.add.reduceat((chunks & 0x1F) << shifts, starts)
+    values = np.where(values & 1, ~(values >> 1), values >> 1)
+    if len(values) % dimensions:
+        raise ValueError("Polyline is truncated.")
+
+    # columns are lat, lng[, z] in the encoded order
+    integers = np.cumsum(values.reshape(-1, dimensions), axis=0)
+    coordinates = np.empty(integers.shape)
+    columns = [0, 1] if order == "latlng" else [1, 0]
+    coordinates[:, columns] = integers[:, :2] / float(10**precision)
+    if is3d:
+        coordinates[:, 2] = integers[:, 2] / 100
+
+    return coordinates
+
+
+def _decode_fast(expression, precision=5, is3d=False, order="lnglat", as_array=False):
+    """
+    Chooses the numpy decoder for arrays and long polylines, the pure Python one otherwise.
+    """
+    if as_array:
+        if np is None:  # pragma: no cover
+            raise ImportError("as_array needs the numpy package, install it with 'pip install numpy'.")
+        return _decode_array(expression, precision=precision, is3d=is3d, order=order)
+
+    if np is not None and len(expression) >= _NUMPY_DECODE_MIN_LENGTH:
+        return list(map(tuple, _decode_array(expression, precision, is3d, order).tolist()))
+
+    if not isinstance(expression, str):
+        expression = bytes(expression).decode("ascii")
+    return _decode(expression, precision=precision, is3d=is3d, order=order)
+
+
+def decode_polyline5(polyline, is3d=False, order="lnglat", as_array=False):
     """Decodes an encoded polyline string which was encoded with a precision of 5.
 
     :param polyline: An encoded polyline, only the geometry.
-    :type polyline: str
+    :type polyline: str or bytes
 
     :param is3d: Specifies if geometry contains Z component. Currently only GraphHopper and OpenRouteService
         support this. Default False.
@@ -85,17 +147,21 @@ def decode_polyline5(polyline, is3d=False, order="lnglat"):
                   Options: latlng, lnglat. Defaults to 'lnglat'.
     :type order: str
 
+    :param as_array: Return a numpy array of shape (n, 2), or (n, 3) for 3D geometries, instead of a list of
+        tuples. Needs numpy. Default False.
+    :type as_array: bool
+
     :returns: List of decoded coordinates with precision 5.
-    :rtype: list
+    :rtype: list or numpy.ndarray
     """
-    return _decode(polyline, precision=5, is3d=is3d, order=order)
+    return _decode_fast(polyline, precision=5, is3d=is3d, order=order, as_array=as_array)
 
 
-def decode_polyline6(polyline, is3d=False, order="lnglat"):
+def decode_polyline6(polyline, is3d=False, order="lnglat", as_array=False):
     """Decodes an encoded polyline string which was encoded with a precision of 6.
 
     :param polyline: An encoded polyline, only the geometry.
-    :type polyline: str
+    :type polyline: str or bytes
 
     :param is3d: Specifies if geometry contains Z component. Currently only GraphHopper and OpenRouteService
         support this. Default False.
@@ -105,11 +171,109 @@ def decode_polyline6(polyline, is3d=False, order="lnglat"):
                   Options: latlng, lnglat. Defaults to 'lnglat'.
     :type order: str
 
+    :param as_array: Return a numpy array of shape (n, 2), or (n, 3) for 3D geometries, instead of a list of
+        tuples. Needs numpy. Default False.
+    :type as_array: bool
+
     :returns: List of decoded coordinates with precision 6.
-    :rtype: list
+    :rtype: list or numpy.ndarray
+    """
+
+    return _decode_fast(polyline, precision=6, is3d=is3d, order=order, as_array=as_array)
+
+
+def _encode_value(value):
+    """Zigzag encodes a signed integer delta into polyline characters."""
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+
+    return "".join(chunks)
+
+
+def _round(value):
+    """Rounds half away from zero like the reference polyline implementation, not to the nearest even number."""
+    return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+
+
+def _encode(coordinates, precision=5, is3d=False, order="lnglat"):
     """
+    Encodes coordinates to a polyline string, the inverse of :func:`_decode`.
+    """
+    if order not in ("lnglat", "latlng"):
+        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
+    factor = 10**precision
+    lat_idx, lng_idx = (0, 1) if order == "latlng" else (1, 0)
+
+    chunks, prev_lat, prev_lng, prev_z = [], 0, 0, 0
+    for coord in coordinates:
+        lat, lng = _round(coord[lat_idx] * factor), _round(coord[lng_idx] * factor)
+        chunks.append(_encode_value(lat - prev_lat))
+        chunks.append(_encode_value(lng - prev_lng))
+        prev_lat, prev_lng = lat, lng
+        if is3d:
+            z = _round(coord[2] * 100)
+            chunks.append(_encode_value(z - prev_z))
+            prev_z = z
+
+    return "".join(chunks)
+
+
+def encode_polyline5(coordinates, is3d=False, order="lnglat"):
+    """Encodes a list of coordinates to a polyline string with a precision of 5.
+
+    :param coordinates: The coordinates to encode, e.g. [[8.68864, 49.42058], [8.68092, 49.41578]].
+    :type coordinates: list of list or list of tuple
+
+    :param is3d: Specifies if the coordinates contain a Z component, which is encoded with a precision of 2.
+        Default False.
+    :type is3d: bool
+
+    :param order: Specifies the order of the input coordinates.
+                  Options: latlng, lnglat. Defaults to 'lnglat'.
+    :type order: str
+
+    :returns: The encoded polyline.
+    :rtype: str
+    """
+    return _encode(coordinates, precision=5, is3d=is3d, order=order)
 
-    return _decode(polyline, precision=6, is3d=is3d, order=order)
+
+def encode_polyline6(coordinates, is3d=False, order="lnglat"):
+    """Encodes a list of coordinates to a polyline string with a precision of 6.
+
+    :param coordinates: The coordinates to encode, e.g. [[8.688641, 49.420577], [8.680916, 49.415776]].
+    :type coordinates: list of list or list of tuple
+
+    :param is3d: Specifies if the coordinates contain a Z component, which is encoded with a precision of 2.
+        Default False.
+    :type is3d: bool
+
+    :param order: Specifies the order of the input coordinates.
+                  Options: latlng, lnglat. Defaults to 'lnglat'.
+    :type order: str
+
+    :returns: The encoded polyline.
+    :rtype: str
+    """
+    return _encode(coordinates, precision=6, is3d=is3d, order=order)
+
+
+def deferred(func, *args, lazy=False):
+    """
+    Returns ``func(*args)``, or with ``lazy`` a callable computing it, which result objects like
+    :class:`routingpy.direction.Direction` call on first access of the property and memoize.
+
+    :param func: Computes the value, e.g. decodes a geometry.
+    :type func: callable
+
+    :param lazy: Whether to defer the computation.
+    :type lazy: bool
+    """
+    return partial(func, *args) if lazy else func(*args)
 
 
 def get_ordinal(number):
@@ -114,6 +114,30 @@ class MatchedEdge:
     Access via properties ``geometry``, ``distances`` ``durations``, ``costs``, ``edge_ids``, ``statuses``.
     """
 
+    __slots__ = (
+        "_geometry",
+        "_traversability",
+        "_toll",
+        "_use",
+        "_tunnel",
+        "_names",
+        "_driving_side",
+        "_roundabout",
+        "_bridge",
+        "_surface",
+        "_edge_id",
+        "_osm_way_id",
+        "_speed_limit",
+        "_cycle_lane",
+        "_sidewalk",
+        "_lane_count",
+        "_mean_elevation",
+        "_weighted_grade",
+        "_road_class",
+        "_speed",
+        "_length",
+    )
+
     def __init__(self, edge: dict, coords: List[List[float]]):
         self._geometry = coords
         self._traversability: Optional[Traversability] = (
@@ -298,7 +322,9 @@ class MatchedEdge:
         return self._length
 
     def __repr__(self):  # pragma: no cover
-        return "Edge({})".format(", ".join([f"{k[1:]}: {v}" for k, v in vars(self).items() if v]))
+        return "Edge({})".format(
+            ", ".join([f"{k[1:]}: {getattr(self, k)}" for k in self.__slots__ if getattr(self, k)])
+        )
 
 
 class MatchedPoint:
@@ -306,12 +332,21 @@ class MatchedPoint:
     A single matched point
     """
 
+    __slots__ = (
+        "_geometry",
+        "_match_type",
+        "_dist_along_edge",
+        "_dist_from_input",
+        "_edge_index",
+        "_discontinuity",
+    )
+
     def __init__(self, point: dict):
         self._geometry: List[float] = [point["lon"], point["lat"]]
         self._match_type = MatchType(point.get("type", "")) or None
         self._dist_along_edge: Optional[float] = point.get("distance_along_edge")
         self._dist_from_input: Optional[int] = point.get("distance_from_trace_point")
-        self._edge_index: Optional[int] = point.get("distance_along_edge")
+        self._edge_index: Optional[int] = point.get("edge_index")
         self._discontinuity: Optional[MatchDiscontinuity] = None
         if point.get("begin_route_discontinuity"):
             self._discontinuity = MatchDiscontinuity("begin")
@@ -364,24 +399,34 @@ class MatchedPoint:
 
 class MatchedResults:
     """
-    Contains a list of :class:`Expansion`, which can be iterated over or accessed by index. The property ¸`raw`` contains
+    Contains a list of :class:`Expansion`, which can be iterated over or accessed by index. The property ``raw`` contains
     the complete raw response of the expansion request.
     """
 
-    def __init__(self, response: Optional[dict] = None):
-        self._edges: List[MatchedEdge] = list()
-        self._points: List[MatchedPoint] = list()
+    __slots__ = ("_edges", "_points", "_raw")
+
+    def __init__(
+        self,
+        response: Optional[dict] = None,
+        matched_edges: Optional[List[MatchedEdge]] = None,
+        matched_points: Optional[List[MatchedPoint]] = None,
+    ):
+        """
+        :param response: The raw trace_attributes response, which is parsed unless ``matched_edges`` or
+            ``matched_points`` are passed.
+        """
+        self._edges: List[MatchedEdge] = matched_edges if matched_edges is not None else list()
+        self._points: List[MatchedPoint] = matched_points if matched_points is not None else list()
         self._raw = response
 
-        if not response:
+        if not response or matched_edges is not None or matched_points is not None:
             return
 
         geometry = decode_polyline6(response["shape"])
         # fill the edges
         for edge in response["edges"]:
             coords: List[List[float]] = geometry[
-                response.get("begin_shape_index")
-                or 0 : (response.get("end_shape_index") or (len(geometry) - 1)) + 1
+                edge.get("begin_shape_index", 0) : edge.get("end_shape_index", len(geometry) - 1) + 1
             ]
             self._edges.append(MatchedEdge(edge, coords))
 
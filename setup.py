@@ -41,6 +41,7 @@ setup(
     url="https://github.com/gis-ops/routing-py",
     packages=find_packages(exclude=["*tests*"]),
     install_requires=["requests>=2.20.0"],
+    extras_require={"async": ["httpx>=0.23.0"], "numpy": ["numpy"], "orjson": ["orjson"], "ijson": ["ijson"]},
     license="Apache 2.0",
     classifiers=[
         "License :: OSI Approved :: Apache Software License",
@@ -31,3 +31,7 @@ class TestCase(unittest.TestCase):
         first_qsl = sorted(parse_qsl(first_parsed.query))
         second_qsl = sorted(parse_qsl(second_parsed.query))
         self.assertEqual(first_qsl, second_qsl, msg)
+
+
+class Response(dict):
+    """A parsed JSON response which can be weakly referenced, e.g. to check it's released."""
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the load balancer."""
+
+import time
+
+import responses
+
+import tests as _test
+from routingpy import OSRM
+from routingpy.balancing import LoadBalancer
+from routingpy.client_default import Client
+from routingpy.retry import RetryPolicy
+
+URLS = ["https://a.org", "https://b.org", "https://c.org"]
+
+
+class LoadBalancerTest(_test.TestCase):
+    def test_round_robin(self):
+        balancer = LoadBalancer(URLS)
+        self.assertEqual(URLS * 2, [balancer.acquire() for _ in range(6)])
+        self.assertEqual(dict.fromkeys(URLS, 2), balancer.outstanding)
+
+    def test_least_outstanding(self):
+        balancer = LoadBalancer(URLS, strategy="least_outstanding")
+        for _ in range(3):
+            balancer.acquire()
+        balancer.release("https://b.org")
+
+        self.assertEqual("https://b.org", balancer.acquire())
+
+    def test_power_of_two(self):
+        balancer = LoadBalancer(URLS[:2], strategy="power_of_two")
+        balancer.acquire()
+        first = balancer.acquire()
+        for _ in range(5):
+            balancer.release(first)
+            self.assertEqual(first, balancer.acquire())
+
+    def test_eject(self):
+        balancer = LoadBalancer(URLS[:2], max_failures=2, eject_time=0.05)
+        balancer.release(balancer.acquire(), failed=True)
+        balancer.release(balancer.acquire())
+        self.assertEqual([], balancer.ejected)
+
+        balancer.release(balancer.acquire(), failed=True)
+        self.assertEqual(["https://a.org"], balancer.ejected)
+        self.assertEqual(["https://b.org"] * 3, [balancer.acquire() for _ in range(3)])
+
+        time.sleep(0.06)
+        self.assertEqual([], balancer.ejected)
+        self.assertIn("https://a.org", [balancer.acquire() for _ in range(2)])
+        # a failed probe ejects right away
+        balancer.release("https://a.org", failed=True)
+        self.assertEqual(["https://a.org"], balancer.ejected)
+
+    def test_all_ejected(self):
+        balancer = LoadBalancer(URLS[:2], max_failures=1)
+        for url in URLS[:2]:
+            balancer.acquire()
+            balancer.release(url, failed=True)
+
+        self.assertEqual("https://a.org", balancer.acquire())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LoadBalancer([])
+        with self.assertRaises(ValueError):
+            LoadBalancer(URLS, strategy="random")
+
+
+class ClientBalancingTest(_test.TestCase):
+    @responses.activate
+    def test_round_robin(self):
+        for url in URLS:
+            responses.add(responses.GET, url + "/get", status=200, json={"url": url})
+        client = Client(URLS)
+
+        self.assertEqual(URLS * 2, [client._request("/get")["url"] for _ in range(6)])
+        self.assertEqual("https://a.org", client.base_url)
+
+    @responses.activate
+    def test_eject_failing_replica(self):
+        responses.add(responses.GET, "https://a.org/get", status=503, json={})
+        responses.add(responses.GET, "https://b.org/get", status=200, json={"url": "b"})
+        client = Client(
+            LoadBalancer(URLS[:2], max_failures=1),
+            retry_policy=RetryPolicy(base_delay=0, jitter="none"),
+        )
+
+        with self.assertWarns(UserWarning):
+            self.assertEqual({"url": "b"}, client._request("/get"))
+        self.assertEqual({"url": "b"}, client._request("/get"))
+        self.assertEqual({"url": "b"}, client._request("/get"))
+
+        self.assertEqual(4, len(responses.calls))
+        self.assertEqual(["https://a.org"], client.load_balancer.ejected)
+
+    def test_router(self):
+        router = OSRM(URLS)
+        self.assertEqual(URLS, router.client.load_balancer.base_urls)
+        self.assertIsNone(OSRM().client.load_balancer)
@@ -16,7 +16,10 @@
 #
 """Tests for client module."""
 
+import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import responses
@@ -187,3 +190,67 @@ class BaseTest(_test.TestCase):
 
         assert isinstance(self.client.req, requests.PreparedRequest)
         self.assertEqual("https://httpbin.org/routes?a=b", self.client.req.url)
+
+    def test_pool_size(self):
+        client = ClientMock("https://httpbin.org", pool_connections=2, pool_maxsize=32)
+        adapter = client._session.get_adapter("https://httpbin.org")
+
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertNotIn("pool_maxsize", client.kwargs)
+
+    @responses.activate
+    def test_concurrent_requests(self):
+        # POST bodies must not leak into concurrent GET requests
+        responses.add(responses.GET, "https://httpbin.org/get", json={}, status=200)
+        responses.add(responses.POST, "https://httpbin.org/post", json={}, status=200)
+        reqs = {}
+
+        def request(idx):
+            if idx % 2:
+                self.client.directions(url="post", post_params={"idx": idx})
+            else:
+                self.client.directions(url="get", get_params={"idx": idx})
+            # req is tracked per thread
+            reqs[idx] = self.client.req
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(request, range(100)))
+
+        self.assertEqual(100, len(responses.calls))
+        for call in responses.calls:
+            if call.request.method == "GET":
+                self.assertIsNone(call.request.body)
+            else:
+                self.assertEqual(1, json.loads(call.request.body)["idx"] % 2)
+        self.assertNotIn("json", self.client.kwargs)
+        for idx, req in reqs.items():
+            self.assertIn(str(idx), req.url if req.method == "GET" else req.body.decode())
+
+    @responses.activate
+    def test_coalesce(self):
+        def _callback(request):
+            time.sleep(0.2)
+            return 200, {}, json.dumps({"url": request.url})
+
+        responses.add_callback(responses.GET, "https://httpbin.org/get", callback=_callback)
+        client = ClientMock("https://httpbin.org", coalesce=True)
+        barrier = threading.Barrier(8)
+
+        def request(idx):
+            barrier.wait()
+            return client.directions(url="/get", get_params={"a": idx % 2})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(executor.map(request, range(8)))
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(6, client.coalesced_requests)
+        self.assertEqual(bodies[0], bodies[2])
+        self.assertIsNot(bodies[0], bodies[2])
+        self.assertNotEqual(bodies[0], bodies[1])
+        self.assertEqual({}, client._flights)
+
+        # Requests which don't overlap aren't coalesced
+        client.directions(url="/get", get_params={"a": 0})
+        self.assertEqual(3, len(responses.calls))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the cache module."""
+
+import os
+import tempfile
+import time
+from copy import deepcopy
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.cache import LRUCache, SQLiteCache, cache_key
+from routingpy.direction import Direction
+from tests.test_helper import *
+
+
+class CacheKeyTest(_test.TestCase):
+    def test_normalized(self):
+        self.assertEqual(
+            cache_key("get", "https://foo.bar/route", {"a": 1, "b": "x"}),
+            cache_key("GET", "https://foo.bar/route", [("b", "x"), ("a", "1")]),
+        )
+        self.assertEqual(
+            cache_key("POST", "https://foo.bar/route", post_params={"a": [1, 2], "b": {"c": 1, "d": 2}}),
+            cache_key("POST", "https://foo.bar/route", post_params={"b": {"d": 2, "c": 1}, "a": [1, 2]}),
+        )
+        self.assertNotEqual(
+            cache_key("GET", "https://foo.bar/route", {"a": 1}),
+            cache_key("GET", "https://foo.bar/route", {"a": 2}),
+        )
+        self.assertNotEqual(
+            cache_key("GET", "https://foo.bar/route"), cache_key("POST", "https://foo.bar/route")
+        )
+
+
+class LRUCacheTest(_test.TestCase):
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        self.assertEqual(b"1", cache.get("a"))
+
+        cache.set("c", b"3")
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"1", cache.get("a"))
+        self.assertEqual(b"3", cache.get("c"))
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.1)
+        cache.set("a", b"1")
+        self.assertEqual(b"1", cache.get("a"))
+
+        time.sleep(0.15)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+
+
+class SQLiteCacheTest(_test.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_persistent(self):
+        cache = SQLiteCache(self.path)
+        cache.set("a", b'{"routes": []}')
+        cache.set("a", b'{"routes": [1]}')
+        self.assertEqual(b'{"routes": [1]}', cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        cache.close()
+
+        # e.g. another process or a restart
+        other = SQLiteCache(self.path)
+        self.assertEqual(1, len(other))
+        self.assertEqual(b'{"routes": [1]}', other.get("a"))
+        self.assertEqual("wal", other._connection().execute("PRAGMA journal_mode").fetchone()[0])
+
+        other.clear()
+        self.assertIsNone(cache.get("a"))
+
+    def test_size_eviction(self):
+        cache = SQLiteCache(self.path, max_bytes=250, compress_level=0)
+        for key in "abc":
+            cache.set(key, os.urandom(100))
+            time.sleep(0.01)
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("a"))
+
+        # reading "b" makes "c" the least recently used entry
+        self.assertIsNotNone(cache.get("b"))
+        time.sleep(0.01)
+        cache.set("d", os.urandom(100))
+        self.assertIsNone(cache.get("c"))
+        self.assertIsNotNone(cache.get("b"))
+
+    def test_ttl(self):
+        cache = SQLiteCache(self.path, ttl=0.1)
+        cache.set("a", b"1")
+        self.assertEqual(b"1", cache.get("a"))
+
+        time.sleep(0.15)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+
+    @responses.activate
+    def test_valhalla_matrix_cached(self):
+        query = ENDPOINTS_QUERIES["valhalla"]["matrix"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/sources_to_targets",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["matrix"],
+            content_type="application/json",
+        )
+
+        first = Valhalla("https://api.mapbox.com/valhalla/v1", cache=SQLiteCache(self.path)).matrix(
+            **query
+        )
+        # a new router, e.g. in the nightly re-run of a job
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", cache=SQLiteCache(self.path))
+        second = router.matrix(**query)
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(1, router.client.cache_hits)
+        self.assertEqual(first.durations, second.durations)
+
+
+class ClientCacheTest(_test.TestCase):
+    @responses.activate
+    def test_osrm_directions_cached(self):
+        query = deepcopy(ENDPOINTS_QUERIES["osrm"]["directions"])
+        query["alternatives"] = False
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/route/v1/driving/"
+            "8.688641,49.420577;8.680916,49.415776;8.780916,49.445776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+            content_type="application/json",
+        )
+        router = OSRM(cache=LRUCache())
+
+        first = router.directions(**query)
+        second = router.directions(**query)
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual((1, 1), (router.client.cache_hits, router.client.cache_misses))
+        self.assertIsInstance(second, Direction)
+        self.assertEqual(first.raw, second.raw)
+        self.assertIsNot(first.raw, second.raw)
+
+        query["radiuses"] = [100, 100, 100]
+        router.directions(**query)
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual((1, 2), (router.client.cache_hits, router.client.cache_misses))
+
+    @responses.activate
+    def test_errors_not_cached(self):
+        query = ENDPOINTS_QUERIES["valhalla"]["matrix"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/sources_to_targets",
+            status=400,
+            json={"error": "no route"},
+            content_type="application/json",
+        )
+        cache = LRUCache()
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", cache=cache)
+
+        for _ in range(2):
+            with self.assertRaises(routingpy.exceptions.RouterApiError):
+                router.matrix(**query)
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(0, len(cache))
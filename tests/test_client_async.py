@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the asynchronous client module."""
+
+import asyncio
+import json
+import time
+import unittest
+from copy import deepcopy
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, HereMaps, Valhalla
+from routingpy.client_base import options
+from routingpy.direction import Direction
+from routingpy.matrix import Matrix
+from tests.test_helper import *
+
+try:
+    import httpx
+
+    from routingpy.client_async import AsyncClient
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _transport(status, body, calls):
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncClientTest(_test.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.params = {"c": "d", "a": "b", "1": "2"}
+        # other tests set bogus default proxies
+        self._default_proxies = options.default_proxies
+        options.default_proxies = None
+
+    def tearDown(self):
+        options.default_proxies = self._default_proxies
+
+    def _client(self, status=200, body=None, **kwargs):
+        return AsyncClient(
+            "https://httpbin.org", transport=_transport(status, body or {}, self.calls), **kwargs
+        )
+
+    def test_osrm_directions(self):
+        query = deepcopy(ENDPOINTS_QUERIES["osrm"]["directions"])
+        query["alternatives"] = False
+        router = OSRM(
+            client=AsyncClient,
+            transport=_transport(200, ENDPOINTS_RESPONSES["osrm"]["directions_geojson"], self.calls),
+        )
+
+        route = asyncio.run(router.directions(**query))
+
+        self.assertEqual(1, len(self.calls))
+        self.assertIsInstance(route, Direction)
+        self.assertIsInstance(route.geometry, list)
+        self.assertIsInstance(route.duration, int)
+
+    def test_valhalla_matrix_post(self):
+        query = ENDPOINTS_QUERIES["valhalla"]["matrix"]
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            client=AsyncClient,
+            transport=_transport(200, ENDPOINTS_RESPONSES["valhalla"]["matrix"], self.calls),
+        )
+
+        matrix = asyncio.run(router.matrix(**query))
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual("POST", self.calls[0].method)
+        self.assertEqual(json.loads(self.calls[0].content), ENDPOINTS_EXPECTED["valhalla"]["matrix"])
+        self.assertIsInstance(matrix, Matrix)
+
+    def test_heremaps_hosts(self):
+        def handler(request):
+            self.calls.append(request)
+            endpoint = "matrix" if request.url.host.startswith("matrix.") else "directions"
+            return httpx.Response(200, json=ENDPOINTS_RESPONSES["heremaps"][endpoint])
+
+        router = HereMaps(
+            api_key="sample_api_key", client=AsyncClient, transport=httpx.MockTransport(handler)
+        )
+
+        async def gather():
+            directions = router.directions(**ENDPOINTS_QUERIES["heremaps"]["directions"])
+            matrix = router.matrix(**ENDPOINTS_QUERIES["heremaps"]["matrix"])
+            return await asyncio.gather(directions, matrix)
+
+        route, matrix = asyncio.run(gather())
+
+        self.assertEqual(
+            {
+                "https://route.ls.hereapi.com/routing/7.2/calculateroute.json",
+                "https://matrix.route.ls.hereapi.com/routing/7.2/calculatematrix.json",
+            },
+            {str(request.url).split("?")[0] for request in self.calls},
+        )
+        self.assertIsInstance(matrix, Matrix)
+
+    def test_concurrent_requests(self):
+        client = self._client(body=self.params)
+
+        async def gather():
+            return await asyncio.gather(*[client._request("/get") for _ in range(5)])
+
+        results = asyncio.run(gather())
+        self.assertEqual(5, len(self.calls))
+        self.assertEqual([self.params] * 5, results)
+
+    def test_directions_batch(self):
+        def handler(request):
+            self.calls.append(request)
+            if "8.780916" in str(request.url):
+                return httpx.Response(400, json={})
+            return httpx.Response(200, json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"])
+
+        router = OSRM(client=AsyncClient, transport=httpx.MockTransport(handler))
+        locations_list = [
+            [[8.688641, 49.420577], [8.680916, 49.415776]],
+            [[8.680916, 49.415776], [8.780916, 49.445776]],
+            [[8.680916, 49.415776], [8.688641, 49.420577]],
+        ]
+
+        routes = asyncio.run(
+            router.directions_batch(locations_list, max_workers=2, geometries="geojson")
+        )
+
+        self.assertEqual(3, len(self.calls))
+        self.assertIsInstance(routes[0], Direction)
+        self.assertIsInstance(routes[1], routingpy.exceptions.RouterApiError)
+        self.assertIsInstance(routes[2], Direction)
+
+    def test_skip_api_error(self):
+        client = self._client(status=400, skip_api_error=False)
+        with self.assertRaises(routingpy.exceptions.RouterApiError):
+            asyncio.run(client._request("/post", post_params=self.params))
+
+        client = self._client(status=400, skip_api_error=True)
+        self.assertIsNone(asyncio.run(client._request("/post", post_params=self.params)))
+
+    def test_raise_over_query_limit(self):
+        client = self._client(status=429, retry_over_query_limit=False)
+        with self.assertRaises(routingpy.exceptions.OverQueryLimit):
+            asyncio.run(client._request("/post", post_params=self.params))
+        self.assertEqual(1, len(self.calls))
+
+    def test_raise_timeout_retriable_requests(self):
+        retry_timeout = 3
+        client = self._client(status=503, retry_timeout=retry_timeout)
+
+        async def request_and_tick():
+            # The event loop has to keep running other tasks while the client backs off
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(time.time())
+                    await asyncio.sleep(0.1)
+
+            task = asyncio.ensure_future(ticker())
+            with self.assertRaises(routingpy.exceptions.Timeout):
+                await client._request("/post", post_params=self.params)
+            task.cancel()
+            return ticks
+
+        start = time.time()
+        ticks = asyncio.run(request_and_tick())
+        end = time.time()
+        self.assertTrue(retry_timeout < end - start < 2 * retry_timeout)
+        self.assertGreater(len(self.calls), 1)
+        self.assertGreater(len(ticks), 10 * retry_timeout - 5)
+
+    def test_valhalla_expansion_stream(self):
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            client=AsyncClient,
+            transport=_transport(200, ENDPOINTS_RESPONSES["valhalla"]["expansion"], self.calls),
+        )
+
+        with self.assertRaises(ValueError):
+            router.expansion(**ENDPOINTS_QUERIES["valhalla"]["expansion"], stream=True)
+        self.assertEqual(0, len(self.calls))
+
+    def test_dry_run(self):
+        client = self._client()
+
+        asyncio.run(client._request("/directions", get_params={"a": "b"}, dry_run="true"))
+
+        self.assertEqual(0, len(self.calls))
+
+    def test_coalesce(self):
+        client = self._client(body={"a": "b"}, coalesce=True)
+
+        async def requests():
+            tasks = [client._request("/get", get_params={"a": "b"}) for _ in range(5)]
+            # A cancelled caller doesn't cancel the shared request
+            cancelled = asyncio.ensure_future(client._request("/get", get_params={"a": "b"}))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await asyncio.gather(*tasks)
+
+        bodies = asyncio.run(requests())
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(5, client.coalesced_requests)
+        self.assertEqual([{"a": "b"}] * 5, bodies)
+        self.assertEqual(5, len(set(map(id, bodies))))
+        self.assertEqual({}, client._flights)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the codec module."""
+
+import contextlib
+import io
+import json
+import unittest
+
+import responses
+
+import tests as _test
+from routingpy import Valhalla, codec
+from routingpy.client_base import options
+from routingpy.exceptions import JSONParseError
+from routingpy.retry import RetryPolicy
+from tests.test_helper import *
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+VALHALLA_MATRIX_URL = "https://api.mapbox.com/valhalla/v1/sources_to_targets"
+
+
+class CountingCodec(object):
+    def __init__(self):
+        self.dumped = 0
+        self.loaded = 0
+
+    def loads(self, content):
+        self.loaded += 1
+        return json.loads(content)
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return json.dumps(obj, separators=(",", ":"))
+
+
+class CodecTest(_test.TestCase):
+    def test_json_codec(self):
+        json_codec = codec.as_codec(json)
+
+        self.assertEqual(b'{"a": [1, 2]}', json_codec.encode({"a": (1, 2)}))
+        self.assertEqual({"a": [1, 2]}, json_codec.decode(b'{"a": [1, 2]}'))
+        self.assertIs(json_codec, codec.as_codec(json_codec))
+
+    @unittest.skipIf(codec.orjson is None, "orjson is not installed")
+    def test_default_orjson(self):
+        default = codec.default_codec()
+
+        self.assertIs(codec.orjson.loads, default.loads)
+        self.assertEqual(b'{"a":[1,2]}', default.encode({"a": (1, 2)}))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_default_numpy(self):
+        encoded = codec.default_codec().encode({"lon": np.float64(8.5)})
+
+        self.assertEqual({"lon": 8.5}, json.loads(encoded))
+
+    @responses.activate
+    def test_client_codec(self):
+        counting = CountingCodec()
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            codec=counting,
+            retry_policy=RetryPolicy(base_delay=0, jitter="none"),
+        )
+        responses.add(responses.POST, VALHALLA_MATRIX_URL, status=503, json={})
+        responses.add(
+            responses.POST,
+            VALHALLA_MATRIX_URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["matrix"],
+        )
+
+        with self.assertWarns(UserWarning):
+            router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+        # Encoded once for both attempts
+        self.assertEqual(1, counting.dumped)
+        self.assertEqual(1, counting.loaded)
+        self.assertEqual(responses.calls[0].request.body, responses.calls[1].request.body)
+        self.assertNotIn(b" ", responses.calls[1].request.body)
+        self.assertEqual("application/json", responses.calls[1].request.headers["Content-Type"])
+
+    @responses.activate
+    def test_invalid_json(self):
+        responses.add(responses.POST, VALHALLA_MATRIX_URL, status=200, body="<html>")
+        router = Valhalla("https://api.mapbox.com/valhalla/v1")
+
+        with self.assertRaises(JSONParseError):
+            router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+    def test_default_codec_option(self):
+        default_codec = options.default_codec
+        try:
+            options.default_codec = json
+            self.assertIs(json.dumps, Valhalla("https://valhalla.org").client.codec.dumps)
+        finally:
+            options.default_codec = default_codec
+
+    @responses.activate
+    def test_dry_run(self):
+        counting = CountingCodec()
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", codec=counting)
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout):
+            router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"], dry_run=True)
+
+        self.assertEqual(0, len(responses.calls))
+        self.assertEqual(1, counting.dumped)
+        printed = stdout.getvalue()
+        self.assertIn(VALHALLA_MATRIX_URL, printed)
+        self.assertEqual(
+            ENDPOINTS_EXPECTED["valhalla"]["matrix"], json.loads(printed.split("Body:\n")[1])
+        )
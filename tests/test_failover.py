@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the failover router."""
+
+import asyncio
+import re
+import time
+import unittest
+
+import responses
+
+import tests as _test
+from routingpy import OSRM, Failover
+from routingpy.client_base import options
+from routingpy.direction import Direction
+from routingpy.exceptions import RouterApiError, RouterServerError, RouterUnavailable
+from routingpy.retry import RetryPolicy
+from routingpy.routers.failover import CircuitBreaker
+from tests.test_helper import *
+
+try:
+    import httpx
+
+    from routingpy.client_async import AsyncClient
+except ImportError:  # pragma: no cover
+    httpx = None
+
+LOCATIONS = [[8.688641, 49.420577], [8.680916, 49.415776]]
+
+
+class CircuitBreakerTest(_test.TestCase):
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker(error_threshold=0.5, min_calls=4, window=4)
+        for success in (True, False, True):
+            breaker.record(success)
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+        breaker.record(False)
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        self.assertFalse(breaker.allow())
+
+    def test_slow_calls_fail(self):
+        breaker = CircuitBreaker(min_calls=2, latency_threshold=1)
+        breaker.record(True, latency=0.5)
+        breaker.record(True, latency=1.5)
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=0.05)
+        breaker.record(False)
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow())
+        # only a single trial call
+        self.assertFalse(breaker.allow())
+
+        breaker.record(False)
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_trial_expires(self):
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=0.05)
+        breaker.record(False)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        # the trial never reported back
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+
+        breaker.release()
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow())
+
+
+class FailoverTest(_test.TestCase):
+    def setUp(self):
+        policy = RetryPolicy(max_attempts=1)
+        self.primary = OSRM("https://primary.org", retry_policy=policy)
+        self.backup = OSRM("https://backup.org", retry_policy=policy)
+        self.router = Failover(
+            [self.primary, (self.backup, {"profile": "bike"})], min_calls=2, reset_timeout=0.1
+        )
+
+    def _add(self, host, status, body=None):
+        responses.add(
+            responses.GET,
+            re.compile(r"https://{}/route/v1/.*".format(host)),
+            status=status,
+            json=body or ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+        )
+
+    @responses.activate
+    def test_failover(self):
+        self._add("primary.org", 503, {})
+        self._add("backup.org", 200)
+
+        for _ in range(3):
+            route = self.router.directions(LOCATIONS, profile="driving", geometries="geojson")
+            self.assertIsInstance(route, Direction)
+
+        # the third request skips the open primary
+        self.assertEqual(5, len(responses.calls))
+        self.assertIn("/route/v1/bike/", responses.calls[1].request.url)
+        self.assertEqual(CircuitBreaker.OPEN, self.router.breakers[0].state)
+        self.assertEqual(CircuitBreaker.CLOSED, self.router.breakers[1].state)
+
+    @responses.activate
+    def test_recovery(self):
+        self._add("primary.org", 503, {})
+        self._add("backup.org", 200)
+        for _ in range(2):
+            self.router.directions(LOCATIONS, profile="driving", geometries="geojson")
+        self.assertEqual(CircuitBreaker.OPEN, self.router.breakers[0].state)
+
+        responses.reset()
+        self._add("primary.org", 200)
+        time.sleep(0.11)
+        self.router.directions(LOCATIONS, profile="driving", geometries="geojson")
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(CircuitBreaker.CLOSED, self.router.breakers[0].state)
+
+    @responses.activate
+    def test_api_error_does_not_fail_over(self):
+        self._add("primary.org", 400, {"code": "NoRoute"})
+        self._add("backup.org", 200)
+
+        with self.assertRaises(RouterApiError):
+            self.router.directions(LOCATIONS, profile="driving", geometries="geojson")
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(CircuitBreaker.CLOSED, self.router.breakers[0].state)
+
+    @responses.activate
+    def test_unavailable(self):
+        self._add("primary.org", 503, {})
+        self._add("backup.org", 503, {})
+
+        with self.assertRaises(RouterUnavailable) as e:
+            self.router.directions(LOCATIONS, profile="driving", geometries="geojson")
+        self.assertEqual(2, len(e.exception.errors))
+        self.assertIsInstance(e.exception.errors[0], RouterServerError)
+
+    def test_unsupported_method(self):
+        for _ in range(3):
+            with self.assertRaises(RouterUnavailable) as e:
+                self.router.isochrones(LOCATIONS, profile="driving", intervals=[60])
+            self.assertIsInstance(e.exception.errors[0], TypeError)
+
+        self.assertEqual(
+            [CircuitBreaker.CLOSED, CircuitBreaker.CLOSED], [b.state for b in self.router.breakers]
+        )
+
+    def test_invalid_routers(self):
+        with self.assertRaises(ValueError):
+            Failover([])
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncFailoverTest(_test.TestCase):
+    def setUp(self):
+        # other tests set bogus default proxies
+        self._default_proxies = options.default_proxies
+        options.default_proxies = None
+
+    def tearDown(self):
+        options.default_proxies = self._default_proxies
+
+    def test_failover(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if request.url.host == "primary.org":
+                return httpx.Response(503, json={})
+            return httpx.Response(200, json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"])
+
+        routers = [
+            OSRM(
+                "https://{}".format(host),
+                client=AsyncClient,
+                retry_policy=RetryPolicy(max_attempts=1),
+                transport=httpx.MockTransport(handler),
+            )
+            for host in ("primary.org", "backup.org")
+        ]
+        router = Failover(routers)
+
+        route = asyncio.run(router.directions(LOCATIONS, profile="driving", geometries="geojson"))
+
+        self.assertIsInstance(route, Direction)
+        self.assertEqual(["primary.org", "backup.org"], [call.url.host for call in calls])
+
+        with self.assertRaises(ValueError):
+            Failover([routers[0], OSRM()])
+
+    def test_cancelled_trial(self):
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"])
+
+        osrm = OSRM(
+            "https://primary.org",
+            client=AsyncClient,
+            retry_policy=RetryPolicy(max_attempts=1),
+            transport=httpx.MockTransport(handler),
+        )
+        router = Failover([osrm], min_calls=1, reset_timeout=0.05)
+        breaker = router.breakers[0]
+        breaker.record(False)
+        time.sleep(0.06)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(
+                asyncio.wait_for(
+                    router.directions(LOCATIONS, profile="driving", geometries="geojson"), 0.05
+                )
+            )
+
+        # the cancelled trial counts as failed instead of blocking the breaker
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
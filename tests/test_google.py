@@ -16,6 +16,8 @@
 #
 """Tests for the Google module."""
 
+import gc
+import weakref
 from copy import deepcopy
 
 import responses
@@ -144,6 +146,37 @@ class GoogleTest(_test.TestCase):
         with self.assertRaises(TypeError):
             self.client.directions(**query)
 
+    def test_parse_lazy(self):
+        for alternatives in (True, False):
+            response = ENDPOINTS_RESPONSES[self.name]["directions"]
+            eager = self.client.parse_direction_json(response, alternatives)
+            lazy = self.client.parse_direction_json(response, alternatives, lazy=True)
+            for expected, route in zip(eager, lazy) if alternatives else [(eager, lazy)]:
+                self.assertTrue(callable(route._geometry))
+                self.assertEqual(
+                    (expected.duration, expected.distance), (route.duration, route.distance)
+                )
+                self.assertEqual(expected.geometry, route.geometry)
+
+        response = ENDPOINTS_RESPONSES[self.name]["matrix"]
+        eager = self.client.parse_matrix_json(response)
+        lazy = self.client.parse_matrix_json(response, lazy=True)
+        self.assertEqual(eager.durations, lazy.durations)
+        self.assertEqual(eager.distances, lazy.distances)
+
+    def test_parse_lazy_drops_response(self):
+        response = _test.Response(deepcopy(ENDPOINTS_RESPONSES[self.name]["matrix"]))
+        released = weakref.ref(response)
+        matrix = self.client.client._parse(
+            self.client.parse_matrix_json, response, lazy=True, keep_raw=False
+        )
+        del response
+        gc.collect()
+
+        self.assertIsNone(released())
+        expected = self.client.parse_matrix_json(ENDPOINTS_RESPONSES[self.name]["matrix"])
+        self.assertEqual((expected.durations, expected.distances), (matrix.durations, matrix.distances))
+
     @responses.activate
     def test_full_matrix(self):
         query = ENDPOINTS_QUERIES[self.name]["matrix"]
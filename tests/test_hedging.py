@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for hedged requests."""
+
+import asyncio
+import json
+import time
+import unittest
+
+import responses
+
+import tests as _test
+from routingpy.client_base import options
+from routingpy.client_default import Client
+from routingpy.hedging import HedgePolicy
+
+try:
+    import httpx
+
+    from routingpy.client_async import AsyncClient
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class HedgePolicyTest(_test.TestCase):
+    def test_delay(self):
+        self.assertEqual(0.3, HedgePolicy(delay=0.3).delay())
+
+        policy = HedgePolicy(percentile=90, initial_delay=2, min_samples=10)
+        for latency in range(1, 10):
+            policy.observe(latency / 10)
+        self.assertEqual(2, policy.delay())
+
+        policy.observe(1)
+        self.assertEqual(0.9, policy.delay())
+
+        with self.assertRaises(ValueError):
+            HedgePolicy(max_hedges=0)
+
+    def test_base_url(self):
+        policy = HedgePolicy(base_urls=["https://b.org", "https://c.org"], max_hedges=3)
+        self.assertEqual(
+            ["https://a.org", "https://b.org", "https://c.org", "https://b.org"],
+            [policy.base_url("https://a.org", hedge) for hedge in range(4)],
+        )
+        self.assertEqual("https://a.org", HedgePolicy().base_url("https://a.org", 1))
+
+    def test_record(self):
+        policy = HedgePolicy()
+        self.assertIsNone(policy.win_rate)
+
+        policy.record(0, 0)
+        policy.record(1, 0)
+        policy.record(1, 1)
+        self.assertEqual((3, 2, 1), (policy.requests, policy.hedges, policy.hedge_wins))
+        self.assertEqual(0.5, policy.win_rate)
+
+
+class ClientHedgingTest(_test.TestCase):
+    def _add(self, host, latency, body):
+        def _callback(request):
+            time.sleep(latency)
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(responses.GET, "https://{}/get".format(host), callback=_callback)
+
+    @responses.activate
+    def test_hedge_wins(self):
+        self._add("slow.org", 0.5, {"server": "slow"})
+        self._add("fast.org", 0, {"server": "fast"})
+        policy = HedgePolicy(delay=0.05, base_urls=["https://fast.org"])
+        client = Client("https://slow.org", hedge_policy=policy)
+
+        start = time.time()
+        self.assertEqual({"server": "fast"}, client._request("/get"))
+
+        self.assertTrue(time.time() - start < 0.4)
+        self.assertEqual((1, 1, 1), (policy.requests, policy.hedges, policy.hedge_wins))
+        self.assertEqual("https://fast.org/get", client.req.url)
+
+        # the slow request finishes in the background
+        client._hedge_executor.shutdown(wait=True)
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_close(self):
+        self._add("fast.org", 0, {"server": "fast"})
+
+        with Client("https://fast.org", hedge_policy=HedgePolicy(delay=1)) as client:
+            self.assertEqual({"server": "fast"}, client._request("/get"))
+
+        with self.assertRaises(RuntimeError):
+            client._hedge_executor.submit(print)
+        Client("https://fast.org").close()
+
+    @responses.activate
+    def test_no_hedge_when_fast(self):
+        self._add("fast.org", 0, {"server": "fast"})
+        policy = HedgePolicy(delay=1, base_urls=["https://slow.org"])
+        client = Client("https://fast.org", hedge_policy=policy)
+
+        for _ in range(3):
+            self.assertEqual({"server": "fast"}, client._request("/get"))
+
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual((3, 0, None), (policy.requests, policy.hedges, policy.win_rate))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncClientHedgingTest(_test.TestCase):
+    def setUp(self):
+        # other tests set bogus default proxies
+        self._default_proxies = options.default_proxies
+        options.default_proxies = None
+
+    def tearDown(self):
+        options.default_proxies = self._default_proxies
+
+    def test_hedge_wins_and_cancels(self):
+        cancelled = []
+
+        async def handler(request):
+            if request.url.host == "slow.org":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(request)
+                    raise
+            return httpx.Response(200, json={"server": request.url.host})
+
+        policy = HedgePolicy(delay=0.05, base_urls=["https://fast.org"])
+        client = AsyncClient(
+            "https://slow.org", hedge_policy=policy, transport=httpx.MockTransport(handler)
+        )
+
+        self.assertEqual({"server": "fast.org"}, asyncio.run(client._request("/get")))
+        self.assertEqual(1, len(cancelled))
+        self.assertEqual((1, 1), (policy.hedges, policy.hedge_wins))
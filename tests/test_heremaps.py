@@ -16,6 +16,7 @@
 #
 """Tests for the HereMaps module."""
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 import responses
@@ -174,6 +175,32 @@ class HereMapsTest(_test.TestCase):
             self.assertIsInstance(iso.center, list)
             self.assertIsInstance(iso.interval, int)
 
+    @responses.activate
+    def test_threads(self):
+        urls = {
+            "directions": "https://route.api.here.com/routing/7.2/calculateroute.json",
+            "isochrones": "https://isoline.route.api.here.com/routing/7.2/calculateisoline.json",
+        }
+        for endpoint, url in urls.items():
+            responses.add(
+                responses.GET,
+                url,
+                status=200,
+                json=ENDPOINTS_RESPONSES[self.name][endpoint],
+                content_type="application/json",
+            )
+
+        def _request(endpoint):
+            getattr(self.client, endpoint)(**ENDPOINTS_QUERIES[self.name][endpoint])
+            return self.client.client.req.url.split("?")[0]
+
+        endpoints = ["directions", "isochrones"] * 20
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            requested = list(executor.map(_request, endpoints))
+
+        self.assertEqual([urls[endpoint] for endpoint in endpoints], requested)
+        self.assertEqual("", self.client.client.base_url)
+
     @responses.activate
     def test_full_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the hooks module."""
+
+import asyncio
+import json
+import time
+import unittest
+
+import responses
+
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.client_base import options
+from routingpy.exceptions import RouterApiError
+from routingpy.hooks import Histogram, LatencyCollector
+from routingpy.retry import RetryPolicy
+from tests.test_helper import *
+
+try:
+    import httpx
+
+    from routingpy.client_async import AsyncClient
+except ImportError:  # pragma: no cover
+    httpx = None
+
+VALHALLA_MATRIX_URL = "https://api.mapbox.com/valhalla/v1/sources_to_targets"
+
+
+class HistogramTest(_test.TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1, float("inf")))
+        for value in (0.05, 0.1, 0.5, 5):
+            histogram.observe(value)
+
+        self.assertEqual([(0.1, 2), (1, 3), (float("inf"), 4)], histogram.cumulative())
+        self.assertEqual((4, 5.65), (histogram.count, round(histogram.sum, 2)))
+        self.assertEqual(0.1, histogram.quantile(0.5))
+        self.assertEqual(float("inf"), histogram.quantile(0.99))
+        self.assertIsNone(Histogram().quantile(0.5))
+
+
+class HooksTest(_test.TestCase):
+    def setUp(self):
+        self.events = []
+        self.router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            hooks=[self.events.append],
+            retry_policy=RetryPolicy(base_delay=0, jitter="none"),
+        )
+
+    @responses.activate
+    def test_events(self):
+        responses.add(responses.POST, VALHALLA_MATRIX_URL, status=503, json={})
+        responses.add(
+            responses.POST,
+            VALHALLA_MATRIX_URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["matrix"],
+        )
+
+        with self.assertWarns(UserWarning):
+            self.router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+        self.assertEqual(
+            ["request", "response", "retry", "request", "response", "parse"],
+            [event.type for event in self.events],
+        )
+        self.assertEqual({"Valhalla"}, {event.router for event in self.events})
+        self.assertEqual({"/sources_to_targets"}, {event.endpoint for event in self.events})
+        self.assertEqual([1, 1, 1, 2, 2, None], [event.attempt for event in self.events])
+
+        response = self.events[4]
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(len(responses.calls[1].request.body), response.bytes_sent)
+        self.assertEqual(len(responses.calls[1].response.content), response.bytes_received)
+        self.assertEqual({"network", "decode"}, set(response.timings))
+        self.assertEqual(503, self.events[1].status_code)
+        self.assertEqual(0, self.events[2].timings["delay"])
+        self.assertIn("parse", self.events[5].timings)
+        self.assertEqual({"prepare"}, set(self.events[0].timings))
+        self.assertEqual({}, self.events[3].timings)
+
+    @responses.activate
+    def test_prepare_timing(self):
+        class SlowCodec(object):
+            loads = staticmethod(json.loads)
+
+            @staticmethod
+            def dumps(obj):
+                time.sleep(0.05)
+                return json.dumps(obj)
+
+        responses.add(
+            responses.POST,
+            VALHALLA_MATRIX_URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["matrix"],
+        )
+        collector = LatencyCollector()
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", hooks=[collector], codec=SlowCodec)
+
+        router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+        prepare = collector.histogram("Valhalla", "/sources_to_targets", "prepare")
+        self.assertEqual(1, prepare.count)
+        self.assertGreaterEqual(prepare.sum, 0.05)
+
+    @responses.activate
+    def test_error(self):
+        responses.add(responses.POST, VALHALLA_MATRIX_URL, status=400, json={"error": "no route"})
+
+        with self.assertRaises(RouterApiError):
+            self.router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+        self.assertEqual(["request", "response", "error"], [event.type for event in self.events])
+        self.assertIsInstance(self.events[-1].error, RouterApiError)
+
+    @responses.activate
+    def test_endpoint_without_locations(self):
+        query = dict(ENDPOINTS_QUERIES["osrm"]["directions"], alternatives=False)
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/route/v1/driving/"
+            "8.688641,49.420577;8.680916,49.415776;8.780916,49.445776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+        )
+        collector = LatencyCollector()
+        router = OSRM(hooks=[collector])
+
+        router.directions(**query)
+
+        self.assertEqual(
+            {
+                ("OSRM", "/route/v1/driving/{locations}", phase)
+                for phase in ("prepare", "network", "decode", "parse")
+            },
+            set(collector.snapshot()),
+        )
+        self.assertEqual(1, collector.histogram("OSRM", "/route/v1/driving/{locations}", "parse").count)
+        self.assertIsNone(collector.histogram("OSRM", "/table"))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncHooksTest(_test.TestCase):
+    def setUp(self):
+        # other tests set bogus default proxies
+        self._default_proxies = options.default_proxies
+        options.default_proxies = None
+
+    def tearDown(self):
+        options.default_proxies = self._default_proxies
+
+    def test_events(self):
+        events = []
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            client=AsyncClient,
+            hooks=[events.append],
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=ENDPOINTS_RESPONSES["valhalla"]["matrix"])
+            ),
+        )
+
+        asyncio.run(router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"]))
+
+        self.assertEqual(["request", "response", "parse"], [event.type for event in events])
+        self.assertTrue(events[1].bytes_sent > 0)
+        self.assertIn("prepare", events[0].timings)
+        self.assertEqual({"/sources_to_targets"}, {event.endpoint for event in events})
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the limiters module."""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, limiters
+from routingpy.client_default import Client
+from routingpy.limiters import AIMDLimiter, FileTokenBucket, TokenBucket
+from tests.test_helper import *
+
+
+class TokenBucketTest(_test.TestCase):
+    def test_reserve(self):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(0.2, bucket.reserve(), places=2)
+
+        time.sleep(0.3)
+        self.assertLess(bucket.reserve(), 0.05)
+
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    @unittest.skipIf(limiters.fcntl is None, "fcntl is not available")
+    def test_file_bucket_shared(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bucket")
+            # e.g. in two processes
+            first = FileTokenBucket(path, rate=10, burst=2)
+            second = FileTokenBucket(path, rate=10, burst=2)
+
+            self.assertEqual(0, first.reserve())
+            self.assertEqual(0, second.reserve())
+            self.assertAlmostEqual(0.1, first.reserve(), places=2)
+            self.assertAlmostEqual(0.2, second.reserve(), places=2)
+
+    @responses.activate
+    def test_routers_share_limiter(self):
+        query = ENDPOINTS_QUERIES["osrm"]["matrix"]
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/walking/"
+            "8.688641,49.420577;8.680916,49.415776;8.780916,49.445776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        limiter = TokenBucket(rate=20, burst=2)
+        routers = [OSRM(rate_limiter=limiter), OSRM(rate_limiter=limiter)]
+
+        start = time.time()
+        for idx in range(6):
+            routers[idx % 2].matrix(**query)
+
+        self.assertEqual(6, len(responses.calls))
+        # 2 requests of the burst, then 20 per second
+        self.assertGreaterEqual(time.time() - start, 0.19)
+
+
+class AIMDLimiterTest(_test.TestCase):
+    def test_additive_increase(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=3, latency_tolerance=None)
+
+        # the limit grows while it's used
+        for _ in range(3):
+            tokens = [limiter.acquire(), limiter.acquire()]
+            for token in tokens:
+                limiter.release(token)
+        self.assertEqual(3, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+        for _ in range(20):
+            tokens = [limiter.acquire() for _ in range(3)]
+            for token in tokens:
+                limiter.release(token)
+        self.assertEqual(3, limiter.limit)
+
+    def test_no_increase_while_idle(self):
+        limiter = AIMDLimiter(initial_limit=8, latency_tolerance=None)
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+
+        self.assertEqual(8, limiter.limit)
+
+    def test_multiplicative_decrease(self):
+        limiter = AIMDLimiter(initial_limit=16, min_limit=2)
+        tokens = [limiter.acquire() for _ in range(10)]
+
+        # all requests of the same window fail, but the limit is only cut once
+        for token in tokens:
+            limiter.release(token, overloaded=True)
+        self.assertEqual(8, limiter.limit)
+
+        for _ in range(3):
+            limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(2, limiter.limit)
+
+        # interrupted requests only free their slot
+        limiter.release(limiter.acquire(), overloaded=True, measured=False)
+        self.assertEqual(2, limiter.limit)
+
+    def test_latency_spike(self):
+        limiter = AIMDLimiter(initial_limit=8, latency_tolerance=2)
+        for _ in range(5):
+            limiter.release(limiter.acquire())
+        self.assertIsNotNone(limiter.latency)
+
+        token = limiter.acquire()
+        time.sleep(max(0.01, 3 * limiter.latency))
+        limiter.release(token)
+        self.assertEqual(4, limiter.limit)
+
+    def test_blocking_acquire(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=2, latency_tolerance=None)
+        peak = []
+        lock = threading.Lock()
+
+        def request(_):
+            token = limiter.acquire()
+            with lock:
+                peak.append(limiter.in_flight)
+            time.sleep(0.01)
+            limiter.release(token)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(request, range(20)))
+
+        self.assertEqual(2, max(peak))
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_async_acquire(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=2, latency_tolerance=None)
+        peak = []
+
+        async def request():
+            token = await limiter.acquire_async()
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.01)
+            limiter.release(token)
+
+        async def main():
+            await asyncio.gather(*[request() for _ in range(10)])
+
+        asyncio.run(main())
+
+        self.assertEqual(2, max(peak))
+        self.assertEqual(0, limiter.in_flight)
+
+    @responses.activate
+    def test_client_overload(self):
+        responses.add(responses.GET, "https://httpbin.org/get", status=503, json={})
+        limiter = AIMDLimiter(initial_limit=8)
+        client = Client("https://httpbin.org", concurrency_limiter=limiter, retry_timeout=1)
+        client.retry_policy.max_attempts = 1
+
+        with self.assertRaises(routingpy.exceptions.RouterServerError):
+            client._request("/get")
+
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
@@ -16,16 +16,28 @@
 #
 """Tests for the Graphhopper module."""
 
+import json
+import re
+import unittest
 from copy import deepcopy
+from unittest import mock
+from urllib.parse import quote
 
 import responses
 
+import routingpy
 import tests as _test
-from routingpy import OSRM, convert
+from routingpy import OSRM, convert, utils
+from routingpy.client_base import options
 from routingpy.direction import Direction, Directions
 from routingpy.matrix import Matrix
 from tests.test_helper import *
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 
 class OSRMTest(_test.TestCase):
     name = "osrm"
@@ -62,6 +74,26 @@ class OSRMTest(_test.TestCase):
         self.assertIsInstance(routes.geometry, list)
         self.assertIsInstance(routes.raw, dict)
 
+    @responses.activate
+    def test_directions_encoded_locations(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["directions"])
+        query["alternatives"] = False
+        polyline = quote(utils.encode_polyline6(query["locations"]), safe="")
+
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/route/v1/{query['profile']}/polyline6({polyline})",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+            content_type="application/json",
+        )
+
+        routes = self.client.directions(**query, encode_locations=True)
+        self.assertEqual(1, len(responses.calls))
+        path = responses.calls[0].request.path_url.split("?")[0]
+        self.assertEqual(f"/routed-bike/route/v1/{query['profile']}/polyline6({polyline})", path)
+        self.assertIsInstance(routes, Direction)
+
     @responses.activate
     def test_full_directions_alternatives(self):
         query = ENDPOINTS_QUERIES[self.name]["directions"]
@@ -222,6 +254,109 @@ class OSRMTest(_test.TestCase):
             ],
         )
 
+    @responses.activate
+    def test_directions_keep_raw(self):
+        query = ENDPOINTS_QUERIES[self.name]["directions"]
+        coords = convert.delimit_list([convert.delimit_list(pair) for pair in query["locations"]], ";")
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/route/v1/{query['profile']}/{coords}",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+            content_type="application/json",
+        )
+
+        routes = self.client.directions(**query, keep_raw=False)
+        self.assertIsNone(routes.raw)
+        self.assertIsNone(routes[0].raw)
+        self.assertIsInstance(routes[0].geometry, list)
+
+        routes = OSRM(keep_raw=["routes", "duration"]).directions(**query)
+        self.assertEqual(["routes"], list(routes.raw))
+        # The keys only filter the top-level response
+        self.assertEqual(
+            ENDPOINTS_RESPONSES["osrm"]["directions_geojson"]["routes"], [r.raw for r in routes]
+        )
+
+        response = deepcopy(ENDPOINTS_RESPONSES["osrm"]["directions_geojson"])
+        response["code"] = "Ok"
+        response["routes"].append(deepcopy(response["routes"][0]))
+        responses.replace(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/route/v1/{query['profile']}/{coords}",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+        routes = self.client.directions(**query, keep_raw=["code"])
+        self.assertEqual({"code": "Ok"}, routes.raw)
+        self.assertEqual(response["routes"], [route.raw for route in routes])
+
+        default_keep_raw = options.default_keep_raw
+        try:
+            options.default_keep_raw = False
+            self.assertIsNone(OSRM().directions(**query).raw)
+            self.assertIsInstance(OSRM().directions(**query, keep_raw=True).raw, dict)
+        finally:
+            options.default_keep_raw = default_keep_raw
+
+    @responses.activate
+    def test_directions_lazy(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["directions"])
+        query["geometries"] = "polyline"
+        coords = convert.delimit_list([convert.delimit_list(pair) for pair in query["locations"]], ";")
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/route/v1/{query['profile']}/{coords}",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_polyline"],
+            content_type="application/json",
+        )
+        expected = self.client.parse_direction_json(
+            ENDPOINTS_RESPONSES["osrm"]["directions_polyline"], True, "polyline"
+        )
+
+        with mock.patch.object(utils, "decode_polyline5", wraps=utils.decode_polyline5) as decode:
+            routes = OSRM(lazy=True).directions(**query)
+            self.assertEqual(expected[0].duration, routes[0].duration)
+            self.assertEqual(0, decode.call_count)
+
+            self.assertEqual(expected[0].geometry, routes[0].geometry)
+            self.assertEqual(expected[0].geometry, routes[0].geometry)
+            self.assertEqual(1, decode.call_count)
+
+        with self.assertRaises(ValueError):
+            self.client.parse_direction_json(
+                ENDPOINTS_RESPONSES["osrm"]["directions_polyline"], True, "wkt", lazy=True
+            )
+
+    @responses.activate
+    def test_directions_batch(self):
+        locations_list = [
+            [[8.688641, 49.420577], [8.680916, 49.415776]],
+            [[8.680916, 49.415776], [8.780916, 49.445776]],
+            [[8.780916, 49.445776], [8.688641, 49.420577]],
+        ]
+        for idx, locations in enumerate(locations_list):
+            coords = convert.delimit_list([convert.delimit_list(pair) for pair in locations], ";")
+            responses.add(
+                responses.GET,
+                f"https://routing.openstreetmap.de/routed-bike/route/v1/driving/{coords}",
+                status=400 if idx == 1 else 200,
+                json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+                content_type="application/json",
+            )
+
+        routes = self.client.directions_batch(locations_list, max_workers=2, geometries="geojson")
+
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(3, len(routes))
+        self.assertIsInstance(routes[0], Direction)
+        self.assertIsInstance(routes[1], routingpy.exceptions.RouterApiError)
+        self.assertIsInstance(routes[2], Direction)
+        for call in responses.calls:
+            self.assertIn("geometries=geojson", call.request.url)
+
     @responses.activate
     def test_full_matrix(self):
         query = ENDPOINTS_QUERIES[self.name]["matrix"]
@@ -249,6 +384,81 @@ class OSRMTest(_test.TestCase):
         self.assertIsInstance(matrix.distances, list)
         self.assertIsInstance(matrix.raw, dict)
 
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_matrix_arrays(self):
+        response = deepcopy(ENDPOINTS_RESPONSES["osrm"]["matrix"])
+        response["durations"][0][1] = None
+
+        matrix = self.client.parse_matrix_json(response)
+
+        self.assertIsInstance(matrix.durations_array, np.ndarray)
+        self.assertIs(matrix.durations_array, matrix.durations_array)
+        self.assertEqual(np.float64, matrix.durations_array.dtype)
+        self.assertTrue(matrix.durations_array.flags["C_CONTIGUOUS"])
+        self.assertTrue(np.isnan(matrix.durations_array[0, 1]))
+        np.testing.assert_array_equal(np.array(response["distances"]), matrix.distances_array)
+
+        matrix = Matrix(durations=response["durations"], dtype="float32")
+        self.assertEqual(np.float32, matrix.durations_array.dtype)
+        self.assertIsNone(matrix.distances_array)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_matrix_arrays_keep_lists(self):
+        durations = [[0, 1.5], [None, 0]]
+        matrix = Matrix(durations=durations)
+
+        array = matrix.durations_array
+
+        self.assertIs(durations, matrix.durations)
+        self.assertEqual([[0, 1.5], [None, 0]], matrix.durations)
+        self.assertIsInstance(matrix.durations[0][0], int)
+        self.assertIs(array, matrix.durations_array)
+
+    @responses.activate
+    def test_matrix_tiled(self):
+        locations = [[8.688641, 49.420577], [8.680916, 49.415776], [8.780916, 49.445776]]
+
+        def table_callback(request):
+            # durations encode the original location indices: 10 * source + destination
+            coords = request.path_url.split("/")[-1].split("?")[0].split(";")
+            indices = [locations.index([float(c) for c in coord.split(",")]) for coord in coords]
+            params = request.params
+            sources = [int(i) for i in params["sources"].split(";")]
+            destinations = [int(i) for i in params["destinations"].split(";")]
+            durations = [[10 * indices[s] + indices[d] for d in destinations] for s in sources]
+            return 200, {}, json.dumps({"code": "Ok", "durations": durations, "distances": durations})
+
+        responses.add_callback(
+            responses.GET,
+            re.compile("https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=table_callback,
+            content_type="application/json",
+        )
+
+        matrix = self.client.matrix_tiled(
+            locations, radiuses=[100, 200, 300], block_size=2, max_workers=2
+        )
+
+        expected = [[0, 1, 2], [10, 11, 12], [20, 21, 22]]
+        self.assertEqual(4, len(responses.calls))
+        self.assertIsInstance(matrix, Matrix)
+        self.assertEqual(expected, matrix.durations)
+        self.assertEqual(expected, matrix.distances)
+        self.assertIsInstance(matrix.raw, list)
+        self.assertEqual(4, len(matrix.raw))
+        radiuses = sorted(call.request.params["radiuses"] for call in responses.calls)
+        self.assertEqual(["100;200", "100;200;300", "300", "300;100;200"], radiuses)
+
+        matrix = self.client.matrix_tiled(locations, block_size=2, keep_raw=False)
+        self.assertIsNone(matrix.raw)
+        self.assertEqual(expected, matrix.durations)
+
+        matrix = self.client.matrix_tiled(locations, block_size=2, keep_raw=["code"])
+        self.assertEqual([{"code": "Ok"}] * 4, matrix.raw)
+
+        matrix = OSRM(keep_raw=["code"]).matrix_tiled(locations, block_size=2)
+        self.assertEqual([{"code": "Ok"}] * 4, matrix.raw)
+
     @responses.activate
     def test_few_sources_destinations_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
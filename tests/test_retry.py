@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the retry module."""
+
+import time
+from email.utils import formatdate
+
+import requests
+import responses
+
+import routingpy
+import tests as _test
+from routingpy.client_default import Client
+from routingpy.retry import RetryPolicy, parse_retry_after
+
+
+class RetryPolicyTest(_test.TestCase):
+    def test_backoff(self):
+        policy = RetryPolicy(base_delay=0.5, multiplier=2, max_delay=3, jitter="none")
+        self.assertEqual([0.5, 1, 2, 3, 3], [policy.backoff(attempt) for attempt in range(1, 6)])
+
+        for jitter, low, high in (("full", 0, 2), ("equal", 1, 2), ("proportional", 1, 3)):
+            policy = RetryPolicy(base_delay=2, jitter=jitter)
+            for _ in range(50):
+                self.assertTrue(low <= policy.backoff(1) <= high)
+
+        self.assertEqual(7, RetryPolicy().delay(3, retry_after=7))
+        self.assertEqual(
+            0.5, RetryPolicy(jitter="none", base_delay=0.5, respect_retry_after=False).delay(1, 7)
+        )
+
+        with self.assertRaises(ValueError):
+            RetryPolicy(jitter="random")
+
+    def test_parse_retry_after(self):
+        self.assertEqual(120, parse_retry_after("120"))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertTrue(9 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10)
+        self.assertEqual(0, parse_retry_after(formatdate(time.time() - 10, usegmt=True)))
+
+
+class ClientRetryTest(_test.TestCase):
+    def setUp(self):
+        self.url = "https://httpbin.org/post"
+
+    def _client(self, **policy):
+        return Client("https://httpbin.org", retry_policy=RetryPolicy(**policy), retry_timeout=5)
+
+    @responses.activate
+    def test_retry_after(self):
+        responses.add(responses.POST, self.url, status=503, json={}, headers={"Retry-After": "0.2"})
+        responses.add(responses.POST, self.url, status=200, json={"a": "b"})
+        client = self._client(base_delay=10)
+
+        start = time.time()
+        with self.assertWarns(UserWarning):
+            self.assertEqual({"a": "b"}, client._request("/post", post_params={}))
+
+        self.assertTrue(0.2 <= time.time() - start < 2)
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(2, client.last_attempts)
+
+    @responses.activate
+    def test_retry_after_exceeds_retry_timeout(self):
+        responses.add(responses.POST, self.url, status=503, json={}, headers={"Retry-After": "3600"})
+        client = self._client()
+
+        start = time.time()
+        with self.assertRaises(routingpy.exceptions.Timeout):
+            client._request("/post", post_params={})
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_max_attempts(self):
+        responses.add(responses.POST, self.url, status=502, json={})
+        client = self._client(max_attempts=3, base_delay=0.01, retriable_statuses=(502, 503))
+
+        with self.assertRaises(routingpy.exceptions.RouterServerError):
+            client._request("/post", post_params={})
+
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(3, client.last_attempts)
+
+    @responses.activate
+    def test_retriable_exceptions(self):
+        responses.add(responses.POST, self.url, body=requests.exceptions.ConnectionError("reset"))
+        responses.add(responses.POST, self.url, status=200, json={})
+        client = self._client(
+            base_delay=0.01, retriable_exceptions=(requests.exceptions.ConnectionError,)
+        )
+
+        self.assertEqual({}, client._request("/post", post_params={}))
+        self.assertEqual(2, client.last_attempts)
+
+        # not retriable by default
+        responses.add(responses.POST, self.url, body=requests.exceptions.ConnectionError("reset"))
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            Client("https://httpbin.org")._request("/post", post_params={})
+
+    @responses.activate
+    def test_timeout_retriable(self):
+        responses.add(responses.POST, self.url, body=requests.exceptions.ReadTimeout())
+        responses.add(responses.POST, self.url, status=200, json={})
+        client = self._client(base_delay=0.01, retriable_exceptions=(routingpy.exceptions.Timeout,))
+
+        self.assertEqual({}, client._request("/post", post_params={}))
+        self.assertEqual(2, len(responses.calls))
+
+        responses.add(responses.POST, self.url, body=requests.exceptions.ReadTimeout())
+        with self.assertRaises(routingpy.exceptions.Timeout):
+            Client("https://httpbin.org")._request("/post", post_params={})
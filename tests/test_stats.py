@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the stats module."""
+
+import responses
+
+import tests as _test
+from routingpy import Valhalla, stats
+from routingpy.client_base import options
+from routingpy.hooks import RequestEvent
+from routingpy.limiters import TokenBucket
+from routingpy.retry import RetryPolicy
+from tests.test_helper import *
+
+VALHALLA_MATRIX_URL = "https://api.mapbox.com/valhalla/v1/sources_to_targets"
+LABELS = 'router="Valhalla",endpoint="/sources_to_targets"'
+
+
+class StatsRegistryTest(_test.TestCase):
+    def setUp(self):
+        self.registry = stats.StatsRegistry(buckets=(0.5, float("inf")))
+
+    @responses.activate
+    def test_collect(self):
+        responses.add(responses.POST, VALHALLA_MATRIX_URL, status=503, json={})
+        responses.add(
+            responses.POST,
+            VALHALLA_MATRIX_URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["matrix"],
+        )
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            hooks=[self.registry],
+            retry_policy=RetryPolicy(base_delay=0, jitter="none"),
+            rate_limiter=TokenBucket(rate=50, burst=1),
+        )
+
+        with self.assertWarns(UserWarning):
+            router.matrix(**ENDPOINTS_QUERIES["valhalla"]["matrix"])
+
+        labels = {"router": "Valhalla", "endpoint": "/sources_to_targets"}
+        self.assertEqual(1, self.registry.counter("requests", status=200, **labels))
+        self.assertEqual(1, self.registry.counter("requests", status=503, **labels))
+        self.assertEqual(1, self.registry.counter("retries", **labels))
+        self.assertEqual(1, self.registry.counter("rate_limit_sleeps", **labels))
+        self.assertTrue(0 < self.registry.counter("rate_limit_sleep_seconds", **labels) <= 0.02)
+        self.assertEqual(0, self.registry.counter("errors", error="Timeout", **labels))
+
+        metrics = self.registry.render()
+        self.assertIn("# TYPE routingpy_requests counter\n", metrics)
+        self.assertIn('routingpy_requests_total{%s,status="200"} 1\n' % LABELS, metrics)
+        self.assertIn("routingpy_retries_total{%s} 1\n" % LABELS, metrics)
+        self.assertIn("# TYPE routingpy_request_duration_seconds histogram\n", metrics)
+        self.assertIn(
+            'routingpy_request_duration_seconds_bucket{%s,phase="network",le="+Inf"} 2\n' % LABELS,
+            metrics,
+        )
+        self.assertIn('routingpy_request_duration_seconds_count{%s,phase="parse"} 1\n' % LABELS, metrics)
+        self.assertTrue(metrics.endswith("# EOF\n"))
+
+        self.registry.clear()
+        self.assertEqual(0, self.registry.counter("retries", **labels))
+
+    def test_escape_labels(self):
+        self.registry(RequestEvent("error", router='My"Router', endpoint="/a\\b", error=ValueError()))
+
+        self.assertIn(
+            'routingpy_errors_total{router="My\\"Router",endpoint="/a\\\\b",error="ValueError"} 1\n',
+            stats.render_openmetrics(self.registry),
+        )
+
+    def test_default_hooks(self):
+        default_hooks = options.default_hooks
+        try:
+            options.default_hooks = [stats.default_registry]
+            self.assertEqual([stats.default_registry], Valhalla("https://valhalla.org").client.hooks)
+            self.assertEqual([], Valhalla("https://valhalla.org", hooks=[]).client.hooks)
+        finally:
+            options.default_hooks = default_hooks
+
+        self.assertEqual([], Valhalla("https://valhalla.org").client.hooks)
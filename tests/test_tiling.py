@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for tiling module."""
+
+import tests as _test
+from routingpy import tiling, utils
+from routingpy.exceptions import RouterServerError
+from routingpy.matrix import Matrix
+from routingpy.valhalla_attributes import MatchedResults
+
+
+def trace_response(indices):
+    """A trace_attributes response for a trace along the equator, where location i is on the edge with ID i // 2."""
+    edge_ids = list(dict.fromkeys(idx // 2 for idx in indices))
+    return {
+        "shape": utils.encode_polyline6([[idx, 0] for idx in indices]),
+        "edges": [
+            {
+                "id": edge_id,
+                "use": "road",
+                "sidewalk": "",
+                "begin_shape_index": max(2 * edge_id - indices[0], 0),
+                "end_shape_index": min(2 * edge_id + 1 - indices[0], len(indices) - 1),
+            }
+            for edge_id in edge_ids
+        ],
+        "matched_points": [
+            {"lon": idx, "lat": 0, "type": "matched", "edge_index": edge_ids.index(idx // 2)}
+            for idx in indices
+        ],
+    }
+
+
+class TilingTest(_test.TestCase):
+    def test_matrix_tiles(self):
+        tiles = tiling.matrix_tiles(5, block_size=2)
+
+        self.assertEqual(9, len(tiles))
+        self.assertEqual([0, 1], tiles[0].indices)
+        self.assertEqual([0, 1], tiles[0].sources)
+        self.assertEqual([0, 1], tiles[0].destinations)
+        self.assertEqual([0, 1, 2, 3], tiles[1].indices)
+        self.assertEqual([2, 3], tiles[1].destinations)
+        self.assertEqual([4], tiles[-1].indices)
+        self.assertEqual(slice(4, 5), tiles[-1].rows)
+
+        covered = [
+            (tile.indices[s], tile.indices[d])
+            for tile in tiles
+            for s in tile.sources
+            for d in tile.destinations
+        ]
+        self.assertEqual(sorted(covered), [(s, d) for s in range(5) for d in range(5)])
+
+    def test_matrix_tiles_sources_destinations(self):
+        tiles = tiling.matrix_tiles(10, sources=[9, 3, 4], destinations=[0], block_size=(2, 5))
+
+        self.assertEqual(2, len(tiles))
+        self.assertEqual([9, 3, 0], tiles[0].indices)
+        self.assertEqual([0, 1], tiles[0].sources)
+        self.assertEqual([2], tiles[0].destinations)
+        self.assertEqual(["j", "d", "a"], tiles[0].select("abcdefghij"))
+
+        with self.assertRaises(ValueError):
+            tiling.matrix_tiles(10, block_size=0)
+
+    def test_stitch_matrix(self):
+        tiles = tiling.matrix_tiles(3, block_size=2)
+        matrices = []
+        for tile in tiles:
+            durations = [
+                [10 * tile.indices[s] + tile.indices[d] for d in tile.destinations] for s in tile.sources
+            ]
+            matrices.append(Matrix(durations=durations, raw={"tile": len(matrices)}))
+
+        matrix = tiling.stitch_matrix(matrices, tiles)
+
+        self.assertEqual([[0, 1, 2], [10, 11, 12], [20, 21, 22]], matrix.durations)
+        self.assertIsNone(matrix.distances)
+        self.assertEqual([{"tile": idx} for idx in range(4)], matrix.raw)
+
+        matrices[2] = RouterServerError(500, "down")
+        with self.assertRaises(RouterServerError):
+            tiling.stitch_matrix(matrices, tiles)
+
+    def test_trace_chunks(self):
+        chunks = tiling.trace_chunks(10, chunk_size=4, overlap=2)
+
+        self.assertEqual(
+            [(0, 4), (2, 6), (4, 8), (6, 10)], [(chunk.start, chunk.stop) for chunk in chunks]
+        )
+        self.assertEqual(
+            [0, 3, 5, 7, 10], [chunks[0].owned.start] + [chunk.owned.stop for chunk in chunks]
+        )
+        self.assertEqual("cdef", chunks[1].select("abcdefghij"))
+        self.assertEqual([(0, 3)], [(chunk.start, chunk.stop) for chunk in tiling.trace_chunks(3, 4, 1)])
+
+        for chunk_size, overlap in ((4, 0), (4, 4)):
+            with self.assertRaises(ValueError):
+                tiling.trace_chunks(10, chunk_size, overlap)
+
+    def test_stitch_trace(self):
+        for chunk_size, overlap in ((4, 1), (4, 2), (5, 3), (20, 2)):
+            chunks = tiling.trace_chunks(11, chunk_size, overlap)
+            results = [
+                MatchedResults(trace_response(range(chunk.start, chunk.stop))) for chunk in chunks
+            ]
+
+            stitched = tiling.stitch_trace(results, chunks)
+
+            expected = MatchedResults(trace_response(range(11)))
+            self.assertEqual(
+                [edge.edge_id for edge in expected.matched_edges],
+                [edge.edge_id for edge in stitched.matched_edges],
+            )
+            if overlap > 1:
+                # Else the next chunk starts at the boundary location, in the middle of an edge
+                self.assertEqual(
+                    [edge.geometry for edge in expected.matched_edges],
+                    [edge.geometry for edge in stitched.matched_edges],
+                )
+            self.assertEqual(
+                [point.edge_index for point in expected.matched_points],
+                [point.edge_index for point in stitched.matched_points],
+            )
+            self.assertEqual(len(chunks), len(stitched.raw))
+
+        with self.assertRaises(RouterServerError):
+            tiling.stitch_trace([results[0], RouterServerError(500, "")], chunks)
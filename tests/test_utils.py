@@ -16,9 +16,16 @@
 #
 """Tests for utils module."""
 
+import unittest
+
 import tests as _test
 from routingpy import utils
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 
 class UtilsTest(_test.TestCase):
     def setUp(self):
@@ -47,6 +54,55 @@ class UtilsTest(_test.TestCase):
         decoded = [(49.420577, 8.688641, 120.96), (49.415776, 8.680916, 1491.39)]
         self.assertEqual(decoded, utils.decode_polyline6(self.coords3d_6prec, True, order="latlng"))
 
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_polyline_array_decoding(self):
+        decoded = utils.decode_polyline6(self.coords3d_6prec, True, as_array=True)
+        self.assertIsInstance(decoded, np.ndarray)
+        self.assertEqual((2, 3), decoded.shape)
+        self.assertEqual(
+            [(8.688641, 49.420577, 120.96), (8.680916, 49.415776, 1491.39)],
+            list(map(tuple, decoded.tolist())),
+        )
+
+        decoded = utils.decode_polyline5(self.coords2d_5prec.encode(), order="latlng", as_array=True)
+        self.assertEqual([[49.42058, 8.68864], [49.41578, 8.68092]], decoded.tolist())
+        self.assertEqual((0, 2), utils.decode_polyline5("", as_array=True).shape)
+
+        with self.assertRaises(ValueError):
+            utils.decode_polyline5(self.coords2d_5prec[:-1], as_array=True)
+
+    def test_polyline_long_decoding(self):
+        # long polylines take the numpy path if available and have to match the pure Python decoder exactly
+        for polyline, precision, is3d in (
+            (self.coords2d_5prec * 200, 5, False),
+            (self.coords3d_5prec * 200, 5, True),
+            (self.coords2d_6prec * 200, 6, False),
+            (self.coords3d_6prec * 200, 6, True),
+        ):
+            expected = utils._decode(polyline, precision, is3d)
+            decode = utils.decode_polyline5 if precision == 5 else utils.decode_polyline6
+            self.assertEqual(expected, decode(polyline, is3d))
+            self.assertEqual(expected, decode(memoryview(polyline.encode()), is3d))
+
+    def test_polyline_encoding(self):
+        self.assertEqual(
+            self.coords2d_5prec, utils.encode_polyline5([(8.68864, 49.42058), (8.68092, 49.41578)])
+        )
+        self.assertEqual(
+            self.coords3d_6prec,
+            utils.encode_polyline6(
+                [[8.688641, 49.420577, 120.96], [8.680916, 49.415776, 1491.39]], is3d=True
+            ),
+        )
+        self.assertEqual(
+            self.coords2d_6prec,
+            utils.encode_polyline6([(49.420577, 8.688641), (49.415776, 8.680916)], order="latlng"),
+        )
+        self.assertEqual("", utils.encode_polyline5([]))
+
+        coords = [(-120.2, 38.5), (-120.95, 40.7), (-126.453, 43.252)]
+        self.assertEqual(coords, utils.decode_polyline5(utils.encode_polyline5(coords)))
+
     def test_get_ordinal(self):
         self.assertEqual(utils.get_ordinal(0), "th")
         self.assertEqual(utils.get_ordinal(1), "st")
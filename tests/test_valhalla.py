@@ -16,15 +16,20 @@
 #
 """Tests for the Valhalla module."""
 
+import contextlib
+import gc
+import io
 import json
+import unittest
+import weakref
 from copy import deepcopy
 
 import responses
 
 import tests as _test
-from routingpy import Valhalla
+from routingpy import Valhalla, utils
 from routingpy.direction import Direction
-from routingpy.expansion import Expansions
+from routingpy.expansion import Edge, Expansions, StreamedExpansions
 from routingpy.isochrone import Isochrone, Isochrones
 from routingpy.matrix import Matrix
 from routingpy.valhalla_attributes import (
@@ -36,6 +41,17 @@ from routingpy.valhalla_attributes import (
     Surface,
 )
 from tests.test_helper import *
+from tests.test_tiling import trace_response
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
 
 
 class ValhallaTest(_test.TestCase):
@@ -172,6 +188,41 @@ class ValhallaTest(_test.TestCase):
         self.assertIsInstance(matrix.distances, list)
         self.assertIsInstance(matrix.raw, dict)
 
+    def test_parse_lazy(self):
+        response = ENDPOINTS_RESPONSES[self.name]["directions"]
+        eager = self.client.parse_direction_json(response, "mi")
+        lazy = self.client.parse_direction_json(response, "mi", lazy=True)
+        self.assertEqual((eager.duration, eager.distance), (lazy.duration, lazy.distance))
+        self.assertEqual(eager.geometry, lazy.geometry)
+
+        response = ENDPOINTS_RESPONSES[self.name]["matrix"]
+        eager = self.client.parse_matrix_json(response, "mi")
+        lazy = self.client.parse_matrix_json(response, "mi", lazy=True)
+        self.assertEqual(eager.durations, lazy.durations)
+        self.assertEqual(eager.distances, lazy.distances)
+
+    def test_parse_lazy_drops_response(self):
+        def parse(parser, name):
+            response = _test.Response(deepcopy(ENDPOINTS_RESPONSES[self.name][name]))
+            released = weakref.ref(response)
+            result = self.client.client._parse(parser, response, "km", lazy=True, keep_raw=False)
+            del response
+            gc.collect()
+            self.assertIsNone(released())
+            return result
+
+        direction = parse(self.client.parse_direction_json, "directions")
+        self.assertEqual(
+            self.client.parse_direction_json(
+                ENDPOINTS_RESPONSES[self.name]["directions"], "km"
+            ).geometry,
+            direction.geometry,
+        )
+
+        matrix = parse(self.client.parse_matrix_json, "matrix")
+        expected = self.client.parse_matrix_json(ENDPOINTS_RESPONSES[self.name]["matrix"], "km")
+        self.assertEqual((expected.durations, expected.distances), (matrix.durations, matrix.distances))
+
     @responses.activate
     def test_few_sources_destinations_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
@@ -218,6 +269,111 @@ class ValhallaTest(_test.TestCase):
         self.assertEqual(expansion.interval_type, "time")
         self.assertIsInstance(expansion.raw, dict)
 
+        properties = ENDPOINTS_RESPONSES[self.name]["expansion"]["features"][0]["properties"]
+        self.assertEqual(11, len(expansion))
+        self.assertEqual(properties["durations"], expansion.durations)
+        self.assertIsNone(expansion.statuses)
+        for idx, edge in enumerate(expansion):
+            self.assertIsInstance(edge, Edge)
+            self.assertEqual(properties["distances"][idx], edge.distance)
+            self.assertEqual(properties["costs"][idx], edge.cost)
+            self.assertIsNone(edge.status)
+        self.assertEqual([[0.00053, -0.00017], [0.0008, 0.0]], expansion[-1].geometry)
+        self.assertEqual(properties["durations"][2:4], [edge.duration for edge in expansion[2:4]])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_expansion_array(self):
+        expansion = Valhalla.parse_expansion_json(
+            ENDPOINTS_RESPONSES[self.name]["expansion"], None, ["distances", "durations"], "time"
+        )
+
+        self.assertEqual((11, 2, 2), expansion.array("geometries").shape)
+        self.assertEqual("float64", expansion.array("durations").dtype)
+        self.assertEqual([20, 20, 40], expansion.array("distances", dtype="int32")[:3].tolist())
+        self.assertIsNone(expansion.array("costs"))
+        with self.assertRaises(ValueError):
+            expansion.array("speeds")
+
+    @unittest.skipIf(ijson is None, "ijson is not installed")
+    @responses.activate
+    def test_expansion_stream(self):
+        query = ENDPOINTS_QUERIES[self.name]["expansion"]
+        response = ENDPOINTS_RESPONSES[self.name]["expansion"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/expansion",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+        expected = list(
+            Valhalla.parse_expansion_json(response, None, query["expansion_properties"], None)
+        )
+
+        expansion = self.client.expansion(**query, stream=True)
+
+        self.assertIsInstance(expansion, StreamedExpansions)
+        self.assertEqual(query["locations"], expansion.center)
+        edges = list(expansion)
+        self.assertEqual(len(expected), len(edges))
+        for edge, expected_edge in zip(edges, expected):
+            self.assertEqual(expected_edge.geometry, edge.geometry)
+            self.assertEqual(expected_edge.distance, edge.distance)
+            self.assertEqual(expected_edge.duration, edge.duration)
+            self.assertEqual(expected_edge.cost, edge.cost)
+        self.assertEqual([], list(expansion))
+
+    @unittest.skipIf(ijson is None, "ijson is not installed")
+    def test_expansion_stream_order(self):
+        # Properties before the geometry and a requested property which is missing
+        body = b"""{"features": [{"properties": {"statuses": ["r", "s"], "durations": [1.5, 2]},
+            "geometry": {"coordinates": [[[0, 0], [1, 1]], [[1, 1], [2, 2]]]}}]}"""
+
+        edges = list(StreamedExpansions(body, expansion_properties=["durations", "statuses", "costs"]))
+
+        self.assertEqual(
+            [[[1, 1], [2, 2]], "s", 2, None],
+            [edges[1].geometry, edges[1].status, edges[1].duration, edges[1].cost],
+        )
+        self.assertEqual(1.5, edges[0].duration)
+
+        edges = list(StreamedExpansions(body))
+
+        self.assertEqual([[0, 0], [1, 1]], edges[0].geometry)
+        self.assertIsNone(edges[0].duration)
+
+    def test_expansion_edges(self):
+        edges = [Edge([[0, 0], [1, 1]], durations=1), Edge([[1, 1], [2, 2]], durations=2)]
+        expansion = Expansions(edges, [0, 0], "time")
+
+        self.assertEqual([1, 2], expansion.durations)
+        self.assertIsNone(expansion.distances)
+        self.assertEqual([[1, 1], [2, 2]], expansion[1].geometry)
+
+    @responses.activate
+    def test_trace_attributes_encoded_locations(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["trace_attributes"])
+        expected = deepcopy(ENDPOINTS_EXPECTED[self.name]["trace_attributes"])
+        expected["encoded_polyline"] = utils.encode_polyline6(query["locations"])
+        del expected["shape"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/trace_attributes",
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["trace_attributes"],
+            content_type="application/json",
+        )
+
+        self.client.trace_attributes(**query, encode_locations=True)
+        self.assertEqual(json.loads(responses.calls[0].request.body.decode("utf-8")), expected)
+
+        # Waypoints can't be encoded
+        query["locations"][0] = Valhalla.Waypoint(query["locations"][0], type="break")
+        self.client.trace_attributes(**query, encode_locations=True)
+        body = json.loads(responses.calls[1].request.body.decode("utf-8"))
+        self.assertNotIn("encoded_polyline", body)
+        self.assertEqual(3, len(body["shape"]))
+
     @responses.activate
     def test_trace_attributes(self):
         query = ENDPOINTS_QUERIES[self.name]["trace_attributes"]
@@ -245,3 +401,70 @@ class ValhallaTest(_test.TestCase):
             self.assertIsInstance(pt, MatchedPoint)
             self.assertEqual(pt.match_type, "matched")
             self.assertGreaterEqual(pt.edge_index, 0)
+
+    def test_slots(self):
+        matched = MatchedResults(ENDPOINTS_RESPONSES[self.name]["trace_attributes"])
+        expansions = Valhalla.parse_expansion_json(
+            ENDPOINTS_RESPONSES[self.name]["expansion"], None, None, None
+        )
+
+        for obj in (
+            matched,
+            matched.matched_edges[0],
+            matched.matched_points[0],
+            expansions,
+            expansions[0],
+            Direction([], 1, 1),
+            Isochrone([], 1, "time"),
+        ):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    @responses.activate
+    def test_trace_attributes_positional_dry_run(self):
+        query = ENDPOINTS_QUERIES[self.name]["trace_attributes"]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            matched = self.client.trace_attributes(
+                query["locations"], "pedestrian", "map_snap", None, None, None, None, True
+            )
+
+        self.assertEqual(0, len(responses.calls))
+        self.assertEqual([], matched.matched_edges)
+
+    @responses.activate
+    def test_trace_attributes_chunked(self):
+        def _match(request):
+            shape = json.loads(request.body)["shape"]
+            return 200, {}, json.dumps(trace_response([int(location["lon"]) for location in shape]))
+
+        responses.add_callback(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/trace_attributes",
+            callback=_match,
+            content_type="application/json",
+        )
+        locations = [[idx, 0] for idx in range(25)]
+
+        matched = self.client.trace_attributes_chunked(
+            locations, chunk_size=10, overlap=4, max_workers=2, profile="auto"
+        )
+
+        self.assertEqual(4, len(responses.calls))
+        self.assertEqual("auto", json.loads(responses.calls[0].request.body)["costing"])
+        self.assertIsInstance(matched, MatchedResults)
+        self.assertEqual(list(range(13)), [edge.edge_id for edge in matched.matched_edges])
+        self.assertEqual(
+            [idx // 2 for idx in range(25)], [pt.edge_index for pt in matched.matched_points]
+        )
+        self.assertEqual(4, len(matched.raw))
+
+        matched = self.client.trace_attributes_chunked(
+            locations, chunk_size=10, overlap=4, profile="auto", keep_raw=False
+        )
+        self.assertIsNone(matched.raw)
+        self.assertEqual(13, len(matched.matched_edges))
+
+        matched = self.client.trace_attributes_chunked(
+            locations, chunk_size=10, overlap=4, profile="auto", keep_raw=["shape"]
+        )
+        self.assertEqual([["shape"]] * 4, [list(raw) for raw in matched.raw])